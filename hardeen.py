@@ -1,32 +1,66 @@
 #!/usr/bin/python3
 
+import time
+STARTUP_T0 = time.perf_counter()
+
+import bisect
 import datetime
+import functools
 import os
 import re
 import signal
+import sqlite3
 import subprocess
 import sys
 import threading
-import time
 import base64
 import io
 import json
-from pathlib import Path
-import tempfile
-import select
+
+if __name__ == "__main__" and sys.argv[1:2] in (['render'], ['replay'], ['metrics']):
+    # Headless mode, hand off before Qt and the imaging libraries are imported
+    import hardeen_cli
+    sys.exit(hardeen_cli.main(sys.argv[1:]))
 
 # TEMP
 import traceback
 
-import PIL.Image
-import OpenEXR
-import OpenImageIO as oiio
-import numpy as np
-
 from PySide2.QtWidgets import *
 from PySide2.QtCore import *
 from PySide2.QtGui import *
 
+from hardeen_core import (
+    NotificationDispatcher,
+    RENDER_ORDERS,
+    RenderOutputReader,
+    RenderProgress,
+    RenderJournal,
+    RenderQueue,
+    RenderRecorder,
+    RenderSupervisor,
+    ReplayReader,
+    RenderWorker,
+    RopScanCache,
+    ThumbnailCache,
+    build_render_command,
+    close_render,
+    create_temp_python_file,
+    format_frame_list,
+    format_time,
+    frames_to_render,
+    get_cache_dir,
+    get_config_dir,
+    launch_render,
+    order_frames,
+    parse_frame_list,
+    parse_out_nodes,
+    refresh_hip_files,
+    remove_temp_python_file,
+    split_frame_range,
+    split_frames,
+)
+from hardeen_metrics import FrameMetricsCollector, MetricsStore
+
 try:
     import hou  # Only needed if running inside Houdini
     RUNNING_IN_HOUDINI = True
@@ -37,146 +71,163 @@ DEFAULT_FOLDER = '/mnt/Data/active_jobs/'
 DEFAULT_OUTNODE = '/out/Redshift_ROP1'
 DEFAULT_LOG = DEFAULT_FOLDER + 'hardeen.log'
 VERSION_NUM = 'v1.0'
+LOG_FLUSH_MS = 50  # Render log lines are buffered and written to the panels at this rate
+LOG_MAX_LINES = 20000  # Default for the 'log_max_lines' setting
+PREVIEW_MAX_WIDTH = 300  # Widest an AOV preview is ever shown, previews are decoded at this size
+NOTIFY_IMAGE_SIZE = 640  # Default for the 'notification_image_size' setting
+FLIPBOOK_PREFETCH = 24  # Most frames decoded ahead of the flipbook position
+RESIZE_SETTLE_MS = 150  # Previews get their smooth rescale once resizing pauses this long
 disabledTextColor = "#ff4c00"
 icon_browse = b'iVBORw0KGgoAAAANSUhEUgAAADkAAABDCAYAAAAmoa0iAAAACXBIWXMAAC4jAAAuIwF4pT92AAAI0ElEQVRogdWbXWwU1xXH/zMeGxPWsFVcyQ+V7AeQ+hCqSSnhI6HYSgmV0sZ2Fbm1AduAQxwCxHy0SSqUpE6NKA9F5KFtqsZ2FFBphETaqm0ekIaShNCoDzR9MXaqAmqLCcG2anuBnbnn9GF2vmfXO+OddfqXRt6dnTszvznnnnvuuWMJOR09NtCImGJm+y8xg3Mb7M8Amd+v9r/y46txrxNXEgAcPTYwBKA77kksKPKAOYD2ZwBVlcqwJEn7D//w5akSMcwp6eixgeMA+uI09oDACweXBWVZglJRAVmWIYhAgi4Loqb+l18tC6gMQI3TMGApym0uqxITmBmViuIGhCBSiYT24uEX0iXmCZUcp5HXHcn73QfLTCBiNyBICAhBKgnSDj1/KHFQxb9j86bNl+vrG0rqRm+feVu9efNmWpBwgToWfe7Ac00nfnoiMdeNZcmoIiIEAQVEzqKCSNu999nELFo2SAtQ2ICUgyeQIFWQ0J7q3ZUIaJkg2YQTBCKB2vtrhQMoLCurgkjr7tlRctAyuqsJKARhxfIV+rcefzxjAroCEpEqhNA6OreVFLR87upyUWLGqge/mm1+ojnjuLHTR4lIa+toLxloAJJLdWaXiMjpg4LATACA1atWZb/T2poRQviOESoRl6yPeiCtHLTUMi3pBB0m5zprVq/Otj35ZMYFCCKCIQx1YnJK27mrZ96gNqSTjs33lEFZN28NI+R7mOvWrMm2f7fNsWiun969d0+9dXti3sFIdmcrxAxOgNKf8YR5zMPr1mW3dnRkrChsDTN3795TP731mda5ozs2qMzMIDK3RN1VWAmByHudDQ+vz3Zt25pxBykhCHfu3FVvjN/StnZ3xgKV/XlnEu4q/BkPUd5jN254JLujqyvjBCJzmLlz54767//c1Do6t0YGVQJzvxJTKoqS8mc8n92+LY9cGVUA57rmZ/P6X6ytpfXr1mb/fOG9KqsNCUJWz6jX/3VD+97WLU2nT54qOtdVvBPd0oBJkqwsXrz4S5WVVXWyLFevWL7CuHrtmm2ZS3/5qOrih5eqhMeNHSvbFvTlukSE2dmMemP80+MAthd7P7Iz90OudDE/wPvuW9KwbFl67aJF1Q2yLFcDwJb2DqX520/A39fCAYUddAIPIde29v4vtES5J9mZ+1mD9PwoFUVJS5IUmMK1NrdgV89TtsuafU14E3d/mhfyEGpqUpAkKVK/lO2JLicXXS1t3PB17H661w4mwgYU9j7PxNoHyMxYWpOK7G2+wFO6fplPTRs34pH168ZnZqZHim3zt4//nv7Z66+r7mpDFMnkg0wme/WqsrKqrqZm6QOSJAfcOkwMK27E8zhX4LFKirHuO7IUpbK2pmapWjSop0AWA9KzxbrlwhofHw/dX1FRkSoKlBEokEWRHGxcesw//On3+ODi+6G/FQPqqenm7jeKZKs2ajdOIq0zBH77u7M4/Ztfh/5ugSqKkgo9wB7DY/dJ3wkiI8wtwzCg6wY+vHQRJ0+9FXpMRUVFKpXKD+ruj7ECj7dDlx7ThNSh6zre/+A9DL85FHqcJElKGKjpruQJPlEkByrgSbirEDakoeu4cOE8fvXGL5HJZALHhoLai0YUfwiJ27hYuS2p66brapqG/ld/hNnMbOB4C7SqalGttc+/QhZFsjlZRqLR1TBEzopuWB2f/GMML710GLOz4aBLlqQeqK6urmNYE/t5WJJcuWEi7poLPG5Ay6pjY2N44cXnMTs7E9p28eIlX06laurs/kjmAlIUeWs8ERsXK0MYMHxwuu7sGx29goOHDuZNGtY+tKbuG48+6nHZKJLdAYcTKmRZ7ups2YBFR0ZGsGPndoyNjYWe41BfH7Z1dNjxI4pckLn5ZGLu6rWiruvQs9Z3E3pychLP7O7F6Oho6Hm2bdmC7x84EG8WEje7L1aGPYT4+qWhB/ZPTkyip2cnrlwJn4lt3rQJPzh4MNL1A8lAEqBGSOAxwqBz28TEBDq7unDu3LnQ833zscfAzOEZRYhk79J3OcbJoPUccMMFehtP9+7CmTNn8p22m5nPMvOcpRBvZSChyaTIBR5rqLKGK3PJgJwx0PqdyV5O2L+/D0SEtra2sFO3AGhg5iZJkvKWKJWwd29KLcuSNiBxDo68+2xIB1oQYc+eZyGEQHt7e9jpVQBaIVC7MlC+wOOOrGGua0DPZgN9t7e3F0eOHMl3CQs01HXtBN0OPAlAujOeQkmBe7+h68j6HkB/fz96enrmAg28l6QEEt/E3DVrLiq5XTLXJ+19lsuG7cttg4ODEEJgaCg0uLpd97ILEmWIrgK6brhu3BVsOBzGBPXm1ZaGh4cBIB9o2g8quzP7pCoDQviHC8OXDAQ3QzdgGAZEnqW+4eFhtLa2YmoqNNZYoCrgGUKA3Oy05JCGYfYxv8XcVly5ciX27duH+vr6oj2qoaEB6XTeYdIC3R7skwnI8IyTXrdkZnR2dmJwcDCJS6cBTAXXJxMpf1jjpH/uymhubk4KEACuSpJ0PrAWcu369RTDKk2y9QeubwV/W/21h5RlS5d6rmQFHv/MXlXVfMGjVDoBAIrzroBpyT++++7yQFXdP+d0pYH+334yICvrFzpgzSDiFvpdBqaphXqU6XQO0DYqhZ8Q4q7cmDNygu0KUaFAEfHPsHx115zHhyct6CthwoAb/zi500AptzjYT4pzPwmMzcGLOZ73TownrqmaFGD1tDQEFQ1+ML09MwMevfuxfT0dP7rmhqWJOl8sdeTT588NczM2wMnDXkD2V/g9ZfurcrfXIAtLcHV8OmZGTyzZy+m/zsN//TPD/jxXz8q+n2BRMTMGvvU2NjIALi7u9v/k1uR3gNYUOWDbGlpKQTYvdD3HUlhkH19fTw5OZkPMNExJBGFQRbQ2XLcU1le6s2jy4jwwtF8tFCQUwAK1mVKqYWALCsgsDCQ+4vJUj7XmiPwxPrHt8+dCkD+/w0V+cTMDcz8CjP/0wWoLfR9JSZmVnPAZfkXwnz6Hwz9HLxOWD5rAAAAAElFTkSuQmCC'
 checkerboard = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00@\x00\x00\x00@\x08\x02\x00\x00\x00\x15\x0bg\x00\x00\x00\x04sBIT\x08\x08\x08\xdb\xe5O\xe7\x00\x00\x00\xaeIDATx\x9c\xed\x9d;\x0e\xc20\x10\xbd\xf7\xbf\xd9\xff\x1e\xc5\xa2j\xf9"\x17\x15\x8d\x81L\r\xd9\x9a\x1aP\x00\x00\x00\x00IEND\xaeB`\x82'
 renderedImage = None
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
-os.chdir(dir_path)
-
-if os.path.exists('houdini_cli_temp.py'):
-    os.remove('houdini_cli_temp.py')
-else:
-    pass
-
-def create_temp_python_file():
-    """Create the temporary Python file for Houdini"""
-    dir_path = os.path.dirname(os.path.realpath(__file__))
-    temp_file = os.path.join(dir_path, 'hardeen_temp.py')
-    
-    if os.path.exists(temp_file):
-        os.remove(temp_file)
-        
-    with open(temp_file, 'w') as f:
-        f.write('''#!/usr/bin/env python3
-
-import os
-import stat
-from optparse import OptionParser
-
-def initRender(out, sframe, eframe, userange, useskip):
-    import hou
-    rnode = hou.node(out)
-
-    def dataHelper(rop_node, render_event_type, frame):
-        if render_event_type == hou.ropRenderEventType.PostFrame:
-            output_file = rnode.evalParm("RS_outputFileNamePrefix")
-            print(f"hardeen_outputfile: {output_file}")
 
-    rnode.addRenderEventCallback(dataHelper)
-
-    parm_skip = rnode.parm("RS_outputSkipRendered")
-    if parm_skip is not None:
-        if useskip:
-            parm_skip.set(1)
+# Startup budget for the first window paint, in milliseconds
+STARTUP_BUDGET_MS = float(os.environ.get('HARDEEN_STARTUP_BUDGET_MS', 1500))
+
+# Imaging library, imported by load_imaging_modules() when the first preview is needed
+oiio = None
+
+def load_imaging_modules():
+    """Import the imaging library on first use, it costs seconds at startup"""
+    global oiio
+    if oiio is None:
+        import OpenImageIO as oiio
+
+@functools.lru_cache(maxsize=256)
+def aov_label(channelnames):
+    """Build the preview label for a subimage from a tuple of channel names, e.g. 'diffuse.rgb'"""
+    layers = {}
+    for channelname in channelnames:
+        layername = ".".join(channelname.split(".")[:-1])
+        if layername not in layers:
+            layers[layername] = []
+        layers[layername].append(channelname)
+
+    layer_str = ""
+    for layername, channelnames in layers.items():
+        channels = [cn.split(".")[-1].lower() for cn in channelnames]
+        if len(channels) == 1:
+            channel_str = channels[0]
         else:
-            parm_skip.set(0)
-
-    if "merge" in str(rnode.type()).lower():
-        rnode.render()
-        if userange == "True":
-            print("hardeen_note: Out Path leads to a merge node, but you have selected to override the frame range. "
-                  "Defaulting to the frame range that was set from within Houdini for each ROP.")
-    else:
-        if userange == "True":
-            rnode.render(frame_range=(sframe, eframe))
+            channel_str = "".join(channels)
+        if layername == "":
+            layer_str = f"{channel_str}"
         else:
-            rnode.render(frame_range=(rnode.parm("f1").eval(), rnode.parm("f2").eval()))
+            layer_str = f"{layername}.{channel_str}"
+    return layer_str
+
+def thumbnail_from_buf(buf, max_width):
+    """Scale an ImageBuf down to max_width as 8-bit sRGB, returns (bytes, width, height)"""
+    # Shrink first, so the colour conversion below only touches preview sized pixels
+    spec = buf.spec()
+    if spec.width > max_width:
+        height = max(1, round(spec.height * max_width / spec.width))
+        buf = oiio.ImageBufAlgo.resample(buf, roi=oiio.ROI(0, max_width, 0, height, 0, 1, 0, spec.nchannels))
+
+    # Make it RGB, single channels are shown as grey and missing channels as black
+    if spec.nchannels == 1:
+        buf = oiio.ImageBufAlgo.channels(buf, (0, 0, 0))
+    elif spec.nchannels != 3:
+        buf = oiio.ImageBufAlgo.channels(buf, (0, 1, 2) if spec.nchannels > 3 else (0, 1, 0.0))
+
+    display_buf = oiio.ImageBufAlgo.colorconvert(buf, "linear", "srgb")
+    display_spec = display_buf.spec()
+    pixels = display_buf.get_pixels(oiio.UINT8)  # Clamps to 0-1 while converting
+    return pixels.tobytes(), display_spec.width, display_spec.height
+
+def decode_exr_previews(image_path, max_previews, is_stale, cache=None, width=PREVIEW_MAX_WIDTH):
+    """Decode every AOV of an EXR to 8-bit RGB, returns None once is_stale() says so"""
+    load_imaging_modules()
+    path = os.path.abspath(image_path)
+    st = os.stat(image_path)
+    file_key = (path, st.st_mtime_ns, st.st_size)
+
+    # A frame seen before comes from the cache alone, scrubbing doesn't open the file again
+    parts = cache.get_parts(file_key) if cache else None
+    if parts is not None:
+        count, complete = parts
+        if complete or count >= max_previews:
+            previews = []
+            for subCount in range(min(count, max_previews)):
+                preview = cache.get((path, subCount, st.st_mtime_ns, st.st_size, width))
+                if preview is None:
+                    break
+                previews.append(preview)
+            else:
+                return previews
 
-if __name__ == "__main__":
-    parser = OptionParser()
-    parser.add_option("-i", "--hip", dest="hipfile", help="path to .hip file")
-    parser.add_option("-o", "--out", dest="outnode", help="path to out node")
-    parser.add_option("-s", "--sframe", dest="startframe", help="start frame to render")
-    parser.add_option("-e", "--eframe", dest="endframe", help="end frame to render")
-    parser.add_option("-u", "--userange", dest="userange", help="toggle to enable frame range")
-    parser.add_option("-r", "--useskip", dest="useskip", help="toggle to skip rendering of already rendered frames")
-
-    (options, args) = parser.parse_args()
-
-    # Convert hip file path to absolute and verify it exists
-    hip_file = os.path.abspath(options.hipfile.strip())  # Strip whitespace and newlines
-    hip_dir = os.path.dirname(hip_file)
-    
-    print(f"Current working directory: {os.getcwd()}")
-    print(f"Hip file path: {hip_file}")
-    print(f"Hip directory: {hip_dir}")
-    
-    # Detailed file checks
-    exists = os.path.exists(hip_file)
-    print(f"File exists: {exists}")
-    
-    if exists:
-        st = os.stat(hip_file)
-        print(f"File mode: {stat.filemode(st.st_mode)}")
-        print(f"File owner: {st.st_uid}")
-        print(f"File group: {st.st_gid}")
-        print(f"File size: {st.st_size}")
-    else:
-        print("Checking parent directory...")
-        parent_dir = os.path.dirname(hip_file)
-        if os.path.exists(parent_dir):
-            print(f"Parent directory exists")
-            try:
-                files = os.listdir(parent_dir)
-                print(f"Directory contents: {files}")
-            except Exception as e:
-                print(f"Error listing directory: {e}")
-        else:
-            print(f"Parent directory does not exist")
-    
-    print(f"File is readable: {os.access(hip_file, os.R_OK)}")
-    print(f"Current user ID: {os.getuid()}")
-    print(f"Current group ID: {os.getgid()}")
-    
+    # One open for the whole file, every part is reached by seeking the same input
+    inp = oiio.ImageInput.open(image_path)
+    if inp is None:
+        raise IOError(oiio.geterror())
     try:
-        with open(hip_file, 'rb') as f:
-            print("Successfully opened file for reading")
-            print(f"First few bytes: {f.read(10)}")
-    except Exception as e:
-        print(f"Error opening file: {e}")
-    
-    # Change to the hip file directory before loading
-    os.chdir(hip_dir)
-    
-    import hou
-    hou.hipFile.load(hip_file)
-    
-    initRender(options.outnode.strip(),  # Strip other arguments too
-              int(options.startframe), 
-              int(options.endframe), 
-              options.userange, 
-              options.useskip)
-''')
-
-def format_time(seconds):
-
-    timedelta = datetime.timedelta(seconds=seconds)
-    days = timedelta.days
-    hours, remainder = divmod(timedelta.seconds, 3600)
-    minutes, seconds = divmod(remainder, 60)
-    parts = []
-    if days:
-        parts.append(f"{days}d")
-    if hours:
-        parts.append(f"{hours}h")
-    if minutes:
-        parts.append(f"{minutes}m")
-    if seconds or not any((days, hours, minutes)):
-        parts.append(f"{seconds}s")
-    return "".join(parts)
+        previews = []
+        subCount = 0
+        while subCount < max_previews and inp.seek_subimage(subCount, 0):
+            if is_stale():
+                return None
+
+            # Parts decoded before, for the preview or a notification, are not read again
+            key = (path, subCount, st.st_mtime_ns, st.st_size, width)
+            preview = cache.get(key) if cache else None
+            if preview is not None:
+                previews.append(preview)
+                subCount += 1
+                continue
 
+            layer_str = aov_label(tuple(inp.spec().channelnames))
+
+            # Use the smallest MIP level that is still wide enough, when the file has them
+            miplevel = 0
+            while inp.seek_subimage(subCount, miplevel + 1) and inp.spec().width >= width:
+                miplevel += 1
+            inp.seek_subimage(subCount, miplevel)
+            spec = inp.spec()
+
+            # Only the first three channels are shown, the rest are never read
+            nchannels = min(spec.nchannels, 3)
+            pixels = inp.read_image(subCount, miplevel, 0, nchannels, oiio.FLOAT)
+            if pixels is None:
+                raise IOError(inp.geterror())
+            buf = oiio.ImageBuf(oiio.ImageSpec(spec.width, spec.height, nchannels, oiio.FLOAT))
+            buf.set_pixels(oiio.ROI(0, spec.width, 0, spec.height, 0, 1, 0, nchannels), pixels)
+
+            preview = (layer_str, *thumbnail_from_buf(buf, width))
+            if cache:
+                cache.put(key, preview)
+            previews.append(preview)
+            subCount += 1
+        if cache:
+            cache.put_parts(file_key, subCount, subCount < max_previews)
+        return previews
+    finally:
+        inp.close()
+
+def notification_attachment(image_path, cache, max_size):
+    """Encode a rendered frame as a JPEG at most max_size wide for a push notification"""
+    if image_path.lower().endswith('.exr'):
+        # Same reader and cache as the previews, only the beauty part is read
+        _, image_data, width, height = decode_exr_previews(image_path, 1, lambda: False, cache, max_size)[0]
+        image = QImage(image_data, width, height, width * 3, QImage.Format_RGB888)
+    else:
+        reader = QImageReader(image_path)
+        size = reader.size()
+        if size.isValid() and size.width() > max_size:
+            size.scale(max_size, max_size, Qt.KeepAspectRatio)
+            reader.setScaledSize(size)
+        image = reader.read()
+    if image.isNull():
+        raise IOError(f"could not read {image_path}")
+
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "JPG", 85)
+    buffer.close()
+    return "render.jpg", bytes(data), "image/jpeg"
 
 class Settings:
     """Wrapper for QSettings to handle lists and other data types"""
@@ -253,10 +304,446 @@ class HipFilesLoader(QThread):
         hip_files = refresh_hip_files()
         self.finished.emit(hip_files)
 
+class OutNodesLoader(QThread):
+    """Thread for scanning the ROP nodes of a hip file"""
+    finished = Signal(str, list, dict)
+
+    def __init__(self, hip_file, parent=None):
+        super().__init__(parent)
+        self.hip_file = hip_file
+
+    def run(self):
+        try:
+            # Taken before the scan so a save during the scan invalidates it
+            self.file_key = RopScanCache._file_key(self.hip_file)
+        except OSError:
+            self.file_key = None
+        out_nodes, node_settings = parse_out_nodes(self.hip_file)
+        self.finished.emit(self.hip_file, out_nodes, node_settings)
+
+class PreviewLoader(QThread):
+    """Thread that decodes previews, only the newest requested frame is ever shown"""
+    loaded = Signal(str, list)
+
+    def __init__(self, max_previews, cache, parent=None):
+        super().__init__(parent)
+        self.max_previews = max_previews
+        self.cache = cache
+        self.condition = threading.Condition()
+        self.pending = None
+        self.generation = 0
+        self.running = True
+
+    def request(self, image_path):
+        """Decode image_path next, replacing any frame that has not started yet"""
+        with self.condition:
+            self.pending = image_path
+            self.generation += 1
+            self.condition.notify()
+        if not self.isRunning():
+            self.start()
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.generation += 1
+            self.condition.notify()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.running and self.pending is None:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                image_path, self.pending = self.pending, None
+                generation = self.generation
+
+            # A newer request makes this decode stale, it is abandoned between AOVs
+            is_stale = lambda: generation != self.generation
+            try:
+                if image_path.lower().endswith('.exr'):
+                    previews = decode_exr_previews(image_path, self.max_previews, is_stale, self.cache)
+                else:
+                    # QImage, unlike QPixmap, may be used outside the main thread.
+                    # Formats like JPEG decode straight to the smaller size.
+                    reader = QImageReader(image_path)
+                    size = reader.size()
+                    if size.isValid():
+                        size.scale(200, 200, Qt.KeepAspectRatio)
+                        reader.setScaledSize(size)
+                    image = reader.read()
+                    if image.isNull():
+                        continue
+                    previews = [image]
+            except Exception as e:
+                print(f"Error decoding preview: {str(e)}\n{traceback.format_exc()}")
+                continue
+
+            if previews is not None and not is_stale():
+                self.loaded.emit(image_path, previews)
+
+class FlipbookPrefetcher(QThread):
+    """Thread that decodes the frames ahead of the flipbook position into the thumbnail cache"""
+
+    def __init__(self, max_previews, cache, parent=None):
+        super().__init__(parent)
+        self.max_previews = max_previews
+        self.cache = cache
+        self.condition = threading.Condition()
+        self.pending = []
+        self.generation = 0
+        self.running = True
+
+    def request(self, image_paths):
+        """Prefetch image_paths in order, replacing whatever is left of the last request"""
+        with self.condition:
+            self.pending = [path for path in image_paths if path.lower().endswith('.exr')]
+            self.generation += 1
+            self.condition.notify()
+        if not self.isRunning():
+            self.start()
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.generation += 1
+            self.condition.notify()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                image_path = self.pending.pop(0)
+                generation = self.generation
+
+            try:
+                decode_exr_previews(image_path, self.max_previews,
+                                    lambda: generation != self.generation, self.cache)
+            except Exception as e:
+                print(f"Error prefetching {image_path}: {str(e)}")
+
+class QueueJobRunner(QThread):
+    """Thread that runs one queued job and logs its output to disk"""
+    progress = Signal(str, int)
+    job_finished = Signal(str, int)
+
+    def __init__(self, job, parent=None):
+        super().__init__(parent)
+        self.job = job
+        self.process = None
+        self.reader = None
+        self.supervisor = None
+        self.cancelled = False
+        log_dir = os.path.join(get_config_dir(), 'queue_logs')
+        os.makedirs(log_dir, exist_ok=True)
+        self.log_path = os.path.join(log_dir, f"{job['id']}.log")
+
+    def run(self):
+        job = self.job
+        frames = parse_frame_list(job['frames']) if job.get('frames') else None
+        # Only frames without output are sent to hython, finished ones count as done
+        done = 0
+        if job['useskip']:
+            all_frames = frames or list(range(job['sframe'], job['eframe'] + 1, job.get('step', 1)))
+            missing = frames_to_render(job['hip'], job['out'], all_frames)
+            if missing == []:
+                self.progress.emit(job['id'], len(all_frames))
+                self.job_finished.emit(job['id'], 0)
+                return
+            if missing is not None and len(missing) < len(all_frames):
+                frames = missing
+                done = len(all_frames) - len(missing)
+                self.progress.emit(job['id'], done)
+        script = create_temp_python_file()
+        cmd = build_render_command(script, job['hip'], job['out'], job['sframe'], job['eframe'],
+                                   job['userange'], job['useskip'], job.get('step', 1), frames)
+        collector = None
+        if Settings().get('record_metrics', True):
+            try:
+                collector = FrameMetricsCollector(MetricsStore(), job['hip'])
+            except (OSError, sqlite3.Error) as e:
+                print(f"Error opening metrics database: {e}")
+        if frames:
+            total_frames = len(frames)
+        else:
+            total_frames = len(range(job['sframe'], job['eframe'] + 1, job.get('step', 1))) - done
+        progress = RenderProgress(total_frames, structured=True)
+
+        # Like the main render, a crash is relaunched on the frames the journal doesn't have.
+        # Without a frame list or range override the queue doesn't know the ROP's frames
+        journal = None
+        journal_frames = frames
+        if not journal_frames and job['userange']:
+            journal_frames = list(range(job['sframe'], job['eframe'] + 1, job.get('step', 1)))
+        if journal_frames:
+            try:
+                journal = RenderJournal(job['hip'], job['out'], journal_frames).open()
+                self.supervisor = RenderSupervisor(
+                    journal, retries=int(Settings().get('crash_retries', RenderSupervisor.RETRIES))
+                )
+            except (OSError, ValueError) as e:
+                print(f"Error opening render journal: {e}")
+        collectors = [c for c in (collector, journal) if c]
+        try:
+            with open(self.log_path, 'a') as log:
+                log.write(' '.join(cmd) + '\n')
+                # Same event pipe and reader as the main render
+                self.process = launch_render(cmd)
+                self.reader = RenderOutputReader([self.process])
+                while True:
+                    if self.cancelled:
+                        self.cancel()
+                    for worker, source, value in self.reader:
+                        for item_collector in collectors:
+                            item_collector.feed(worker, source, value)
+                        if source == 'event':
+                            events = progress.feed_event(value, worker)
+                        else:
+                            log.write(value + '\n')
+                            events = progress.feed(value, worker)
+                        for kind, value in events:
+                            if kind == 'progress':
+                                self.progress.emit(job['id'], done + value[0])
+                    returncode = self.process.wait()
+                    close_render(self.process)
+                    if not self.relaunch_after_crash(journal, returncode, script, log):
+                        break
+        except OSError as e:
+            print(f"Error running queued job {job['id']}: {e}")
+            returncode = -1
+        remove_temp_python_file(script)
+        if journal:
+            journal.close(finished=returncode == 0 and not self.cancelled)
+        if collector:
+            collector.store.close()
+        if self.cancelled and returncode == 0:
+            returncode = -signal.SIGTERM
+        self.job_finished.emit(job['id'], returncode)
+
+    def relaunch_after_crash(self, journal, returncode, script, log):
+        """Relaunch the job on its remaining frames if it crashed, True once it runs again"""
+        if self.supervisor is None or not self.supervisor.crashed([returncode], self.cancelled):
+            return False
+        job = self.job
+        delay = self.supervisor.next_delay()
+        remaining = journal.remaining()
+        if delay is None:
+            log.write(f"Render crashed (exit code {returncode}) with {len(remaining)} frames left, "
+                      f"giving up after {self.supervisor.retries} retries\n")
+            return False
+        log.write(f"Render crashed (exit code {returncode}) with {len(remaining)} frames left, "
+                  f"relaunching in {format_time(delay)} "
+                  f"(retry {self.supervisor.attempts} of {self.supervisor.retries})\n")
+        log.flush()
+        if not self.supervisor.wait(delay) or self.cancelled:
+            return False
+
+        cmd = build_render_command(script, job['hip'], job['out'], min(remaining), max(remaining), True,
+                                   job['useskip'], job.get('step', 1), remaining)
+        log.write(' '.join(cmd) + '\n')
+        self.process = launch_render(cmd)
+        self.reader = RenderOutputReader([self.process])
+        return True
+
+    def cancel(self):
+        self.cancelled = True
+        if self.supervisor:
+            self.supervisor.stop()
+        if self.process and self.process.poll() is None:
+            try:
+                os.killpg(os.getpgid(self.process.pid), signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        if self.reader:
+            self.reader.stop()
+
+class RenderQueueDialog(QDialog):
+    """Window listing queued jobs and running them N at a time"""
+    COLUMNS = ["Priority", "Hip", "Out", "Frames", "Skip", "Status", "Progress"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Hardeen - Render Queue")
+        self.resize(900, 400)
+        self.queue = RenderQueue()
+        self.runners = {}
+        self.active = False
+
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().hide()
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        layout.addWidget(self.table, 1)
+
+        controls = QHBoxLayout()
+        self.up_btn = QPushButton("Priority +")
+        self.up_btn.clicked.connect(lambda: self.change_priority(1))
+        controls.addWidget(self.up_btn)
+        self.down_btn = QPushButton("Priority -")
+        self.down_btn.clicked.connect(lambda: self.change_priority(-1))
+        controls.addWidget(self.down_btn)
+        self.remove_btn = QPushButton("Remove")
+        self.remove_btn.clicked.connect(self.remove_selected)
+        controls.addWidget(self.remove_btn)
+        self.clear_btn = QPushButton("Clear Finished")
+        self.clear_btn.clicked.connect(self.clear_finished)
+        controls.addWidget(self.clear_btn)
+        controls.addStretch()
+
+        controls.addWidget(QLabel("Run at once:"))
+        self.concurrency_input = QLineEdit()
+        self.concurrency_input.setFixedWidth(40)
+        self.concurrency_input.setAlignment(Qt.AlignCenter)
+        self.concurrency_input.setText(str(Settings().get('queue_concurrency', 1)))
+        self.concurrency_input.textChanged.connect(
+            lambda text: Settings().set('queue_concurrency', text))
+        controls.addWidget(self.concurrency_input)
+
+        self.start_btn = QPushButton("Start Queue")
+        self.start_btn.setStyleSheet("background-color: #ff4c00; color: #000000;")
+        self.start_btn.clicked.connect(self.toggle_queue)
+        controls.addWidget(self.start_btn)
+        layout.addLayout(controls)
+
+        self.refresh_table()
+
+    def concurrency(self):
+        try:
+            return max(1, int(self.concurrency_input.text() or "1"))
+        except ValueError:
+            return 1
+
+    def add_job(self, hip, out, sframe, eframe, userange, useskip, total, frames=None, step=1):
+        job = self.queue.add(hip, out, sframe, eframe, userange, useskip, total, frames=frames, step=step)
+        self.refresh_table()
+        if self.active:
+            self.schedule()
+        return job
+
+    def selected_ids(self):
+        rows = {index.row() for index in self.table.selectionModel().selectedRows()}
+        return [self.table.item(row, 0).data(Qt.UserRole) for row in sorted(rows)]
+
+    def change_priority(self, delta):
+        for job_id in self.selected_ids():
+            job = self.queue.get(job_id)
+            self.queue.update(job_id, priority=job['priority'] + delta)
+        self.refresh_table()
+
+    def remove_selected(self):
+        for job_id in self.selected_ids():
+            if job_id in self.runners:
+                self.runners[job_id].cancel()
+            self.queue.remove(job_id)
+        self.refresh_table()
+
+    def clear_finished(self):
+        self.queue.clear_finished()
+        self.refresh_table()
+
+    def toggle_queue(self):
+        """Start scheduling jobs, or stop launching new ones"""
+        self.active = not self.active
+        self.start_btn.setText("Stop Queue" if self.active else "Start Queue")
+        if self.active:
+            self.schedule()
+
+    def schedule(self):
+        """Launch queued jobs until the concurrency limit is reached"""
+        if not self.active:
+            return
+        pending = self.queue.pending()
+        while pending and len(self.runners) < self.concurrency():
+            job = pending.pop(0)
+            self.queue.update(job['id'], status='running', done=0, started=time.time())
+            runner = QueueJobRunner(job, self)
+            runner.progress.connect(self.on_job_progress)
+            runner.job_finished.connect(self.on_job_finished)
+            self.runners[job['id']] = runner
+            runner.start()
+
+        if not pending and not self.runners:
+            self.active = False
+            self.start_btn.setText("Start Queue")
+        self.refresh_table()
+
+    def on_job_progress(self, job_id, done):
+        self.queue.update(job_id, done=done)
+        self.refresh_table()
+
+    def on_job_finished(self, job_id, returncode):
+        runner = self.runners.pop(job_id, None)
+        if runner is None:
+            # Already handled by stop_all
+            return
+        runner.wait()
+        job = self.queue.get(job_id)
+        if job is not None:
+            if runner.cancelled:
+                status = 'cancelled'
+            else:
+                status = 'done' if returncode == 0 else 'failed'
+            self.queue.update(job_id, status=status, finished=time.time())
+
+            # Let the main window report the job if notifications are on
+            parent = self.parent()
+            if parent is not None and parent.notify_check.isChecked():
+                job_name = os.path.splitext(os.path.basename(job['hip']))[0]
+                icon = '✅' if status == 'done' else '⚠️'
+                parent.send_push_notification(
+                    f"{icon} Queue job {status}: {job_name}\n"
+                    f"ROP: {job['out']}\n"
+                    f"Frames: {job['done']}/{job['total']}\n"
+                    f"Left in queue: {len(self.queue.pending())}"
+                )
+        self.schedule()
+
+    def stop_all(self):
+        """Kill running jobs, they stay queued for the next session"""
+        self.active = False
+        for job_id, runner in list(self.runners.items()):
+            runner.cancel()
+            runner.wait(5000)
+            self.queue.update(job_id, status='queued', done=0)
+        self.runners = {}
+
+    def refresh_table(self):
+        jobs = self.queue.ordered()
+        self.table.setRowCount(len(jobs))
+        for row, job in enumerate(jobs):
+            if job.get('frames'):
+                frames = job['frames']
+            elif job['userange']:
+                frames = f"{job['sframe']}-{job['eframe']}"
+            else:
+                frames = "ROP range"
+            values = [
+                str(job['priority']),
+                job['hip'],
+                job['out'],
+                frames,
+                "Yes" if job['useskip'] else "No",
+                job['status'],
+                f"{job['done']}/{job['total']}"
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                item.setData(Qt.UserRole, job['id'])
+                self.table.setItem(row, column, item)
+
 class HoudiniRenderGUI(QMainWindow):
     # Define signals for thread-safe UI updates
-    output_signal = Signal(str)
-    raw_output_signal = Signal(str)
     progress_signal = Signal(int, int)
     image_update_signal = Signal(str)
     render_finished_signal = Signal()
@@ -334,7 +821,7 @@ class HoudiniRenderGUI(QMainWindow):
                 background-color: #D0D0D0;
                 border-radius: 2px;
             }
-            QTextEdit {
+            QTextEdit, QPlainTextEdit {
                 background-color: #131313;
                 color: #ffffff;
                 border: 1px solid #555555;
@@ -382,7 +869,7 @@ class HoudiniRenderGUI(QMainWindow):
         self.refresh_out_btn = QPushButton()
         self.refresh_out_btn.setIcon(QIcon.fromTheme("view-refresh"))
         self.refresh_out_btn.setToolTip("Refresh out nodes from HIP file")
-        self.refresh_out_btn.clicked.connect(self.refresh_out_nodes)
+        self.refresh_out_btn.clicked.connect(lambda: self.refresh_out_nodes(force=True))
         self.refresh_out_btn.setFixedWidth(30)
 
         # Frame range widgets
@@ -401,10 +888,47 @@ class HoudiniRenderGUI(QMainWindow):
         self.end_frame.setAlignment(Qt.AlignCenter)
         self.end_frame.setText("100")
 
+        # Frame list and render order widgets
+        self.frame_list_label = QLabel("Frames:")
+        self.frame_list_input = QLineEdit()
+        self.frame_list_input.setPlaceholderText("e.g. 1-100x5,120,200-210")
+        self.frame_list_input.setToolTip("Render these frames instead of the start to end range")
+        self.order_label = QLabel("Order:")
+        self.order_combo = QComboBox()
+        self.order_combo.addItems(["Sequential", "Reverse", "Coarse to Fine"])
+        self.order_combo.setToolTip(
+            "Coarse to Fine: render the first and last frame, then fill in between at\n"
+            "halving steps, so problems anywhere in the shot show up early"
+        )
+
         # Skip frames widget
         self.skip_check = QCheckBox("Skip Rendered Frames")
         self.skip_check.setChecked(False)
 
+        # Warm worker widget
+        self.warm_check = QCheckBox("Keep Scene Loaded")
+        self.warm_check.setToolTip(
+            "Keep one hython process alive between renders so the scene\n"
+            "is only reloaded when the hip file changes on disk"
+        )
+        self.warm_check.setChecked(False)
+        self.worker = RenderWorker()
+
+        # Parallel chunk widgets
+        self.chunks_label = QLabel("Processes:")
+        self.chunks_input = QLineEdit()
+        self.chunks_input.setPlaceholderText("1")
+        self.chunks_input.setFixedWidth(40)
+        self.chunks_input.setAlignment(Qt.AlignCenter)
+        self.chunks_input.setText("1")
+        self.chunks_input.setToolTip("Split the frame range across this many hython processes")
+        self.chunk_mode = QComboBox()
+        self.chunk_mode.addItems(["Contiguous", "Interleaved"])
+        self.chunk_mode.setToolTip(
+            "Contiguous: each process renders one block of the range\n"
+            "Interleaved: each process renders every Nth frame"
+        )
+
         # Now create layouts
         self.layout = QVBoxLayout(self.central_widget)
         self.layout.setSpacing(0)
@@ -460,14 +984,30 @@ class HoudiniRenderGUI(QMainWindow):
         to_label.setAlignment(Qt.AlignCenter)
         frame_range_layout.addWidget(to_label)
         frame_range_layout.addWidget(self.end_frame)
+        frame_range_layout.addSpacing(12)
+        frame_range_layout.addWidget(self.chunks_label)
+        frame_range_layout.addWidget(self.chunks_input)
+        frame_range_layout.addWidget(self.chunk_mode)
         frame_range_layout.addStretch()
         overrides_layout.addLayout(frame_range_layout)
 
+        # Add frame list layout to overrides
+        frame_list_layout = QHBoxLayout()
+        frame_list_layout.setContentsMargins(0, 0, 0, 0)
+        frame_list_layout.setSpacing(6)
+        frame_list_layout.addWidget(self.frame_list_label)
+        frame_list_layout.addWidget(self.frame_list_input)
+        frame_list_layout.addSpacing(12)
+        frame_list_layout.addWidget(self.order_label)
+        frame_list_layout.addWidget(self.order_combo)
+        overrides_layout.addLayout(frame_list_layout)
+
         # Add skip frames layout to overrides
         skip_frames_layout = QHBoxLayout()
         skip_frames_layout.setContentsMargins(0, 0, 0, 0)
         skip_frames_layout.setSpacing(6)
         skip_frames_layout.addWidget(self.skip_check)
+        skip_frames_layout.addWidget(self.warm_check)
         skip_frames_layout.addStretch()
         overrides_layout.addLayout(skip_frames_layout)
 
@@ -560,6 +1100,16 @@ class HoudiniRenderGUI(QMainWindow):
         self.cancel_btn.setStyleSheet("background-color: #ff4c00; color: #000000;")
         self.cancel_btn.hide()
 
+        self.queue_add_btn = QPushButton("Add to Queue")
+        self.buttons_layout.addWidget(self.queue_add_btn)
+        self.queue_add_btn.clicked.connect(self.add_to_queue)
+        self.queue_add_btn.setEnabled(False)
+
+        self.queue_btn = QPushButton("Queue")
+        self.buttons_layout.addWidget(self.queue_btn)
+        self.queue_btn.clicked.connect(self.show_queue)
+        self.queue_dialog = RenderQueueDialog(self)
+
         self.render_btn = QPushButton("Render")
         self.render_btn.clicked.connect(self.start_render)
         self.render_btn.setStyleSheet("background-color: #ff4c00; color: #000000;")
@@ -628,9 +1178,15 @@ class HoudiniRenderGUI(QMainWindow):
         self.summary_text.setAlignment(Qt.AlignLeft)
         self.summary_text.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         
-        self.raw_text = QTextEdit()
+        # The summary writes through its own cursor, the view's cursor and selection stay put
+        max_lines = int(self.settings.get('log_max_lines', LOG_MAX_LINES))
+        self.summary_text.document().setMaximumBlockCount(max_lines)
+        self.summary_cursor = QTextCursor(self.summary_text.document())
+        
+        self.raw_text = QPlainTextEdit()
+        self.raw_text.setMaximumBlockCount(max_lines)
         self.raw_text.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #212121;
                 color: #cccccc;
                 border: none;
@@ -662,10 +1218,17 @@ class HoudiniRenderGUI(QMainWindow):
         """)
         self.raw_text.setReadOnly(True)
         self.raw_text.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
-        self.raw_text.setAlignment(Qt.AlignLeft)
         self.raw_text.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.raw_text.hide()  # Hide raw text by default
         
+        # Log lines from the render thread are buffered and flushed on a timer
+        self.log_lock = threading.Lock()
+        self.summary_pending = []
+        self.raw_pending = []
+        self.log_flush_timer = QTimer(self)
+        self.log_flush_timer.setInterval(LOG_FLUSH_MS)
+        self.log_flush_timer.timeout.connect(self.flush_log_output)
+        
         # Add text widgets to splitter
         self.text_splitter.addWidget(self.summary_text)
         self.text_splitter.addWidget(self.raw_text)
@@ -809,6 +1372,39 @@ class HoudiniRenderGUI(QMainWindow):
         self.image_layout.setContentsMargins(1, 1, 1, 1)
         self.image_layout.addWidget(self.placeholder_widget)
         self.layout.addWidget(self.image_frame)
+
+        # Flipbook over the frames rendered so far, shown once there are two of them
+        self.flipbook_widget = QWidget()
+        flipbook_layout = QHBoxLayout(self.flipbook_widget)
+        flipbook_layout.setContentsMargins(0, 4, 0, 0)
+        self.play_btn = QPushButton("Play")
+        self.play_btn.setCheckable(True)
+        self.play_btn.toggled.connect(self.toggle_flipbook_playback)
+        self.flipbook_slider = QSlider(Qt.Horizontal)
+        self.flipbook_slider.setRange(0, 0)
+        self.flipbook_slider.valueChanged.connect(self.show_flipbook_frame)
+        self.flipbook_slider.sliderMoved.connect(self.on_flipbook_scrubbed)
+        self.flipbook_label = QLabel()
+        self.fps_input = QLineEdit()
+        self.fps_input.setPlaceholderText("24")
+        self.fps_input.setFixedWidth(40)
+        self.fps_input.setAlignment(Qt.AlignCenter)
+        self.fps_input.setText("24")
+        self.fps_input.setToolTip("Flipbook playback speed in frames per second")
+        flipbook_layout.addWidget(self.play_btn)
+        flipbook_layout.addWidget(self.flipbook_slider)
+        flipbook_layout.addWidget(self.flipbook_label)
+        flipbook_layout.addWidget(self.fps_input)
+        flipbook_layout.addWidget(QLabel("fps"))
+        self.layout.addWidget(self.flipbook_widget)
+        self.flipbook_widget.hide()
+
+        self.flipbook_frames = []  # Rendered frame paths, sorted by frame number
+        self.flipbook_keys = []
+        self.flipbook_follow = True  # Jump to each new frame until the user scrubs
+        self.flipbook_frame_bytes = 0
+        self.flipbook_timer = QTimer(self)
+        self.flipbook_timer.timeout.connect(self.step_flipbook)
         
         # Don't hide the image frame anymore, just hide the placeholder when renders start
         # self.image_frame.hide()  # Remove this line
@@ -854,16 +1450,45 @@ class HoudiniRenderGUI(QMainWindow):
             self.image_widgets.append((image_label, name_label))
 
         # After creating all widgets, connect the signals
-        self.output_signal.connect(self.append_output_safe)
-        self.raw_output_signal.connect(self.append_raw_output_safe)
         self.progress_signal.connect(self.update_progress_safe)
         self.image_update_signal.connect(self.update_image_preview_safe)
         self.render_finished_signal.connect(self.render_finished)
         self.time_labels_signal.connect(self.update_time_labels_safe)
 
+        # Push notifications go out from their own thread
+        self.notifier = NotificationDispatcher(self.settings.get('notification_url') or None)
+
+        # Per-frame metrics database, opened by the first render that records to it
+        self.metrics = None
+
+        # Decoded thumbnails are shared by the previews and notifications
+        thumbnail_dir = None
+        if self.settings.get('thumbnail_disk_cache', False):
+            thumbnail_dir = os.path.join(get_cache_dir(), 'thumbnails')
+        self.thumbnails = ThumbnailCache(
+            int(self.settings.get('thumbnail_cache_mb', 256)) * 1024 * 1024, thumbnail_dir
+        )
+
+        # Previews are decoded in the background, see update_image_preview_safe
+        self.preview_loader = PreviewLoader(len(self.image_widgets), self.thumbnails)
+        self.preview_loader.loaded.connect(self.on_preview_loaded)
+        self.flipbook_prefetcher = FlipbookPrefetcher(len(self.image_widgets), self.thumbnails)
+
         # Create the loader thread
         self.hip_loader = HipFilesLoader()
         self.hip_loader.finished.connect(self.on_hip_files_loaded)
+
+        # ROP scans run in their own threads and are cached on disk
+        self.rop_cache = RopScanCache()
+        self.render_frames = None  # Frame list of the current render when only missing frames are sent
+        self.journal = None
+        self.supervisor = None
+        self.render_script = None
+        self.gave_up = False  # The supervisor ran out of retries on this render
+        self.returncodes = []  # Exit codes of the last launch, None for a warm worker still up
+        self.out_loaders = []
+        self.node_settings = {}
+        self.out_input.currentTextChanged.connect(self.on_out_node_changed)
         
         # Load settings last
         self.load_settings()
@@ -872,7 +1497,12 @@ class HoudiniRenderGUI(QMainWindow):
         self.setMinimumWidth(800)  # Or whatever minimum width you prefer
 
         # Store original image data and dimensions
-        self.original_images = [None] * 20  # Will store tuples of (bytes, width, height)
+        self.source_pixmaps = [None] * 20  # Unscaled preview of each slot, built once per frame
+        self.scaled_pixmaps = {}  # (slot, width) -> smoothly scaled pixmap
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(RESIZE_SETTLE_MS)
+        self.resize_timer.timeout.connect(self.adjust_image_sizes)
 
         # Add this to your __init__ before setting the stylesheet:
         self.create_down_arrow_icon()
@@ -948,7 +1578,7 @@ class HoudiniRenderGUI(QMainWindow):
 
         # Initialize render-related variables
         self.total_frames = 0
-        self.process = None
+        self.processes = []
         self.canceling = False
         self.renderedImage = None
 
@@ -1002,6 +1632,9 @@ class HoudiniRenderGUI(QMainWindow):
         # Apply styles to all buttons
         self.switch_btn.setStyleSheet(standard_btn_style)
         self.open_folder_btn.setStyleSheet(standard_btn_style)
+        self.play_btn.setStyleSheet(standard_btn_style)
+        self.queue_add_btn.setStyleSheet(standard_btn_style)
+        self.queue_btn.setStyleSheet(standard_btn_style)
         
         # Action buttons (Render and Cancel)
         self.render_btn.setStyleSheet(action_btn_style)
@@ -1027,7 +1660,12 @@ class HoudiniRenderGUI(QMainWindow):
         self.range_check.stateChanged.connect(self.save_settings)
         self.start_frame.textChanged.connect(self.save_settings)
         self.end_frame.textChanged.connect(self.save_settings)
+        self.chunks_input.textChanged.connect(self.save_settings)
+        self.fps_input.textChanged.connect(self.save_settings)
+        self.chunk_mode.currentIndexChanged.connect(self.save_settings)
         self.skip_check.stateChanged.connect(self.save_settings)
+        self.warm_check.stateChanged.connect(self.save_settings)
+        self.warm_check.stateChanged.connect(self.toggle_warm_worker)
 
         # Add specific styling for the frame range inputs
         frame_input_style = """
@@ -1084,17 +1722,66 @@ class HoudiniRenderGUI(QMainWindow):
         # Initial render button state
         self.update_render_button()
 
+        # Startup timing, see paintEvent and finish_startup
+        self.startup_benchmark = False
+        self.startup_times = {'construct': (time.perf_counter() - STARTUP_T0) * 1000}
+        self.startup_done = False
+
+    def paintEvent(self, event):
+        """Record the first paint and start the deferred startup work after it"""
+        super().paintEvent(event)
+        if 'first_paint' not in self.startup_times:
+            self.startup_times['first_paint'] = (time.perf_counter() - STARTUP_T0) * 1000
+            QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self):
+        """Kick off the background scans once the window is on screen"""
+        if self.startup_done:
+            return
+        self.startup_done = True
+        self.refresh_hip_list()
+
+        # The event loop is free again once the scans are handed to their threads
+        QTimer.singleShot(0, self.report_startup)
+
+    def report_startup(self):
+        """Report time-to-first-paint and time-to-interactive against the budget"""
+        self.startup_times['interactive'] = (time.perf_counter() - STARTUP_T0) * 1000
+        times = self.startup_times
+        over_budget = times['first_paint'] > STARTUP_BUDGET_MS
+        print(
+            f"Startup: constructed {times['construct']:.0f}ms, first paint {times['first_paint']:.0f}ms, "
+            f"interactive {times['interactive']:.0f}ms (budget {STARTUP_BUDGET_MS:.0f}ms)"
+        )
+        if over_budget:
+            print(f"Warning: first paint took longer than the {STARTUP_BUDGET_MS:.0f}ms startup budget")
+
+        if self.startup_benchmark:
+            print(json.dumps({
+                'benchmark': 'startup',
+                'construct_ms': round(times['construct'], 1),
+                'first_paint_ms': round(times['first_paint'], 1),
+                'interactive_ms': round(times['interactive'], 1),
+                'budget_ms': STARTUP_BUDGET_MS,
+                'over_budget': over_budget
+            }))
+            QApplication.instance().exit(1 if over_budget else 0)
+
     def create_down_arrow_icon(self):
         """Create a down arrow icon if it doesn't exist"""
         if not os.path.exists('down_arrow.png'):
             # Create a 12x12 transparent image
-            img = PIL.Image.new('RGBA', (12, 12), (0, 0, 0, 0))
-            from PIL import ImageDraw
-            draw = ImageDraw.Draw(img)
+            img = QImage(12, 12, QImage.Format_ARGB32)
+            img.fill(Qt.transparent)
+            painter = QPainter(img)
+            painter.setRenderHint(QPainter.Antialiasing)
             
             # Draw triangle with dark background and light border
             # Draw background triangle
-            draw.polygon([(2, 4), (10, 4), (6, 8)], fill='#ffffff')
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor('#ffffff'))
+            painter.drawPolygon(QPolygon([QPoint(2, 4), QPoint(10, 4), QPoint(6, 8)]))
+            painter.end()
             
             img.save('down_arrow.png')
 
@@ -1104,11 +1791,13 @@ class HoudiniRenderGUI(QMainWindow):
             state = self.range_check.isChecked()
         self.start_frame.setEnabled(state)
         self.end_frame.setEnabled(state)
+        self.chunks_input.setEnabled(state)
+        self.chunk_mode.setEnabled(state)
+        self.frame_list_input.setEnabled(state)
 
     def load_settings(self):
         """Load saved settings into UI elements"""
-        # Start the hip files refresh
-        self.refresh_hip_list()
+        # The hip files refresh waits for the first paint, see finish_startup
         
         # Set the last used hip path immediately
         last_hip = self.settings.get('last_hipname', DEFAULT_FOLDER)
@@ -1122,9 +1811,16 @@ class HoudiniRenderGUI(QMainWindow):
         self.range_check.setChecked(self.settings.get('last_userange', False))
         self.start_frame.setText(str(self.settings.get('last_start', 0)))
         self.end_frame.setText(str(self.settings.get('last_end', 100)))
+        self.chunks_input.setText(str(self.settings.get('last_chunks', 1)))
+        self.chunk_mode.setCurrentIndex(1 if self.settings.get('last_interleaved', False) else 0)
+        self.frame_list_input.setText(self.settings.get('last_frame_list', ''))
+        order = self.settings.get('render_order', 'sequential')
+        self.order_combo.setCurrentIndex(RENDER_ORDERS.index(order) if order in RENDER_ORDERS else 0)
         self.toggle_frame_range()
         
         self.skip_check.setChecked(self.settings.get('last_useskip', False))
+        self.warm_check.setChecked(self.settings.get('use_warm_worker', False))
+        self.fps_input.setText(str(self.settings.get('flipbook_fps', 24)))
         
         self.notify_check.setChecked(self.settings.get('notifications_enabled', False))
         self.notify_frames.setText(str(self.settings.get('notification_interval', 10)))
@@ -1143,8 +1839,14 @@ class HoudiniRenderGUI(QMainWindow):
         self.settings.set('last_userange', self.range_check.isChecked())
         self.settings.set('last_start', self.start_frame.text())
         self.settings.set('last_end', self.end_frame.text())
+        self.settings.set('last_chunks', self.chunks_input.text())
+        self.settings.set('last_interleaved', self.chunk_mode.currentIndex() == 1)
+        self.settings.set('last_frame_list', self.frame_list_input.text())
+        self.settings.set('render_order', RENDER_ORDERS[self.order_combo.currentIndex()])
         
         self.settings.set('last_useskip', self.skip_check.isChecked())
+        self.settings.set('use_warm_worker', self.warm_check.isChecked())
+        self.settings.set('flipbook_fps', self.fps_input.text())
         
         self.settings.set('notifications_enabled', self.notify_check.isChecked())
         self.settings.set('notification_interval', self.notify_frames.text())
@@ -1155,8 +1857,8 @@ class HoudiniRenderGUI(QMainWindow):
         """Helper to get unique items from QComboBox"""
         return list(set(combo.itemText(i) for i in range(combo.count())))
 
-    def start_render(self):
-        """Start the render process"""
+    def _prepare_render_ui(self):
+        """Reset buttons, previews and the flipbook for a new render"""
         self.render_btn.hide()
         self.cancel_btn.show()
         self.canceling = False
@@ -1167,45 +1869,172 @@ class HoudiniRenderGUI(QMainWindow):
             label.clear()
             name_label.clear()
             label.parent().hide()
-        
-        # Create the temp Python file
-        create_temp_python_file()
-        
-        # Calculate total frames
+        self.clear_flipbook()
+
+    def _start_monitor(self, reader):
+        """Start the monitoring thread over reader"""
+        self.reader = reader
+        self.log_flush_timer.start()
+        self.render_thread = threading.Thread(
+            target=self.monitor_render,
+            daemon=True
+        )
+        self.render_thread.start()
+
+    def range_frames(self):
+        """Every frame of the override range or the ROP's own range and step, None if unknown"""
+        out = self.out_input.currentText()
         if self.range_check.isChecked():
+            return list(range(int(self.start_frame.text()), int(self.end_frame.text()) + 1))
+        if out in self.node_settings:
+            settings = self.node_settings[out]
+            return list(range(settings['f1'], settings['f2'] + 1, self.rop_step()))
+        return None
+
+    def rop_step(self):
+        """The frame step hython renders with, the ROP's own f3 unless the range is overridden"""
+        if self.range_check.isChecked():
+            return 1
+        return self.node_settings.get(self.out_input.currentText(), {}).get('f3', 1)
+
+    def requested_frames(self):
+        """The frame list override in render order, None to render the range as it is
+
+        Raises ValueError for a malformed frame list.
+        """
+        frame_list = self.frame_list_input.text().strip() if self.range_check.isChecked() else ''
+        order = RENDER_ORDERS[self.order_combo.currentIndex()]
+        if frame_list:
+            return order_frames(parse_frame_list(frame_list), order)
+        frames = self.range_frames()
+        if order == 'sequential' or frames is None:
+            return None
+        return order_frames(frames, order)
+
+    def frames_to_send(self):
+        """The frames to send to hython in render order, None to render the range as it is
+
+        With skip on the output pattern from the ROP scan drops the finished
+        frames, so they are never sent to hython at all.
+        """
+        frames = self.requested_frames()
+        if not self.skip_check.isChecked():
+            return frames
+        explicit = frames is not None
+        if frames is None:
+            frames = self.range_frames()
+            if frames is None:
+                return None
+        missing = frames_to_render(self.hip_input.currentText(), self.out_input.currentText(),
+                                   frames, self.rop_cache)
+        if missing is None:
+            return frames if explicit else None
+        if len(missing) == len(frames) and not explicit:
+            return None
+        return missing
+
+    def start_render(self):
+        """Start the render process"""
+        try:
+            self.render_frames = self.frames_to_send()
+            journal_frames = self.render_frames or self.range_frames()
+        except ValueError as e:
+            self.append_output_safe(f'\n{e}\n', color='#ff7a7a')
+            return
+        if self.render_frames == []:
+            self.append_output_safe('\nEvery frame is already rendered, nothing to do\n', color='#7abfff')
+            return
+        self._prepare_render_ui()
+
+        # Finished frames go to a journal, a crashed render is relaunched on the rest.
+        # It holds exactly the frames hython gets: the frame list, the override range
+        # or the scanned ROP's stepped range (merges aren't scanned, so they get none)
+        self.journal = self.supervisor = None
+        self.gave_up = False
+        if journal_frames:
+            try:
+                self.journal = RenderJournal(self.hip_input.currentText(), self.out_input.currentText(),
+                                             journal_frames).open()
+                self.supervisor = RenderSupervisor(
+                    self.journal, retries=int(self.settings.get('crash_retries', RenderSupervisor.RETRIES))
+                )
+            except (OSError, ValueError) as e:
+                print(f"Error opening render journal: {e}")
+        
+        # Calculate total frames and split the range into chunks
+        chunks = [(self.start_frame.text(), self.end_frame.text(), 1)]
+        frame_lists = [self.render_frames]
+        try:
+            process_count = int(self.chunks_input.text() or "1")
+        except ValueError:
+            process_count = 1
+        if self.render_frames:
+            # A frame list split across the processes, coarse to fine order is kept per process
+            self.total_frames = len(self.render_frames)
+            if process_count > 1 and self.range_check.isChecked():
+                interleaved = (self.chunk_mode.currentIndex() == 1
+                               or self.order_combo.currentIndex() != 0)
+                frame_lists = split_frames(self.render_frames, process_count, interleaved=interleaved)
+            first, last = min(self.render_frames), max(self.render_frames)
+            chunks = [(first, last, self.rop_step())] * len(frame_lists)
+        elif self.range_check.isChecked():
             start = int(self.start_frame.text())
             end = int(self.end_frame.text())
             self.total_frames = end - start + 1
+            if process_count > 1:
+                chunks = split_frame_range(start, end, process_count,
+                                           interleaved=self.chunk_mode.currentIndex() == 1)
+                frame_lists = [None] * len(chunks)
         else:
             # If no range specified, assume single frame
             self.total_frames = 1
         
-        # Build command list without quotes
-        cmd = [
-            'hython',
-            os.path.join(dir_path, 'hardeen_temp.py'),
-            '-i', self.hip_input.currentText(),
-            '-o', self.out_input.currentText(),
-            '-s', self.start_frame.text(),
-            '-e', self.end_frame.text(),
-            '-u', str(self.range_check.isChecked()),
-            '-r', str(self.skip_check.isChecked())
-        ]
-            
-        # Start process
-        self.process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            start_new_session=True
-        )
+        self.processes = []
+        commands = []
+        if self.warm_check.isChecked() and len(chunks) == 1:
+            # Hand the job to the warm worker, it only reloads a changed scene
+            reused = self.worker.is_alive()
+            process = self.worker.submit(
+                self.hip_input.currentText(),
+                self.out_input.currentText(),
+                self.start_frame.text(),
+                self.end_frame.text(),
+                self.range_check.isChecked(),
+                self.skip_check.isChecked(),
+                self.render_frames
+            )
+            self.processes.append(process)
+            commands.append([
+                'hython worker (pid {}{})'.format(
+                    process.pid, ', reused' if reused else ''),
+                self.hip_input.currentText(),
+                self.out_input.currentText()
+            ])
+        else:
+            # Create the temp Python file, removed when the render is over
+            self.render_script = create_temp_python_file()
+
+            for (chunk_start, chunk_end, step), frames in zip(chunks, frame_lists):
+                # Build command list without quotes
+                cmd = build_render_command(
+                    self.render_script,
+                    self.hip_input.currentText(),
+                    self.out_input.currentText(),
+                    chunk_start,
+                    chunk_end,
+                    self.range_check.isChecked(),
+                    self.skip_check.isChecked(),
+                    step,
+                    frames
+                )
 
-        # Start monitoring thread
-        self.render_thread = threading.Thread(
-            target=self.monitor_render,
-            daemon=True
-        )
-        self.render_thread.start()
+                # Start process, its JSON events arrive on a separate pipe
+                self.processes.append(launch_render(cmd))
+                commands.append(cmd)
+
+        # Start monitoring thread, it wakes up only when a process writes or exits
+        self.record_dir = self.settings.get('record_dir', '')
+        self._start_monitor(RenderOutputReader(self.processes))
         
         # Log command
         self.append_output_safe(
@@ -1216,18 +2045,48 @@ class HoudiniRenderGUI(QMainWindow):
             bold=True,
             center=True
         )
-        self.append_output_safe(' '.join(cmd) + '\n', color='#c0c0c0')
+        for cmd in commands:
+            self.append_output_safe(' '.join(cmd) + '\n', color='#c0c0c0')
+        if self.render_frames:
+            frame_list = format_frame_list(self.render_frames)
+            if len(frame_list) > 200:
+                frame_list = frame_list[:200] + '...'
+            self.append_output_safe(f'Rendering {len(self.render_frames)} frames: {frame_list}\n',
+                                    color='#c0c0c0')
+        if len(commands) > 1:
+            self.append_output_safe(f'Rendering in {len(commands)} parallel processes\n', color='#c0c0c0')
         self.append_output_safe('Loading scene...\n', color='#c0c0c0')
         
         # Save settings
         self.save_settings()
 
+    def start_replay(self, path, speed=1.0):
+        """Play a recorded render back through the monitor, no Houdini needed"""
+        try:
+            reader = ReplayReader(path, speed)
+        except (OSError, ValueError) as e:
+            self.append_output_safe(f"Cannot replay {path}: {e}\n", color='#ff7a7a')
+            return
+        self._prepare_render_ui()
+        self.processes = []
+        self.journal = self.supervisor = None
+        self._start_monitor(reader)
+        self.append_output_safe(
+            f'\n\n REPLAYING {os.path.basename(path)} AT {speed:g}x \n\n',
+            color='#22adf2',
+            bold=True,
+            center=True
+        )
+
     def cancel_render(self):
         """Cancel the render process"""
         if not self.canceling:
             self.canceling = True
             self.cancel_btn.setText('Kill')
-            os.killpg(os.getpgid(self.process.pid), signal.SIGTERM)
+            self._signal_processes(signal.SIGTERM)
+            self.reader.stop()
+            if self.supervisor:
+                self.supervisor.stop()
             self.append_output_safe(
                 '\n Canceling after current frame... \n\n',
                 color='#ff7a7a',
@@ -1255,8 +2114,9 @@ class HoudiniRenderGUI(QMainWindow):
                 bold=True,
                 center=True
             )
-            os.killpg(os.getpgid(self.process.pid), signal.SIGKILL)
-            self.process.wait()
+            self._signal_processes(signal.SIGKILL)
+            for process in self.processes:
+                process.wait()
             self.append_output_safe(
                 '\n Render Killed \n\n',
                 color='#ff7a7a',
@@ -1282,35 +2142,74 @@ class HoudiniRenderGUI(QMainWindow):
             self.cancel_btn.hide()
             self.cancel_btn.setText('Cancel')
 
+    def _signal_processes(self, sig):
+        """Send a signal to the process group of every render process"""
+        for process in self.processes:
+            try:
+                os.killpg(os.getpgid(process.pid), sig)
+            except ProcessLookupError:
+                pass
+
     def monitor_render(self):
         """Monitor the render process and update UI"""
         try:
-            # Initialize time tracking variables
-            frame_times = []
-            frame_total = 0
-            frame_count = 0
-            average = 0
-            recent_average = 0
-            remaining_time = 0
-            total_time = 0
-            
-            start_time = datetime.datetime.now()
-            current_frame_start = None
-            current_frame = 0
-            notify_interval = int(self.notify_frames.text() or "10")
-            
             # Get total frames from UI or ROP settings
-            if self.range_check.isChecked():
-                total_frames = int(self.end_frame.text()) - int(self.start_frame.text()) + 1
+            range_start = None
+            start_time = None
+            workers = max(1, len(self.processes))
+            header = getattr(self.reader, 'header', None)
+            if header is not None:
+                # A replay knows its own frame count and runs on the recorded clock
+                total_frames = header['total_frames']
+                range_start = header['range_start']
+                workers = header['workers']
+                start_time = datetime.datetime.fromtimestamp(header['started'])
+            elif self.render_frames:
+                # Only the missing frames were sent
+                total_frames = len(self.render_frames)
+            elif self.range_check.isChecked():
+                range_start = int(self.start_frame.text())
+                total_frames = int(self.end_frame.text()) - range_start + 1
             else:
                 # Get from ROP settings if available
                 out_node = self.out_input.currentText()
                 if hasattr(self, 'node_settings') and out_node in self.node_settings:
                     settings = self.node_settings[out_node]
-                    total_frames = settings['f2'] - settings['f1'] + 1
+                    total_frames = len(range(settings['f1'], settings['f2'] + 1, settings.get('f3', 1)))
                 else:
                     total_frames = self.total_frames
 
+            # Every rendered frame goes to the metrics database unless 'record_metrics' is off,
+            # earlier renders of the same shot give the ETA before the first frame is done
+            collector = None
+            history = None
+            if header is None and self.settings.get('record_metrics', True):
+                hip = self.hip_input.currentText()
+                first = last = None
+                if range_start is not None:
+                    first, last = range_start, range_start + total_frames - 1
+                try:
+                    if self.metrics is None:
+                        self.metrics = MetricsStore()
+                    collector = FrameMetricsCollector(self.metrics, hip)
+                    history = self.metrics.history(hip, self.out_input.currentText(), first, last)
+                except (OSError, sqlite3.Error) as e:
+                    print(f"Error opening metrics database: {e}")
+
+            progress = RenderProgress(total_frames, workers, range_start, structured=True,
+                                      start_time=start_time, history=history)
+
+            # With the 'record_dir' setting every render is saved for replaying
+            if header is None and self.record_dir:
+                job_name = os.path.splitext(os.path.basename(self.hip_input.currentText()))[0]
+                self.reader.recorder = RenderRecorder(
+                    os.path.join(self.record_dir, f"{job_name}_{time.strftime('%Y%m%d_%H%M%S')}.jsonl"),
+                    total_frames, workers, range_start,
+                    hip=self.hip_input.currentText(), rop=self.out_input.currentText()
+                )
+                # Kept open through relaunches, closed once the render is over
+                self.reader.close_recorder = False
+
             # Update initial frame count display
             self.fc_value.setText("0")
             self.tfc_value.setText(str(total_frames))
@@ -1322,206 +2221,72 @@ class HoudiniRenderGUI(QMainWindow):
                 start_message = f"🎬 Starting render: {job_name}\nFrames: {total_frames}"
                 self.send_push_notification(start_message)
             
-            while self.process and self.process.poll() is None:
-                # Add timeout to readline to allow checking cancellation
-                ready = select.select([self.process.stdout], [], [], 0.1)[0]
-                if not ready:
-                    # No output available, check if we're canceling
-                    if self.canceling:
-                        break
-                    continue
-                    
-                line = self.process.stdout.readline()
-                if not line:
-                    break
-                    
-                line = line.decode(errors='backslashreplace').rstrip()
-                line = line.replace('[Redshift] ', '').replace('[Redshift]', '')
-                
-                # Update raw output
-                self.raw_output_signal.emit(line)
-                
-                # Check for new rendered image
-                if 'hardeen_outputfile:' in line:
-                    self.renderedImage = line.split(': ')[1]
-                    self.image_update_signal.emit(self.renderedImage)
-                    
-                    # Extract frame number from filename
-                    frame_match = re.search(r'\.(\d+)\.', self.renderedImage)
-                    if frame_match:
-                        current_frame = int(frame_match.group(1))
-                        # Calculate frame count based on position in range
-                        if self.range_check.isChecked():
-                            start_frame = int(self.start_frame.text())
-                            frame_count = current_frame - start_frame + 1
-                        else:
-                            frame_count += 1
-                        
-                        # Ensure frame count doesn't exceed total
-                        frame_count = min(frame_count, total_frames)
-                        
-                        # Update UI
-                        self.fc_value.setText(str(frame_count))
-                        self.progress_signal.emit(frame_count, total_frames)
-                    
-                    # Update frame count and times
-                    frame_count += 1
-                    if current_frame_start:
-                        frame_time = (datetime.datetime.now() - current_frame_start).total_seconds()
-                        frame_times.append(frame_time)
-                    
-                    # Calculate times using same logic as UI updates
-                    current_time = datetime.datetime.now()
-                    elapsed_time = (current_time - start_time).total_seconds()
-                    
-                    if frame_times:
-                        average = sum(frame_times) / len(frame_times)
-                        remaining_frames = total_frames - frame_count
-                        remaining_time = remaining_frames * average
-                        est_total = total_frames * average
-                        eta_dt = current_time + datetime.timedelta(seconds=remaining_time)
-                        
-                        # Calculate recent average from last two frames
-                        if len(frame_times) >= 2:
-                            recent_times = frame_times[-2:]
-                            recent_average = sum(recent_times) / len(recent_times)
-                        else:
-                            recent_average = average
+            while True:
+                for worker, source, value in self.reader:
+                    if collector:
+                        collector.feed(worker, source, value)
+                    if self.journal:
+                        self.journal.feed(worker, source, value)
+                    if source == 'event':
+                        events = progress.feed_event(value, worker)
                     else:
-                        # Initial estimates based on elapsed time
-                        if frame_count > 0:  # Avoid division by zero
-                            average = elapsed_time / frame_count
-                            remaining_frames = total_frames - frame_count
-                            remaining_time = remaining_frames * average
-                            est_total = total_frames * average
-                            recent_average = average
+                        # Update raw output, tagged with the process when rendering in chunks
+                        if workers > 1:
+                            self.queue_raw_output(f'[{worker + 1}] {value}')
                         else:
-                            average = 0
-                            remaining_time = 0
-                            est_total = 0
-                        eta_dt = current_time + datetime.timedelta(seconds=remaining_time)
-                    
-                    # Update UI time labels
-                    self.time_labels_signal.emit(
-                        elapsed_time,
-                        average,
-                        est_total,
-                        remaining_time,
-                        QDateTime(eta_dt),
-                        True
-                    )
-                    
-                    # Move notification code outside the else block
-                    if self.notify_check.isChecked():
-                        notify_interval = int(self.notify_frames.text() or "10")
-                        if current_frame % notify_interval == 0:
-                            job_name = os.path.splitext(os.path.basename(self.hip_input.currentText()))[0]
-                            
-                            message = (
-                                f"🎨 {job_name}\n"
-                                f"Frame: {current_frame}/{total_frames}\n"
-                                f"Elapsed: {format_time(elapsed_time)}\n"
-                                f"Avg Frame: {format_time(average)}\n"
-                                f"Remaining: {format_time(remaining_time)}\n"
-                                f"Est. Total: {format_time(est_total)}\n"
-                                f"ETA: {eta_dt.strftime('%I:%M:%S %p')}"  # Changed to 12-hour format
+                            self.queue_raw_output(value)
+                        events = progress.feed(value, worker)
+
+                    for kind, value in events:
+                        if kind == 'output':
+                            self.queue_output(value)
+                        elif kind == 'image':
+                            self.renderedImage = value
+                            self.image_update_signal.emit(value)
+                        elif kind == 'progress':
+                            self.fc_value.setText(str(value[0]))
+                            self.progress_signal.emit(*value)
+                        elif kind == 'total':
+                            self.tfc_value.setText(str(value))
+                        elif kind == 'frame':
+                            self.fc_value.setText(str(value))  # Update current frame
+                        elif kind == 'times':
+                            elapsed, average, est_total, remaining, eta, show_eta = value
+                            self.time_labels_signal.emit(
+                                elapsed, average, est_total, remaining, QDateTime(eta), show_eta
                             )
-                            
-                            # Convert EXR to PNG for notification
-                            if self.renderedImage.lower().endswith('.exr'):
-                                with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                                    buf = oiio.ImageBuf(self.renderedImage)
-                                    display_buf = oiio.ImageBufAlgo.colorconvert(buf, "linear", "srgb")
-                                    display_buf.write(tmp.name)
-                                    self.send_push_notification(message, tmp.name)
-                                    os.unlink(tmp.name)  # Clean up temp file
-                            else:
-                                self.send_push_notification(message, self.renderedImage)
-                
-                elif 'render started for' in line:
-                    frame_count = 0
-                    clean_line = line.split(' Time from')[0]
-                    self.output_signal.emit('\n' + clean_line + '\n')
-                    
-                    # Update total frames
-                    frame_total = int(re.findall(r'\d+', clean_line)[-1])
-                    self.fc_value.setText("0")
-                    self.tfc_value.setText(str(frame_total))
-                    self.progress_signal.emit(frame_count, frame_total)
-                    
-                elif 'Rendering frame' in line:
-                    # Extract current frame number
-                    frame_match = re.search(r'frame (\d+)', line)
-                    if frame_match:
-                        current_frame = frame_match.group(1)
-                        self.fc_value.setText(current_frame)  # Update current frame
-                    
-                    self.output_signal.emit(
-                        line.replace('Rendering f', 'F') + '\n'
-                    )
-                    current_frame_start = datetime.datetime.now()
-                    
-                    if average != 0:
-                        estimate = current_frame_start + datetime.timedelta(seconds=recent_average)
-                        self.output_signal.emit(
-                            f"   Started  {current_frame_start.strftime('%I:%M:%S %p')}\n"
-                            f"  Estimate  {estimate.strftime('%I:%M:%S %p')} - {format_time(recent_average)}\n"
-                        )
-                    
-                elif 'Skip rendering enabled. File already rendered' in line:
-                    # Handle skipped frames
-                    frame_count += 1
-                    self.fc_value.setText(str(frame_count))  # Update frame counter
-                    self.progress_signal.emit(frame_count, frame_total)
-                    self.output_signal.emit("   Skipped - File already exists\n")
-                    
-                elif 'scene extraction time' in line:
-                    if current_frame_start:
-                        # Extract render time
-                        match = re.search(r"total time (\d+\.\d+) sec", line)
-                        if match:
-                            render_time = float(match.group(1))
-                            frame_times.append(render_time)
-                            
-                            # Update progress
-                            frame_count += 1
-                            self.fc_value.setText(str(frame_count))
-                            self.progress_signal.emit(frame_count, frame_total)
-                            
-                            # Calculate averages
-                            average = sum(frame_times) / len(frame_times)
-                            if len(frame_times) >= 2:
-                                recent_times = frame_times[-2:]
-                                recent_average = (2 * recent_times[1]) - recent_times[0]
-                            else:
-                                recent_average = average
-                                
-                                # Calculate elapsed time
-                                current_time = datetime.datetime.now()
-                                elapsed_time = (current_time - start_time).total_seconds()
-                                
-                                # Calculate remaining time based on average
-                                remaining_frames = frame_total - frame_count
-                                remaining_time = remaining_frames * average
-                                
-                                # Calculate ETA
-                                eta_time = current_time + datetime.timedelta(seconds=remaining_time)
-                                
-                                # Update time labels
-                                self.time_labels_signal.emit(
-                                    elapsed_time,  # Total elapsed time
-                                    average,       # Average per frame
-                                    frame_total * average,  # Estimated total time
-                                    remaining_time,         # Remaining time
-                                    QDateTime(eta_time),    # ETA time
-                                    True                    # Show ETA
-                                )
-                                
+                        elif kind == 'frame_done':
+                            self.notify_frame_done(progress, value)
+
+                # A crashed render is relaunched on the frames it didn't finish
+                if not self.relaunch_after_crash():
+                    break
+
+            failed = self.canceling or any(self.returncodes)
+            if (self.journal and failed and not self.canceling and not self.gave_up
+                    and self.journal.remaining()):
+                # Failed without a retry, e.g. a bad ROP path
+                crashes = len(self.supervisor.crashes) if self.supervisor else 0
+                left = len(self.journal.remaining())
+                job_name = os.path.splitext(os.path.basename(self.hip_input.currentText()))[0]
+                self.announce_failure(
+                    f"\nRender failed (exit codes {self.returncodes})"
+                    f"{f' after {crashes} crash(es)' if crashes else ''}, "
+                    f"{left} frames not rendered\n",
+                    f"❌ Render failed: {job_name}\n"
+                    f"Exit codes: {self.returncodes}\n"
+                    f"Frames left: {left}"
+                )
+            elif self.supervisor and self.supervisor.crashes and not failed:
+                self.queue_output(f"\nRecovered from {len(self.supervisor.crashes)} crash(es)\n",
+                                  color='#7abfff')
+
             # Only send completion notification if not cancelled
-            if self.notify_check.isChecked() and not self.canceling:
+            if self.notify_check.isChecked() and not self.canceling and not (
+                    failed and self.journal and self.journal.remaining()):
                 job_name = os.path.splitext(os.path.basename(self.hip_input.currentText()))[0]
-                elapsed = time.time() - start_time.timestamp()
-                avg_time = format_time(average) if average else "N/A"
+                elapsed = time.time() - progress.start_time.timestamp()
+                avg_time = format_time(progress.average) if progress.average else "N/A"
                 
                 end_message = (
                     f"✅ Render Complete: {job_name}\n"
@@ -1531,6 +2296,18 @@ class HoudiniRenderGUI(QMainWindow):
                 )
                 self.send_push_notification(end_message)
             
+            # The warm worker keeps its event pipe for the next job
+            for process in self.processes:
+                if process.poll() is not None:
+                    close_render(process)
+            recorder = getattr(self.reader, 'recorder', None)
+            if recorder is not None:
+                recorder.close()
+            if self.journal:
+                self.journal.close(finished=not failed)
+            remove_temp_python_file(self.render_script)
+            self.render_script = None
+
             # After loop ends, make sure UI is updated
             self.render_finished_signal.emit()
             
@@ -1538,9 +2315,95 @@ class HoudiniRenderGUI(QMainWindow):
             print(f"Error in monitor thread: {str(e)}\n{traceback.format_exc()}")
             self.render_finished_signal.emit()
 
+    def announce_failure(self, summary, notification):
+        """Flag a crash or failure in the summary, and push it when notifications are on"""
+        self.queue_output(summary, color='#ff7a7a', bold=True)
+        if self.notify_check.isChecked():
+            self.send_push_notification(notification)
+
+    def relaunch_after_crash(self):
+        """Relaunch the render on its remaining frames if it crashed, True once it runs again
+
+        Called from the monitor thread. The retries and the growing pause
+        between them come from the supervisor, canceling stops the wait.
+        """
+        # The warm worker stays up between jobs, only a dead one counts
+        returncodes = [process.poll() if process is self.worker.process else process.wait()
+                       for process in self.processes]
+        self.returncodes = returncodes
+        if self.supervisor is None:
+            return False
+        if not self.supervisor.crashed(returncodes, self.canceling):
+            return False
+
+        delay = self.supervisor.next_delay()
+        remaining = order_frames(self.journal.remaining(),
+                                 RENDER_ORDERS[self.order_combo.currentIndex()])
+        job_name = os.path.splitext(os.path.basename(self.hip_input.currentText()))[0]
+        if delay is None:
+            # Out of retries, an unattended render must still say it died
+            self.gave_up = True
+            self.announce_failure(
+                f"\nRender crashed (exit codes {returncodes}) with {len(remaining)} frames left, "
+                f"giving up after {self.supervisor.retries} retries\n",
+                f"💥 Render crashed, giving up: {job_name}\n"
+                f"Frames left: {len(remaining)}"
+            )
+            return False
+        self.announce_failure(
+            f"\nRender crashed (exit codes {returncodes}) with {len(remaining)} frames left, "
+            f"relaunching in {format_time(delay)} "
+            f"(retry {self.supervisor.attempts} of {self.supervisor.retries})\n",
+            f"💥 Render crashed: {job_name}\n"
+            f"Frames left: {len(remaining)}\n"
+            f"Relaunching in {format_time(delay)}"
+        )
+        if not self.supervisor.wait(delay) or self.canceling:
+            return False
+
+        for process in self.processes:
+            close_render(process)
+        if self.render_script is None:
+            # The warm worker died, the relaunch runs in its own processes
+            self.render_script = create_temp_python_file()
+        interleaved = (self.chunk_mode.currentIndex() == 1
+                       or self.order_combo.currentIndex() != 0)
+        frame_lists = split_frames(remaining, max(1, len(self.processes)), interleaved=interleaved)
+        self.processes = [
+            launch_render(build_render_command(
+                self.render_script, self.hip_input.currentText(), self.out_input.currentText(),
+                min(frames), max(frames), True, self.skip_check.isChecked(), self.rop_step(), frames
+            ))
+            for frames in frame_lists
+        ]
+        self.reader = RenderOutputReader(self.processes, self.reader.recorder, close_recorder=False)
+        return True
+
+    def notify_frame_done(self, progress, current_frame):
+        """Send a progress notification every notify interval frames"""
+        if not self.notify_check.isChecked():
+            return
+        notify_interval = int(self.notify_frames.text() or "10")
+        if int(current_frame) % notify_interval != 0:
+            return
+
+        job_name = os.path.splitext(os.path.basename(self.hip_input.currentText()))[0]
+        message = (
+            f"🎨 {job_name}\n"
+            f"Frame: {current_frame}/{progress.total_frames}\n"
+            f"Elapsed: {format_time(progress.elapsed_time)}\n"
+            f"Avg Frame: {format_time(progress.average)}\n"
+            f"Remaining: {format_time(progress.remaining_time)}\n"
+            f"Est. Total: {format_time(progress.est_total)}\n"
+            f"ETA: {progress.eta.strftime('%I:%M:%S %p')}"  # Changed to 12-hour format
+        )
+        
+        self.send_push_notification(message, self.renderedImage, coalesce=True)
+
     def render_finished(self):
         """Handle render completion (called in main thread)"""
-        self.output_signal.emit('\n Rendering Stopped \n\n')
+        self.log_flush_timer.stop()
+        self.append_output_safe('\n Rendering Stopped \n\n')
         self.render_btn.show()
         self.cancel_btn.hide()
         self.cancel_btn.setText('Cancel')
@@ -1603,11 +2466,97 @@ class HoudiniRenderGUI(QMainWindow):
             self.remaining_value.setStyleSheet(time_style)
 
     def update_image_preview_safe(self, image_path):
-        """Update image preview safely (called in main thread)"""
-        try:
-            print(f"Attempting to update preview with image: {image_path}")
-            self.open_folder_btn.setEnabled(True)
+        """Add a rendered frame to the flipbook and preview it (called in main thread)"""
+        print(f"Attempting to update preview with image: {image_path}")
+        self.open_folder_btn.setEnabled(True)
+
+        if image_path not in self.flipbook_frames:
+            # Parallel chunks report frames out of order, keep the flipbook sorted
+            key = self._flipbook_key(image_path)
+            index = bisect.bisect(self.flipbook_keys, key)
+            self.flipbook_keys.insert(index, key)
+            self.flipbook_frames.insert(index, image_path)
+
+            self.flipbook_slider.blockSignals(True)
+            self.flipbook_slider.setMaximum(len(self.flipbook_frames) - 1)
+            if self.flipbook_follow:
+                self.flipbook_slider.setValue(index)
+            elif index <= self.flipbook_slider.value():
+                # Stay on the frame being looked at
+                self.flipbook_slider.setValue(self.flipbook_slider.value() + 1)
+            self.flipbook_slider.blockSignals(False)
+            self.flipbook_widget.setVisible(len(self.flipbook_frames) > 1)
+            self._update_flipbook_label()
+
+        if self.flipbook_follow:
+            self.preview_loader.request(image_path)
+
+    def _flipbook_key(self, image_path):
+        frame_num = re.search(r'\.(\d+)\.', os.path.basename(image_path))
+        return (int(frame_num.group(1)) if frame_num else 0, image_path)
+
+    def _update_flipbook_label(self):
+        if not self.flipbook_frames:
+            self.flipbook_label.clear()
+            return
+        index = self.flipbook_slider.value()
+        frame = self.flipbook_keys[index][0]
+        self.flipbook_label.setText(f"Frame {frame} ({index + 1}/{len(self.flipbook_frames)})")
+
+    def clear_flipbook(self):
+        """Forget the frames of the previous render"""
+        self.play_btn.setChecked(False)
+        self.flipbook_frames = []
+        self.flipbook_keys = []
+        self.flipbook_follow = True
+        self.flipbook_slider.blockSignals(True)
+        self.flipbook_slider.setRange(0, 0)
+        self.flipbook_slider.blockSignals(False)
+        self.flipbook_label.clear()
+        self.flipbook_widget.hide()
+
+    def on_flipbook_scrubbed(self, index):
+        """Follow new frames again only when scrubbed back to the end"""
+        self.flipbook_follow = index == self.flipbook_slider.maximum()
+
+    def show_flipbook_frame(self, index):
+        """Preview the flipbook frame at index and prefetch the ones after it"""
+        if not 0 <= index < len(self.flipbook_frames):
+            return
+        self.preview_loader.request(self.flipbook_frames[index])
+        self._update_flipbook_label()
+
+        # Prefetch as many frames as fit in half of the thumbnail cache
+        window = FLIPBOOK_PREFETCH
+        if self.flipbook_frame_bytes:
+            window = max(1, min(window, self.thumbnails.max_bytes // 2 // self.flipbook_frame_bytes))
+        count = len(self.flipbook_frames)
+        self.flipbook_prefetcher.request(
+            [self.flipbook_frames[(index + i) % count] for i in range(1, min(window + 1, count))]
+        )
+
+    def toggle_flipbook_playback(self, playing):
+        """Start or stop looping through the flipbook"""
+        if playing:
+            try:
+                fps = max(1.0, float(self.fps_input.text() or "24"))
+            except ValueError:
+                fps = 24.0
+            self.flipbook_follow = False
+            self.flipbook_timer.start(int(1000 / fps))
+            self.play_btn.setText("Pause")
+        else:
+            self.flipbook_timer.stop()
+            self.play_btn.setText("Play")
+
+    def step_flipbook(self):
+        """Advance the flipbook one frame, looping at the end"""
+        if self.flipbook_frames:
+            self.flipbook_slider.setValue((self.flipbook_slider.value() + 1) % len(self.flipbook_frames))
 
+    def on_preview_loaded(self, image_path, previews):
+        """Show previews decoded by the preview loader (called in main thread)"""
+        try:
             # Store current scroll positions and check if at bottom
             summary_scrollbar = self.summary_text.verticalScrollBar()
             raw_scrollbar = self.raw_text.verticalScrollBar()
@@ -1620,95 +2569,29 @@ class HoudiniRenderGUI(QMainWindow):
                 self.placeholder_widget.deleteLater()
                 del self.placeholder_widget
 
-            # Get frame number from path
-            frame_num = re.search(r'\.(\d+)\.', image_path)
-            
             if image_path.lower().endswith('.exr'):
-                # Load image using OpenImageIO
-                buf = oiio.ImageBuf(image_path)
-                subCount = 0
-                
+                self.flipbook_frame_bytes = sum(len(preview[1]) for preview in previews)
+
                 # Clear previous previews
                 for label, name_label in self.image_widgets:
                     label.clear()
                     name_label.clear()
                     label.parent().hide()
                 
-                # Process each subimage/AOV
-                while subCount < buf.nsubimages:
-                    if subCount >= len(self.image_widgets):
-                        break
-                        
+                # Show each subimage/AOV
+                for subCount, (layer_str, image_data, width, height) in enumerate(previews):
                     label, name_label = self.image_widgets[subCount]
                     label.parent().show()
+                    name_label.setText(layer_str)
                     
-                    spec = buf.spec()
-                    subimage = oiio.ImageBuf(image_path, subCount, 0)
-                    
-                    # Get channel names for this subimage
-                    channelnames = subimage.spec().channelnames
-                    layers = {}
-                    for channelname in channelnames:
-                        layername = ".".join(channelname.split(".")[:-1])
-                        if layername not in layers:
-                            layers[layername] = []
-                        layers[layername].append(channelname)
-
-                    # Create label text
-                    for layername, channelnames in layers.items():
-                        channels = [cn.split(".")[-1].lower() for cn in channelnames]
-                        if len(channels) == 1:
-                            channel_str = channels[0]
-                        else:
-                            channel_str = "".join(channels)
-                        if layername == "":
-                            layer_str = f"{channel_str}"
-                        else:
-                            layer_str = f"{layername}.{channel_str}"
-                        
-                        # Just set the layer string without frame number
-                        name_label.setText(layer_str)
-                    
-                    # Convert to display format
-                    display_buf = oiio.ImageBufAlgo.colorconvert(subimage, "linear", "srgb")
-                    pixels = display_buf.get_pixels(oiio.FLOAT)
-                    
-                    # Handle different channel configurations
-                    if len(pixels.shape) == 3:
-                        if pixels.shape[2] == 1:  # Single channel
-                            pixels = np.repeat(pixels, 3, axis=2)
-                        elif pixels.shape[2] not in [3, 4]:  # Not RGB or RGBA
-                            if pixels.shape[2] > 3:
-                                pixels = pixels[:, :, :3]
-                            else:
-                                padding = np.zeros((*pixels.shape[:2], 3-pixels.shape[2]))
-                                pixels = np.concatenate([pixels, padding], axis=2)
-                    elif len(pixels.shape) == 2:  # Single channel
-                        pixels = np.stack([pixels] * 3, axis=2)
-                    
-                    # Normalize the float data to 0-1 range
-                    pixels = np.clip(pixels, 0, 1)
-
-                    # Convert to 8-bit
-                    pixels = (pixels * 255).astype(np.uint8)
-                    
-                    # Convert to QPixmap
-                    img = PIL.Image.fromarray(pixels)
-                    
-                    # Store the original image data and dimensions
-                    self.original_images[subCount] = (
-                        img.tobytes("raw", "RGB"),
-                        img.width,
-                        img.height
-                    )
-                    
-                    # Initial scaling will be handled by adjust_image_sizes
-                    label.setPixmap(QPixmap.fromImage(QImage(
-                        self.original_images[subCount][0],  # bytes
-                        self.original_images[subCount][1],  # width
-                        self.original_images[subCount][2],  # height
-                        QImage.Format_RGB888
-                    )))
+                    # Keep the unscaled pixmap, scaling is handled by adjust_image_sizes
+                    self.source_pixmaps[subCount] = QPixmap.fromImage(QImage(
+                        image_data, width, height, width * 3, QImage.Format_RGB888
+                    ))
+                    self.scaled_pixmaps = {
+                        key: pixmap for key, pixmap in self.scaled_pixmaps.items() if key[0] != subCount
+                    }
+                    label.setPixmap(self.source_pixmaps[subCount])
                     label.setScaledContents(False)
                     label.setAlignment(Qt.AlignCenter)
                     
@@ -1726,10 +2609,9 @@ class HoudiniRenderGUI(QMainWindow):
                     """)
                     
                     print(f"Successfully loaded AOV: {layer_str}")
-                    subCount += 1
                     
             else:
-                self._preview_single_image(image_path)
+                self._preview_single_image(image_path, previews[0])
                 
             # After showing/hiding containers, adjust sizes
             self.adjust_image_sizes()
@@ -1743,10 +2625,11 @@ class HoudiniRenderGUI(QMainWindow):
         except Exception as e:
             print(f"Error updating image preview: {str(e)}\n{traceback.format_exc()}")
 
-    def _preview_single_image(self, image_path):
+    def _preview_single_image(self, image_path, image):
         """Helper method to preview a single image"""
         for label, name_label in self.image_widgets:
-            if label.pixmap() is None or label.pixmap().isNull():
+            # New frames fill the next free slot, flipbook frames reuse the first one
+            if not self.flipbook_follow or label.pixmap() is None or label.pixmap().isNull():
                 label.parent().show()
                 
                 frame_num = re.search(r'\.(\d+)\.', image_path)
@@ -1766,30 +2649,9 @@ class HoudiniRenderGUI(QMainWindow):
                     }
                 """)
                 
-                pixmap = QPixmap(image_path)
-                if not pixmap.isNull():
-                    scaled = pixmap.scaled(200, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    label.setPixmap(scaled)
+                label.setPixmap(QPixmap.fromImage(image))
                 break
 
-    def format_time(self, seconds):
-        """Format seconds into human readable time"""
-        timedelta = datetime.timedelta(seconds=seconds)
-        days = timedelta.days
-        hours, remainder = divmod(timedelta.seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        
-        parts = []
-        if days:
-            parts.append(f"{days}d")
-        if hours:
-            parts.append(f"{hours}h")
-        if minutes:
-            parts.append(f"{minutes}m")
-        if seconds or not any((days, hours, minutes)):
-            parts.append(f"{seconds}s")
-        return "".join(parts)
-
     def switch_output(self):
         """Switch between output views"""
         current_text = self.switch_btn.text()
@@ -1841,9 +2703,12 @@ class HoudiniRenderGUI(QMainWindow):
     def resizeEvent(self, event):
         """Handle window resize events"""
         super().resizeEvent(event)
-        self.adjust_image_sizes()
 
-    def adjust_image_sizes(self):
+        # Cheap scaling while the window is dragged, a smooth pass once it settles
+        self.adjust_image_sizes(smooth=False)
+        self.resize_timer.start()
+
+    def adjust_image_sizes(self, smooth=True):
         """Adjust image sizes based on window width and number of visible images"""
         visible_count = sum(1 for label, _ in self.image_widgets if label.parent().isVisible())
         if visible_count == 0:
@@ -1853,7 +2718,7 @@ class HoudiniRenderGUI(QMainWindow):
         available_width = self.image_frame.width() - (self.image_layout.spacing() * (visible_count - 1)) - 2
         
         # Calculate width for each container
-        width = max(100, min(300, available_width // visible_count))
+        width = max(100, min(PREVIEW_MAX_WIDTH, available_width // visible_count))
         
         # Track maximum height to adjust frame
         max_container_height = 0
@@ -1866,22 +2731,28 @@ class HoudiniRenderGUI(QMainWindow):
                 container.setFixedWidth(width)
                 
                 # Scale image from original if available
-                if self.original_images[i] is not None:
-                    image_data, img_width, img_height = self.original_images[i]
-                    
+                source = self.source_pixmaps[i]
+                if source is not None:
                     # Calculate height maintaining aspect ratio
-                    aspect_ratio = img_height / img_width
+                    aspect_ratio = source.height() / source.width()
                     target_height = int(width * aspect_ratio)
                     
-                    # Create QImage from original data
-                    qimg = QImage(image_data, img_width, img_height, QImage.Format_RGB888)
-                    pixmap = QPixmap.fromImage(qimg)
-                    
-                    # Scale the pixmap
-                    scaled = pixmap.scaled(width, target_height, 
-                                         Qt.KeepAspectRatio, 
-                                         Qt.SmoothTransformation)
-                    image_label.setPixmap(scaled)
+                    # Reuse the smooth scale for this width, or scale fast while resizing
+                    scaled = self.scaled_pixmaps.get((i, width))
+                    if scaled is None and smooth:
+                        scaled = source.scaled(width, target_height,
+                                               Qt.KeepAspectRatio,
+                                               Qt.SmoothTransformation)
+                        if len(self.scaled_pixmaps) > 4 * len(self.image_widgets):
+                            self.scaled_pixmaps.clear()
+                        self.scaled_pixmaps[(i, width)] = scaled
+                    elif scaled is None:
+                        scaled = source.scaled(width, target_height,
+                                               Qt.KeepAspectRatio,
+                                               Qt.FastTransformation)
+                    current = image_label.pixmap()
+                    if current is None or current.cacheKey() != scaled.cacheKey():
+                        image_label.setPixmap(scaled)
                     
                     # Calculate total container height (image + label)
                     LABEL_HEIGHT = 14  # Fixed height for labels
@@ -1961,30 +2832,54 @@ class HoudiniRenderGUI(QMainWindow):
             color='#7abfff'
         )
         
-        # Start loading state before refreshing out nodes
         if os.path.exists(text):
-            self.out_input.start_loading()
             self.refresh_out_nodes()
 
-    def refresh_out_nodes(self):
+    def refresh_out_nodes(self, force=False):
         """Refresh the list of out nodes from current hip file"""
-        current_text = self.out_input.currentText()
-        self.out_input.clear()
-        
         hip_file = self.hip_input.currentText()
-        if os.path.exists(hip_file):
-            # Start loading animation
+        if not os.path.isfile(hip_file):
+            return
+
+        cached = None if force else self.rop_cache.lookup(hip_file)
+        if cached:
+            out_nodes, node_settings, fresh = cached
+            self._process_out_nodes(out_nodes, node_settings, self.out_input.currentText(),
+                                    'cached' if fresh else 'cached, revalidating')
+            if fresh:
+                return
+        else:
             self.out_input.start_loading()
-            
-            # Use QTimer to allow the UI to update before processing
-            QTimer.singleShot(100, lambda: self._process_out_nodes(hip_file, current_text))
 
-    def _process_out_nodes(self, hip_file, current_text):
-        """Process out nodes after showing loading state"""
-        out_nodes, node_settings = parse_out_nodes(hip_file)
-        
-        # Stop loading animation
-        self.out_input.stop_loading()
+        # Scan in the background, the result is ignored if the hip changed meanwhile
+        loader = OutNodesLoader(hip_file, self)
+        loader.finished.connect(self.on_out_nodes_loaded)
+        self.out_loaders.append(loader)
+        loader.start()
+
+    def on_out_nodes_loaded(self, hip_file, out_nodes, node_settings):
+        """Handle a finished background ROP scan"""
+        loader = self.sender()
+        if loader in self.out_loaders:
+            self.out_loaders.remove(loader)
+        if loader is not None and loader.file_key and out_nodes:
+            self.rop_cache.store(hip_file, *loader.file_key, out_nodes, node_settings)
+
+        if hip_file != self.hip_input.currentText():
+            return
+        if self.out_input.loading:
+            self.out_input.stop_loading()
+            current_text = self.settings.get('last_outname', DEFAULT_OUTNODE)
+        else:
+            current_text = self.out_input.currentText()
+        self._process_out_nodes(out_nodes, node_settings, current_text, 'scanned')
+
+    def _process_out_nodes(self, out_nodes, node_settings, current_text, source):
+        """Fill the out node combobox from scan results"""
+        out_nodes = list(out_nodes)
+        self.out_input.blockSignals(True)
+        self.out_input.clear()
+        self.out_input.blockSignals(False)
         
         if out_nodes:
             # Reverse the list so latest nodes appear first
@@ -2003,8 +2898,15 @@ class HoudiniRenderGUI(QMainWindow):
                 print(f"  {path}")
                 self.out_input.addItem(path)
         
-        # Select the most recent out node (first in the list)
-        if out_nodes:
+        # Store node settings for later use
+        self.node_settings = node_settings
+        
+        # Keep the previous selection if this hip still has it
+        if current_text in out_nodes:
+            self.out_input.setCurrentText(current_text)
+            self.on_out_node_changed(current_text)
+        # Otherwise select the most recent out node (first in the list)
+        elif out_nodes:
             first_node = out_nodes[0]
             self.out_input.setCurrentText(first_node)
             
@@ -2018,14 +2920,8 @@ class HoudiniRenderGUI(QMainWindow):
             # If no new nodes found, restore previous selection
             self.out_input.setEditText(current_text)
         
-        # Store node settings for later use
-        self.node_settings = node_settings
-        
-        # Connect signal to handle out node changes
-        self.out_input.currentTextChanged.connect(self.on_out_node_changed)
-        
         self.append_output_safe(
-            f'\n Out nodes refreshed ({len(out_nodes)} nodes found) \n\n',
+            f'\n Out nodes refreshed ({len(out_nodes)} nodes found, {source}) \n\n',
             color='#7abfff',
             bold=True,
             center=True
@@ -2039,52 +2935,59 @@ class HoudiniRenderGUI(QMainWindow):
             self.end_frame.setText(str(settings['f2']))
             self.skip_check.setChecked(bool(settings['skip_rendered']))
 
+    def queue_output(self, text, color=None, bold=False, center=False):
+        """Buffer summary text until the next flush (safe from any thread)"""
+        with self.log_lock:
+            self.summary_pending.append((text, color, bold, center))
+
+    def queue_raw_output(self, text):
+        """Buffer a raw log line until the next flush (safe from any thread)"""
+        with self.log_lock:
+            self.raw_pending.append(text)
+
     def append_output_safe(self, text, color=None, bold=False, center=False):
-        """Append text to output safely (called in main thread)"""
+        """Append text to output now, after anything still buffered (called in main thread)"""
+        self.queue_output(text, color, bold, center)
+        self.flush_log_output()
+
+    def flush_log_output(self):
+        """Write buffered log text to the panels in one go (called in main thread)"""
+        with self.log_lock:
+            summary, self.summary_pending = self.summary_pending, []
+            raw, self.raw_pending = self.raw_pending, []
+
+        if raw:
+            # A burst can be longer than the panel holds, only the tail would survive anyway
+            max_lines = self.raw_text.maximumBlockCount()
+            if max_lines:
+                raw = raw[-max_lines:]
+            self.raw_text.appendPlainText('\n'.join(raw))
+
+        if not summary:
+            return
+
         # Check if scrollbar is at the bottom before adding text
         scrollbar = self.summary_text.verticalScrollBar()
         at_bottom = scrollbar.value() == scrollbar.maximum()
-        
-        # Clear any text selection and move cursor to end
-        cursor = self.summary_text.textCursor()
-        cursor.clearSelection()
-        cursor.movePosition(QTextCursor.End)
-        self.summary_text.setTextCursor(cursor)
-        
-        # Format and insert new text
-        format = QTextCharFormat()
-        
-        if color:
-            format.setForeground(QColor(color))
-        if bold:
-            format.setFontWeight(QFont.Bold)
-        if center:
-            cursor.insertBlock()
-            blockFormat = QTextBlockFormat()
-            blockFormat.setAlignment(Qt.AlignCenter)
-            cursor.setBlockFormat(blockFormat)
-            
-        cursor.insertText(text, format)
-        cursor.setBlockFormat(QTextBlockFormat())  # Reset block format to default (left-aligned)
-        self.summary_text.setTextCursor(cursor)
-        
-        # Only scroll to bottom if we were already at the bottom
-        if at_bottom:
-            scrollbar.setValue(scrollbar.maximum())
 
-    def append_raw_output_safe(self, text):
-        """Append text to raw output safely (called in main thread)"""
-        # Check if scrollbar is at the bottom before adding text
-        scrollbar = self.raw_text.verticalScrollBar()
-        at_bottom = scrollbar.value() == scrollbar.maximum()
-        
-        # Add the text at the end
-        cursor = self.raw_text.textCursor()
-        cursor.clearSelection()
+        cursor = self.summary_cursor
         cursor.movePosition(QTextCursor.End)
-        self.raw_text.setTextCursor(cursor)
-        cursor.insertText(text + '\n')  # Add newline after each line
-        
+        for text, color, bold, center in summary:
+            # Format and insert new text
+            format = QTextCharFormat()
+            if color:
+                format.setForeground(QColor(color))
+            if bold:
+                format.setFontWeight(QFont.Bold)
+            if center:
+                cursor.insertBlock()
+                blockFormat = QTextBlockFormat()
+                blockFormat.setAlignment(Qt.AlignCenter)
+                cursor.setBlockFormat(blockFormat)
+
+            cursor.insertText(text, format)
+            cursor.setBlockFormat(QTextBlockFormat())  # Reset block format to default (left-aligned)
+
         # Only scroll to bottom if we were already at the bottom
         if at_bottom:
             scrollbar.setValue(scrollbar.maximum())
@@ -2099,15 +3002,12 @@ class HoudiniRenderGUI(QMainWindow):
         
         # Enable render button only if we have both paths, they're non-empty, and not loading
         self.render_btn.setEnabled(bool(hip_text) and bool(out_text) and not is_loading)
+        self.queue_add_btn.setEnabled(bool(hip_text) and bool(out_text) and not is_loading)
 
-    def send_push_notification(self, message, image_path=None):
-        """Send push notification with optional image"""
+    def send_push_notification(self, message, image_path=None, coalesce=False):
+        """Queue a push notification with optional image, it is sent in the background"""
         try:
-            import requests
-            
-            url = "https://api.pushover.net/1/messages.json"
-            files = {}
-            
+            attachment = None
             data = {
                 "token": self.api_key_input.text().strip(),
                 "user": self.user_key_input.text().strip(),
@@ -2116,26 +3016,67 @@ class HoudiniRenderGUI(QMainWindow):
             }
             
             if image_path and os.path.exists(image_path):
-                # Convert EXR to PNG if needed
-                if image_path.lower().endswith('.exr'):
-                    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                        buf = oiio.ImageBuf(image_path)
-                        display_buf = oiio.ImageBufAlgo.colorconvert(buf, "linear", "srgb")
-                        display_buf.write(tmp.name)
-                        image_path = tmp.name
-                
-                files = {
-                    "attachment": ("render.png", open(image_path, "rb"), "image/png")
-                }
-            
-            response = requests.post(url, data=data, files=files)
-            response.raise_for_status()
+                # The image is shrunk and encoded on the dispatcher thread, and only if still wanted
+                max_size = int(self.settings.get('notification_image_size', NOTIFY_IMAGE_SIZE))
+                attachment = functools.partial(notification_attachment, image_path, self.thumbnails, max_size)
             
-            print(f"Push notification sent successfully")
+            self.notifier.send(data, attachment, coalesce)
             
         except Exception as e:
             print(f"Error sending push notification: {e}")
 
+    def toggle_warm_worker(self, state=None):
+        """Shut down the warm worker when the option is turned off"""
+        if state is None:
+            state = self.warm_check.isChecked()
+        if not state and not self.cancel_btn.isVisible():
+            self.worker.stop()
+
+    def add_to_queue(self):
+        """Add the current hip, ROP and overrides as a queued job"""
+        hip = self.hip_input.currentText().strip()
+        out = self.out_input.currentText().strip()
+        userange = self.range_check.isChecked()
+        step = 1
+        try:
+            frames = self.requested_frames()
+            if userange:
+                sframe, eframe = int(self.start_frame.text()), int(self.end_frame.text())
+            elif out in self.node_settings:
+                settings = self.node_settings[out]
+                sframe, eframe, step = settings['f1'], settings['f2'], settings.get('f3', 1)
+            else:
+                sframe = eframe = 1
+        except ValueError as e:
+            self.append_output_safe(f'\n{e}\n', color='#ff7a7a')
+            return
+        total = len(range(sframe, eframe + 1, step))
+        if frames:
+            sframe, eframe, total = min(frames), max(frames), len(frames)
+        self.queue_dialog.add_job(hip, out, sframe, eframe, userange,
+                                  self.skip_check.isChecked(), total, frames, step)
+        self.append_output_safe(
+            f"\nQueued {out} from {os.path.basename(hip)} "
+            f"({len(self.queue_dialog.queue.pending())} waiting)\n",
+            color='#7abfff'
+        )
+
+    def show_queue(self):
+        self.queue_dialog.show()
+        self.queue_dialog.raise_()
+        self.queue_dialog.activateWindow()
+
+    def closeEvent(self, event):
+        """Make sure the warm worker and queued jobs don't outlive the window"""
+        self.queue_dialog.stop_all()
+        self.worker.stop()
+        self.preview_loader.stop()
+        self.flipbook_prefetcher.stop()
+        self.notifier.stop()
+        if self.metrics:
+            self.metrics.close()
+        super().closeEvent(event)
+
     def toggle_notification_inputs(self, state=None):
         """Enable/disable notification inputs"""
         if state is None:
@@ -2144,231 +3085,25 @@ class HoudiniRenderGUI(QMainWindow):
         self.api_key_input.setEnabled(state)
         self.user_key_input.setEnabled(state)
 
-def get_houdini_history_file():
-    """Get the path to the Houdini file.history"""
-    home = str(Path.home())
-    print(f"Looking for Houdini directories in: {home}")
-    
-    # Look for any houdini version directory (e.g. houdini19.5, houdini20.0, etc)
-    houdini_dirs = [d for d in os.listdir(home) 
-                   if d.startswith('houdini') and 
-                   os.path.isdir(os.path.join(home, d)) and
-                   not d.endswith('.py')]
-    
-    print(f"Found Houdini directories: {houdini_dirs}")
-    
-    if not houdini_dirs:
-        print("No Houdini directories found")
-        return None
-        
-    # Use the latest version if multiple exist
-    latest_dir = sorted(houdini_dirs)[-1]
-    history_file = os.path.join(home, latest_dir, 'file.history')
-    print(f"Checking history file: {history_file}")
-    
-    if os.path.exists(history_file):
-        print(f"History file exists")
-        return history_file
-    else:
-        print(f"History file does not exist")
-        return None
-
-def parse_hip_files(history_file):
-    """Parse the file.history and extract HIP files"""
-    if not history_file:
-        print("No history file provided")
-        return []
-    
-    try:
-        print(f"Reading history file: {history_file}")
-        with open(history_file, 'r') as f:
-            content = ''.join(f.read().splitlines())
-        
-        if not content.startswith('HIP{'):
-            print("File doesn't start with HIP{")
-            return []
-            
-        end = content.find('}', 4)
-        if end == -1:
-            print("No closing } found")
-            return []
-            
-        hip_section = content[4:end]
-        print(f"Found HIP section length: {len(hip_section)}")
-            
-        paths = []
-        current_path = ""
-        
-        for part in hip_section.split('/'):
-            if not part:
-                continue
-                
-            if not current_path:
-                current_path = '/' + part
-            else:
-                current_path += '/' + part
-                
-            if current_path.endswith('.hip'):
-                paths.append(current_path)
-                current_path = ""
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        hip_files = []
-        for path in paths:
-            if path not in seen:
-                seen.add(path)
-                hip_files.append(path)
-            
-        # Reverse the list so newest files appear first
-        hip_files.reverse()
-        
-        print(f"\nFinal list of {len(hip_files)} unique HIP files (newest first):")
-        for hip_file in hip_files[:5]:
-            print(f"  {hip_file}")
-            
-        return hip_files
-        
-    except Exception as e:
-        print(f"Error reading history file: {e}")
-        traceback.print_exc()
-        return []
-
-def refresh_hip_files():
-    """Refresh the list of recent HIP files"""
-    history_file = get_houdini_history_file()
-    return parse_hip_files(history_file)
-
-def parse_out_nodes(hip_file):
-    """Parse the hip file and extract available ROP nodes and their settings"""
-    try:
-        import hou
-        # Load the hip file
-        hou.hipFile.load(hip_file)
-        
-        # Find all ROP nodes
-        out_nodes = []
-        node_settings = {}  # Store settings for each node
-        out_context = hou.node("/out")
-        if out_context:
-            for node in out_context.children():
-                # Check if it's a ROP node (render node)
-                if node.type().name() in ["rop_geometry", "Redshift_ROP", "opengl"]:
-                    node_path = node.path()
-                    out_nodes.append(node_path)
-                    
-                    # Get frame range and skip settings - convert frames to integers
-                    settings = {
-                        'f1': int(node.parm('f1').eval()) if node.parm('f1') else 1,
-                        'f2': int(node.parm('f2').eval()) if node.parm('f2') else 1,
-                        'skip_rendered': node.parm('RS_outputSkipRendered').eval() if node.parm('RS_outputSkipRendered') else 0
-                    }
-                    node_settings[node_path] = settings
-        
-        return out_nodes, node_settings
-        
-    except ImportError:
-        print("Could not import hou module - using hython")
-        # Try using hython as fallback
-        try:
-            import subprocess
-            script = """
-import hou
-import sys
-import os
-import json
-
-# Completely suppress stdout/stderr
-class NullIO:
-    def write(self, *args): pass
-    def flush(self): pass
-
-# Save original stdout/stderr
-old_stdout = sys.stdout
-old_stderr = sys.stderr
-
-try:
-    # Redirect all output to null
-    sys.stdout = NullIO()
-    sys.stderr = NullIO()
-    
-    # Set environment variables to suppress Redshift output
-    os.environ['RS_VERBOSITY_LEVEL'] = '0'
-    
-    # Load the hip file silently
-    hou.hipFile.load(r"{0}", suppress_save_prompt=True)
-    
-    # Restore stdout just to print node paths and settings
-    sys.stdout = old_stdout
-    
-    # Get out nodes and their settings
-    out_context = hou.node("/out")
-    node_settings = {{}}
-    
-    if out_context:
-        for node in out_context.children():
-            if node.type().name() in ["rop_geometry", "Redshift_ROP", "opengl"]:
-                node_path = node.path()
-                print("NODE:{{}}".format(node_path))
-                
-                # Get frame range and skip settings - convert frames to integers
-                settings = {{
-                    'f1': int(node.parm('f1').eval()) if node.parm('f1') else 1,
-                    'f2': int(node.parm('f2').eval()) if node.parm('f2') else 1,
-                    'skip_rendered': node.parm('RS_outputSkipRendered').eval() if node.parm('RS_outputSkipRendered') else 0
-                }}
-                print("SETTINGS:{{}}".format(json.dumps(settings)))
-
-finally:
-    # Restore original stdout/stderr
-    sys.stdout = old_stdout
-    sys.stderr = old_stderr
-""".format(hip_file)
-
-            # Run hython with environment variables to suppress output
-            env = os.environ.copy()
-            env['HOU_VERBOSITY'] = '0'
-            env['RS_VERBOSITY_LEVEL'] = '0'
-            
-            result = subprocess.run(
-                ['hython', '-c', script], 
-                capture_output=True, 
-                text=True,
-                env=env,
-                encoding='utf-8'
-            )
-            
-            # Parse the output to get nodes and settings
-            nodes = []
-            node_settings = {}
-            
-            current_node = None
-            for line in result.stdout.splitlines():
-                if line.startswith('NODE:'):
-                    current_node = line[5:].strip()
-                    nodes.append(current_node)
-                elif line.startswith('SETTINGS:'):
-                    if current_node:
-                        settings = json.loads(line[9:])
-                        node_settings[current_node] = settings
-            
-            if nodes:
-                print(f"\nFound {len(nodes)} out nodes with settings:")
-                for node in nodes:
-                    print(f"  {node}: {node_settings[node]}")
-            else:
-                print("\nNo out nodes found")
-                if result.stderr:
-                    print("Error:", result.stderr.split('\n')[0])
-                
-            return nodes, node_settings
-            
-        except Exception as e:
-            print(f"Error running hython: {e}")
-            return [], {}
-
 if __name__ == "__main__":
+    # The stylesheet and generated icons are relative to the script folder
+    os.chdir(dir_path)
+    if os.path.exists('houdini_cli_temp.py'):
+        os.remove('houdini_cli_temp.py')
+
     app = QApplication(sys.argv)
     window = HoudiniRenderGUI()
+    # --startup-benchmark prints the startup timings as JSON and exits,
+    # non-zero when over budget (QT_QPA_PLATFORM=offscreen works headless)
+    window.startup_benchmark = '--startup-benchmark' in sys.argv
     window.show()
+
+    # --replay FILE [--replay-speed N] plays a recording made with 'render --record'
+    # or the 'record_dir' setting back through the GUI
+    if '--replay' in sys.argv[:-1]:
+        replay_path = sys.argv[sys.argv.index('--replay') + 1]
+        replay_speed = 1.0
+        if '--replay-speed' in sys.argv[:-1]:
+            replay_speed = float(sys.argv[sys.argv.index('--replay-speed') + 1])
+        QTimer.singleShot(0, lambda: window.start_replay(replay_path, replay_speed))
     sys.exit(app.exec_())
@@ -0,0 +1,262 @@
+#!/usr/bin/python3
+"""Throughput benchmarks for the render output, UI update and preview paths.
+
+    python3 hardeen_bench.py [--frames N] [--recording FILE ...] [--only reader,parser,ui,preview]
+                             [--save results.jsonl]
+    python3 hardeen_bench.py --compare results.jsonl
+
+reader and parser run anywhere. ui needs PySide2 (it uses the offscreen
+platform) and preview needs PySide2 and OpenImageIO, they are skipped when
+those are missing. Saved results are JSON lines tagged with the git commit,
+--compare prints them side by side per benchmark and input.
+"""
+
+import argparse
+import datetime
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from hardeen_core import RenderOutputReader, RenderProgress, ReplayReader
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+
+def synthetic_render(frames=200, lines_per_frame=200, workers=1):
+    """Build (worker, source, value) items that look like a Redshift render"""
+    items = []
+    now = time.time()
+    for frame in range(1, frames + 1):
+        worker = (frame - 1) % workers
+        output = f"/renders/shot/beauty.{frame:04d}.exr"
+        items.append((worker, 'event', {'event': 'frame_start', 'rop': '/out/rs', 'frame': frame, 'time': now}))
+        items.append((worker, 'log', f"Rendering frame {frame}"))
+        for block in range(lines_per_frame):
+            items.append((worker, 'log', f"Block {block}/{lines_per_frame} (3,{block % 7}) rendered by GPU 0 in 45ms"))
+        items.append((worker, 'log', "scene extraction time 0.42 total time 12.37 sec"))
+        now += 12.4
+        items.append((worker, 'event', {'event': 'frame_end', 'rop': '/out/rs', 'frame': frame,
+                                        'output': output, 'time': now}))
+        items.append((worker, 'log', f"hardeen_outputfile: {output}"))
+    return items
+
+def load_recording(path):
+    """Read every item of a recording up front, so decoding it isn't measured"""
+    reader = ReplayReader(path, speed=0)
+    return list(reader), reader.header['workers']
+
+def best_of(repeat, func):
+    """Run func repeat times and return the fastest wall time in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def bench_parser(items, workers, repeat=3):
+    """Items per second through RenderProgress, structured and log-only"""
+    frames = sum(1 for _, source, value in items if source == 'event' and value.get('event') == 'frame_end')
+    log_items = [item for item in items if item[1] == 'log']
+
+    def structured():
+        progress = RenderProgress(frames, workers, 1, structured=True)
+        for worker, source, value in items:
+            if source == 'event':
+                progress.feed_event(value, worker)
+            else:
+                progress.feed(value, worker)
+
+    def legacy():
+        progress = RenderProgress(frames, workers, 1)
+        for worker, _, value in log_items:
+            progress.feed(value, worker)
+
+    structured_s = best_of(repeat, structured)
+    legacy_s = best_of(repeat, legacy)
+    return {
+        'items': len(items),
+        'structured_items_per_s': round(len(items) / structured_s),
+        'log_lines_per_s': round(len(log_items) / legacy_s),
+    }
+
+def bench_reader(items, repeat=3):
+    """Log lines per second from a pipe through RenderOutputReader"""
+    lines = [value for _, source, value in items if source == 'log']
+    with tempfile.NamedTemporaryFile('w', suffix='.log', delete=False) as f:
+        f.write('\n'.join(lines) + '\n')
+        log_path = f.name
+
+    def read():
+        process = subprocess.Popen(['cat', log_path], stdout=subprocess.PIPE)
+        count = sum(1 for _ in RenderOutputReader([process]))
+        process.wait()
+        process.stdout.close()
+        assert count == len(lines), f"read {count} of {len(lines)} lines"
+
+    try:
+        seconds = best_of(repeat, read)
+    finally:
+        os.remove(log_path)
+    return {'lines': len(lines), 'lines_per_s': round(len(lines) / seconds)}
+
+def _gui_window():
+    """Create the main window offscreen, None when PySide2 is missing"""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    try:
+        from PySide2.QtWidgets import QApplication
+    except ImportError:
+        return None, None
+    import hardeen
+    app = QApplication.instance() or QApplication([])
+    return app, hardeen.HoudiniRenderGUI()
+
+def bench_ui(items, flush_every=500):
+    """Lines per second into the raw and summary log panels"""
+    app, window = _gui_window()
+    if window is None:
+        return {'skipped': 'PySide2 is not installed'}
+
+    lines = [value for _, source, value in items if source == 'log']
+
+    # Raw panel: buffered lines, flushed in batches like the 50 ms timer does
+    start = time.perf_counter()
+    for count, line in enumerate(lines, 1):
+        window.queue_raw_output(line)
+        if count % flush_every == 0:
+            window.flush_log_output()
+            app.processEvents()
+    window.flush_log_output()
+    app.processEvents()
+    raw_s = time.perf_counter() - start
+
+    # Summary panel: one formatted append per frame line, as the monitor produces them
+    summary = [line + '\n' for line in lines[:5000]]
+    start = time.perf_counter()
+    for line in summary:
+        window.append_output_safe(line, color='#c0c0c0')
+    app.processEvents()
+    summary_s = time.perf_counter() - start
+
+    window.close()
+    return {
+        'raw_lines_per_s': round(len(lines) / raw_s),
+        'summary_appends_per_s': round(len(summary) / summary_s),
+    }
+
+def _write_exr(path, aovs, width, height):
+    """Write a multi-part EXR with aovs RGBA parts of noise"""
+    import numpy as np
+    import OpenImageIO as oiio
+    specs = []
+    for i in range(aovs):
+        spec = oiio.ImageSpec(width, height, 4, oiio.HALF)
+        spec.channelnames = (f"aov{i}.R", f"aov{i}.G", f"aov{i}.B", f"aov{i}.A")
+        spec.attribute('name', f"aov{i}")
+        specs.append(spec)
+    pixels = np.random.default_rng(0).random((height, width, 4), dtype=np.float32)
+    out = oiio.ImageOutput.create(path)
+    out.open(path, specs)
+    for i in range(aovs):
+        if i:
+            out.open(path, specs[i], 'AppendSubimage')
+        out.write_image(pixels)
+    out.close()
+
+def bench_preview(aov_counts=(1, 4, 16), width=1920, height=1080, repeat=3):
+    """Milliseconds to decode the previews of one frame, by AOV count"""
+    _, window = _gui_window()
+    if window is None:
+        return {'skipped': 'PySide2 is not installed'}
+    if importlib.util.find_spec('OpenImageIO') is None:
+        return {'skipped': 'OpenImageIO is not installed'}
+    import hardeen
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for aovs in aov_counts:
+            path = os.path.join(tmp, f"bench_{aovs}.exr")
+            _write_exr(path, aovs, width, height)
+            seconds = best_of(repeat, lambda: hardeen.decode_exr_previews(path, aovs, lambda: False))
+            results[f"{aovs}_aovs_ms"] = round(seconds * 1000, 1)
+            results[f"{aovs}_aovs_ms_per_aov"] = round(seconds * 1000 / aovs, 1)
+    window.close()
+    return {'resolution': f"{width}x{height}", **results}
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=dir_path,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(args):
+    inputs = [('synthetic', synthetic_render(args.frames), 1)]
+    for path in args.recording:
+        items, workers = load_recording(path)
+        inputs.append((os.path.basename(path), items, workers))
+
+    commit = git_commit()
+    stamp = datetime.datetime.now().isoformat(timespec='seconds')
+    results = []
+    for name, items, workers in inputs:
+        if 'reader' in args.only:
+            results.append(('reader', name, bench_reader(items)))
+        if 'parser' in args.only:
+            results.append(('parser', name, bench_parser(items, workers)))
+        if 'ui' in args.only:
+            results.append(('ui', name, bench_ui(items)))
+    if 'preview' in args.only:
+        results.append(('preview', 'synthetic', bench_preview()))
+
+    lines = [json.dumps({'benchmark': benchmark, 'input': name, 'commit': commit, 'time': stamp,
+                         'metrics': metrics})
+             for benchmark, name, metrics in results]
+    print('\n'.join(lines))
+    if args.save:
+        with open(args.save, 'a') as f:
+            f.write('\n'.join(lines) + '\n')
+    return 0
+
+def compare(path, last=5):
+    """Print the most recent results of each benchmark and input side by side"""
+    groups = {}
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                result = json.loads(line)
+                groups.setdefault((result['benchmark'], result['input']), []).append(result)
+
+    for (benchmark, name), results in sorted(groups.items()):
+        results = results[-last:]
+        print(f"\n{benchmark} / {name}")
+        print(f"  {'metric':<28}" + ''.join(f"{result['commit'] or '?':>12}" for result in results))
+        metrics = []
+        for result in results:
+            metrics += [key for key in result['metrics'] if key not in metrics]
+        for key in metrics:
+            values = ''.join(f"{str(result['metrics'].get(key, '-')):>12}" for result in results)
+            print(f"  {key:<28}{values}")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='hardeen_bench', description='Hardeen throughput benchmarks')
+    parser.add_argument('--frames', type=int, default=200, help='frames in the synthetic render')
+    parser.add_argument('--recording', action='append', default=[], metavar='FILE',
+                        help='also run on a recording made with render --record')
+    parser.add_argument('--only', default='reader,parser,ui,preview',
+                        type=lambda text: text.split(','), help='comma separated benchmarks to run')
+    parser.add_argument('--save', metavar='FILE', help='append the results to a JSON lines file')
+    parser.add_argument('--compare', metavar='FILE', help='print saved results side by side and exit')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return compare(args.compare)
+    return run(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,474 @@
+#!/usr/bin/python3
+"""Headless Hardeen, for driving renders from a terminal, cron or ssh.
+
+    hardeen.py render --hip /path/shot.hip --rop /out/Redshift_ROP1 --range 1-100
+
+Only hardeen_core is imported here, so Qt and the imaging libraries are
+never loaded.
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import signal
+import sqlite3
+import sys
+
+from hardeen_core import (
+    RENDER_ORDERS,
+    RenderOutputReader,
+    RenderProgress,
+    RenderJournal,
+    RenderRecorder,
+    RenderSupervisor,
+    ReplayReader,
+    RopScanCache,
+    build_render_command,
+    close_render,
+    create_temp_python_file,
+    format_time,
+    frames_to_render,
+    launch_render,
+    order_frames,
+    parse_frame_list,
+    parse_out_nodes,
+    remove_temp_python_file,
+    split_frame_range,
+    split_frames,
+)
+from hardeen_metrics import FrameMetricsCollector, MetricsStore
+
+def parse_range(text):
+    """Parse 'START-END' (or a single frame) into an inclusive (start, end)"""
+    parts = text.replace(':', '-').split('-')
+    if len(parts) == 1:
+        return int(parts[0]), int(parts[0])
+    if len(parts) == 2:
+        start, end = int(parts[0]), int(parts[1])
+        if end < start:
+            raise argparse.ArgumentTypeError(f"range end {end} is before start {start}")
+        return start, end
+    raise argparse.ArgumentTypeError(f"invalid frame range: {text}")
+
+def parse_frames(text):
+    """Parse a frame list like '1-100x5,120,200-210' for argparse"""
+    try:
+        return parse_frame_list(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def parse_date(text):
+    """Parse an ISO date or date and time, e.g. 2024-05-01 or 2024-05-01T18:00"""
+    try:
+        return datetime.datetime.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date: {text}")
+
+class Reporter:
+    """Prints render events as readable text or as JSON lines"""
+
+    def __init__(self, as_json=False, verbose=False, stream=None):
+        self.as_json = as_json
+        self.verbose = verbose
+        self.stream = stream or sys.stdout
+        self.done = 0
+        self.total = 0
+
+    def _write_json(self, event, **fields):
+        fields = {'event': event, 'time': datetime.datetime.now().isoformat(timespec='seconds'), **fields}
+        self.stream.write(json.dumps(fields) + '\n')
+        self.stream.flush()
+
+    def _write_text(self, text):
+        self.stream.write(text)
+        self.stream.flush()
+
+    def started(self, commands, total_frames):
+        self.total = total_frames
+        if self.as_json:
+            self._write_json('start', commands=commands, total=total_frames)
+        else:
+            for cmd in commands:
+                self._write_text(' '.join(cmd) + '\n')
+            self._write_text(f'Rendering {total_frames} frames in {len(commands)} process(es)\n')
+
+    def log(self, worker, line):
+        if not self.verbose:
+            return
+        if self.as_json:
+            self._write_json('log', worker=worker, line=line)
+        else:
+            self._write_text(f'[{worker + 1}] {line}\n')
+
+    def event(self, kind, value):
+        if kind == 'progress':
+            self.done, self.total = value
+        elif kind == 'total':
+            self.total = value
+
+        if self.as_json:
+            if kind == 'output':
+                self._write_json(kind, text=value.strip())
+            elif kind == 'image':
+                self._write_json(kind, path=value)
+            elif kind == 'progress':
+                self._write_json(kind, done=value[0], total=value[1])
+            elif kind == 'total':
+                self._write_json(kind, total=value)
+            elif kind in ('frame', 'frame_done'):
+                self._write_json(kind, frame=value)
+            elif kind == 'times':
+                elapsed, average, est_total, remaining, eta, show_eta = value
+                self._write_json(kind, elapsed=elapsed, average=average, est_total=est_total,
+                                 remaining=remaining,
+                                 eta=eta.isoformat(timespec='seconds') if show_eta else None)
+        elif kind == 'output':
+            self._write_text(value)
+        elif kind == 'times':
+            elapsed, average, est_total, remaining, eta, show_eta = value
+            eta_text = eta.strftime('%I:%M:%S %p') if show_eta else '--:--:--'
+            self._write_text(
+                f"[{self.done}/{self.total}] Elapsed {format_time(elapsed)}  "
+                f"Average {format_time(average)}  Est. Total {format_time(est_total)}  "
+                f"Remaining {format_time(remaining)}  ETA {eta_text}\n"
+            )
+
+    def crashed(self, returncodes, remaining, delay, attempt, retries):
+        if self.as_json:
+            self._write_json('crash', returncodes=returncodes, remaining=remaining,
+                             retry_in=delay, attempt=attempt, retries=retries)
+        elif delay is None:
+            self._write_text(f'Render crashed (exit codes {returncodes}) with {remaining} frames left,'
+                             f' giving up after {retries} retries\n')
+        else:
+            self._write_text(f'Render crashed (exit codes {returncodes}) with {remaining} frames left,'
+                             f' relaunching in {format_time(delay)} (retry {attempt} of {retries})\n')
+
+    def finished(self, returncodes, progress, canceled, crashes=0):
+        # Replays run on the recorded clock, so prefer the render's own elapsed time
+        elapsed = progress.elapsed_time or (datetime.datetime.now() - progress.start_time).total_seconds()
+        if self.as_json:
+            self._write_json('finished', returncodes=returncodes, canceled=canceled,
+                             done=self.done, total=self.total, elapsed=elapsed,
+                             average=progress.average, crashes=crashes)
+        else:
+            status = 'Canceled' if canceled else 'Finished'
+            crashed = f', {crashes} crash(es)' if crashes else ''
+            self._write_text(f'{status}: {self.done}/{self.total} frames in {format_time(elapsed)}'
+                             f' (exit codes {returncodes}{crashed})\n')
+
+def report_render(reader, progress, reporter, collectors=()):
+    """Feed everything the reader yields through progress into the reporter
+
+    collectors (the metrics collector, the journal) see every item too.
+    """
+    for worker, source, value in reader:
+        for collector in collectors:
+            collector.feed(worker, source, value)
+        if source == 'event':
+            events = progress.feed_event(value, worker)
+        else:
+            reporter.log(worker, value)
+            events = progress.feed(value, worker)
+        for kind, event_value in events:
+            reporter.event(kind, event_value)
+
+def scan_rop(hip, rop, cache):
+    """The settings of rop from the ROP scan, scanning the hip with hython if the cache is missing or stale"""
+    cached = cache.lookup(hip)
+    if cached and cached[2]:
+        return cached[1].get(rop)
+    print(f"Scanning the ROPs of {os.path.basename(hip)}", file=sys.stderr)
+    try:
+        size, mtime = RopScanCache._file_key(hip)
+    except OSError:
+        return None
+    # The scan talks on stdout, which is for progress and --json here
+    with contextlib.redirect_stdout(sys.stderr):
+        out_nodes, node_settings = parse_out_nodes(hip)
+    if out_nodes:
+        cache.store(hip, size, mtime, out_nodes, node_settings)
+    return node_settings.get(rop)
+
+def run_render(args):
+    """Render one ROP headlessly and report progress until it finishes"""
+    hip = os.path.abspath(args.hip)
+    if not os.path.isfile(hip):
+        print(f"Hip file not found: {hip}", file=sys.stderr)
+        return 2
+
+    userange = args.frame_range is not None or args.frames is not None
+    known_range = userange
+    rop_step = 1  # The ROP's own step, only used with its own range
+
+    # --skip needs the ROP's output path, so a missing or stale scan is redone
+    rop_cache = RopScanCache()
+    if args.skip:
+        rop_settings = scan_rop(hip, args.rop, rop_cache)
+    else:
+        cached = rop_cache.lookup(hip)
+        rop_settings = cached[1].get(args.rop) if cached else None
+
+    if args.frames:
+        start, end = min(args.frames), max(args.frames)
+    elif userange:
+        start, end = args.frame_range
+    else:
+        # Use the ROP range from the scan when we have one
+        start = end = 1
+        if rop_settings:
+            start, end, rop_step = rop_settings['f1'], rop_settings['f2'], rop_settings.get('f3', 1)
+            known_range = True
+    total_frames = len(range(start, end + 1, rop_step))
+
+    # A frame list, a step or a render order all go to hython as a frame list
+    if args.step < 1:
+        print("--step must be at least 1", file=sys.stderr)
+        return 2
+    frames = args.frames
+    if frames is None and (args.step != 1 or args.order != 'sequential'):
+        if not known_range:
+            print("--step and --order need --range or a scanned ROP range", file=sys.stderr)
+            return 2
+        frames = list(range(start, end + 1, args.step * rop_step))
+
+    # The journal records finished frames, a crashed render is relaunched on the rest
+    journal = supervisor = None
+    if known_range:
+        job_frames = frames or list(range(start, end + 1, rop_step))
+        try:
+            journal = RenderJournal(hip, args.rop, job_frames).open(resume=args.resume)
+        except OSError as e:
+            print(f"Error opening render journal: {e}", file=sys.stderr)
+        if journal:
+            if journal.done:
+                frames = journal.remaining()
+                print(f"Resuming with {len(frames)} of {len(job_frames)} frames left", file=sys.stderr)
+                if not frames:
+                    journal.close()
+                    return 0
+
+    # With --skip only the frames without output are sent to hython
+    if args.skip and known_range:
+        wanted = frames or list(range(start, end + 1, rop_step))
+        missing = frames_to_render(hip, args.rop, wanted, rop_cache)
+        if missing is None:
+            print(f"No output path known for {args.rop}, finished frames are only skipped by hython itself",
+                  file=sys.stderr)
+        if missing == []:
+            print(f"All {len(wanted)} frames are already rendered", file=sys.stderr)
+            if journal:
+                journal.close(finished=True)
+            return 0
+        if missing is not None and len(missing) < len(wanted):
+            print(f"Rendering the {len(missing)} of {len(wanted)} frames not rendered yet", file=sys.stderr)
+            frames = missing
+            # Frames that are already on disk are as good as finished for a resume
+            if journal:
+                skipped = set(wanted) - set(missing)
+                for frame in wanted:
+                    if frame in skipped:
+                        journal.record(frame)
+    if journal:
+        supervisor = RenderSupervisor(journal, retries=args.retries)
+
+    if frames:
+        frames = order_frames(frames, args.order)
+        total_frames = len(frames)
+        # Interleaving keeps each process in render order from coarse to fine
+        frame_lists = split_frames(frames, args.processes if userange else 1,
+                                   interleaved=args.interleaved or args.order != 'sequential')
+        chunks = [(start, end, rop_step)] * len(frame_lists)
+        range_start = None
+    else:
+        chunks = [(start, end, rop_step)]
+        if userange:
+            chunks = split_frame_range(start, end, args.processes, interleaved=args.interleaved)
+        frame_lists = [None] * len(chunks)
+        range_start = start if userange else None
+
+    script = create_temp_python_file()
+    commands = [build_render_command(script, hip, args.rop, chunk_start, chunk_end, userange, args.skip, step, frames)
+                for (chunk_start, chunk_end, step), frames in zip(chunks, frame_lists)]
+    processes = [launch_render(cmd) for cmd in commands]
+    workers = len(processes)
+
+    canceling = []
+    recorder = None
+    if args.record:
+        recorder = RenderRecorder(args.record, total_frames, workers, range_start,
+                                  hip=hip, rop=args.rop)
+    # The recording goes on through relaunches and is closed after the last one
+    reader = RenderOutputReader(processes, recorder, close_recorder=False)
+
+    # Earlier renders of the same shot give the ETA before the first frame is done
+    collector = None
+    history = None
+    if not args.no_metrics:
+        try:
+            collector = FrameMetricsCollector(MetricsStore(), hip)
+            history = collector.store.history(hip, args.rop, *((start, end) if known_range else (None, None)))
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error opening metrics database: {e}", file=sys.stderr)
+
+    def on_interrupt(signum, frame):
+        # First Ctrl-C terminates the renders, a second one kills them
+        sig = signal.SIGKILL if canceling else signal.SIGTERM
+        canceling.append(signum)
+        for process in processes:
+            try:
+                os.killpg(os.getpgid(process.pid), sig)
+            except ProcessLookupError:
+                pass
+        reader.stop()
+        if supervisor:
+            supervisor.stop()
+
+    signal.signal(signal.SIGINT, on_interrupt)
+    signal.signal(signal.SIGTERM, on_interrupt)
+
+    reporter = Reporter(as_json=args.json, verbose=args.verbose)
+    progress = RenderProgress(total_frames, workers, range_start,
+                              structured=True, history=history)
+    reporter.started(commands, total_frames)
+    collectors = [c for c in (collector, journal) if c]
+
+    while True:
+        report_render(reader, progress, reporter, collectors)
+
+        returncodes = [process.wait() for process in processes]
+        for process in processes:
+            close_render(process)
+        if not supervisor or not supervisor.crashed(returncodes, bool(canceling)):
+            break
+
+        # Relaunch on the frames the journal doesn't have, after a growing pause
+        delay = supervisor.next_delay()
+        remaining = order_frames(journal.remaining(), args.order)
+        reporter.crashed(returncodes, len(remaining), delay, supervisor.attempts, supervisor.retries)
+        if delay is None or not supervisor.wait(delay):
+            break
+        frame_lists = split_frames(remaining, workers, interleaved=args.interleaved or args.order != 'sequential')
+        commands = [build_render_command(script, hip, args.rop, min(frames), max(frames), True, args.skip,
+                                         args.step * rop_step, frames)
+                    for frames in frame_lists]
+        processes[:] = [launch_render(cmd) for cmd in commands]
+        reader = RenderOutputReader(processes, recorder, close_recorder=False)
+        reporter.started(commands, total_frames)
+
+    remove_temp_python_file(script)
+    if recorder:
+        recorder.close()
+    if collector:
+        collector.store.close()
+    if journal:
+        journal.close(finished=not canceling and not any(returncodes))
+    crashes = len(supervisor.crashes) if supervisor else 0
+    reporter.finished(returncodes, progress, bool(canceling), crashes)
+    if canceling:
+        return 130
+    return next((code for code in returncodes if code), 0)
+
+def run_replay(args):
+    """Play a recorded render back through the progress parser and reporter"""
+    try:
+        reader = ReplayReader(args.recording, speed=args.speed)
+    except (OSError, ValueError) as e:
+        print(f"Cannot replay {args.recording}: {e}", file=sys.stderr)
+        return 2
+
+    header = reader.header
+    signal.signal(signal.SIGINT, lambda signum, frame: reader.stop())
+
+    reporter = Reporter(as_json=args.json, verbose=args.verbose)
+    progress = RenderProgress(header['total_frames'], header['workers'], header['range_start'],
+                              structured=True,
+                              start_time=datetime.datetime.fromtimestamp(header['started']))
+    reporter.started([['replay', args.recording]], header['total_frames'])
+    report_render(reader, progress, reporter)
+    reporter.finished([], progress, reader.stopped.is_set())
+    return 130 if reader.stopped.is_set() else 0
+
+def run_metrics(args):
+    """Export recorded frame metrics as CSV"""
+    if args.db and not os.path.isfile(args.db):
+        print(f"Metrics database not found: {args.db}", file=sys.stderr)
+        return 2
+    try:
+        store = MetricsStore(args.db)
+        filters = {
+            'hip': os.path.abspath(args.hip) if args.hip else None,
+            'rop': args.rop,
+            'host': args.host,
+            'since': args.since.timestamp() if args.since else None,
+        }
+        count = store.export_csv(args.csv if args.csv != '-' else sys.stdout, **filters)
+        store.close()
+    except (OSError, sqlite3.Error) as e:
+        print(f"Cannot export metrics: {e}", file=sys.stderr)
+        return 1
+    if args.csv != '-':
+        print(f"Wrote {count} frames to {args.csv}")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='hardeen', description='Hardeen headless render submitter')
+    subparsers = parser.add_subparsers(dest='command')
+
+    render = subparsers.add_parser('render', help='render a ROP without starting the GUI')
+    render.add_argument('--hip', required=True, help='path to .hip file')
+    render.add_argument('--rop', required=True, help='path to out node, e.g. /out/Redshift_ROP1')
+    frames = render.add_mutually_exclusive_group()
+    frames.add_argument('--range', dest='frame_range', type=parse_range, metavar='START-END',
+                        help='frame range override, defaults to the range set on the ROP')
+    frames.add_argument('--frames', type=parse_frames, metavar='LIST',
+                        help='render these frames instead, e.g. 1-100x5,120,200-210')
+    render.add_argument('--step', type=int, default=1, metavar='N', help='render every Nth frame of the range')
+    render.add_argument('--order', choices=RENDER_ORDERS, default='sequential',
+                        help='render order, coarse renders first, last and then fills in between')
+    render.add_argument('--skip', action='store_true', help='skip frames that are already rendered')
+    render.add_argument('--processes', type=int, default=1, metavar='N',
+                        help='split the range across N hython processes')
+    render.add_argument('--interleaved', action='store_true',
+                        help='give each process every Nth frame instead of a contiguous block')
+    render.add_argument('--json', action='store_true', help='print progress as JSON lines')
+    render.add_argument('-v', '--verbose', action='store_true', help='also print the raw render log')
+    render.add_argument('--record', metavar='FILE',
+                        help='save the render output with timings, for hardeen replay')
+    render.add_argument('--retries', type=int, default=RenderSupervisor.RETRIES, metavar='N',
+                        help='relaunch a crashed render on its remaining frames up to N times')
+    render.add_argument('--resume', action='store_true',
+                        help='continue an earlier run of the same job that was stopped or crashed')
+    render.add_argument('--no-metrics', action='store_true',
+                        help="don't add the rendered frames to the metrics database")
+
+    replay = subparsers.add_parser('replay', help='play a recorded render back without Houdini')
+    replay.add_argument('recording', help='file written by render --record')
+    replay.add_argument('--speed', type=float, default=1.0,
+                        help='playback speed, e.g. 10 for ten times faster, 0 for as fast as possible')
+    replay.add_argument('--json', action='store_true', help='print progress as JSON lines')
+    replay.add_argument('-v', '--verbose', action='store_true', help='also print the raw render log')
+
+    metrics = subparsers.add_parser('metrics', help='export the per-frame metrics database as CSV')
+    metrics.add_argument('--csv', default='-', metavar='FILE', help='output file, defaults to stdout')
+    metrics.add_argument('--hip', help='only frames of this .hip file')
+    metrics.add_argument('--rop', help='only frames of this out node')
+    metrics.add_argument('--host', help='only frames rendered on this host')
+    metrics.add_argument('--since', type=parse_date, metavar='DATE',
+                         help='only frames finished after DATE, e.g. 2024-05-01')
+    metrics.add_argument('--db', metavar='FILE', help='metrics database, defaults to the one in the config folder')
+
+    args = parser.parse_args(argv)
+    if args.command == 'render':
+        return run_render(args)
+    if args.command == 'replay':
+        return run_replay(args)
+    if args.command == 'metrics':
+        return run_metrics(args)
+    parser.print_help()
+    return 2
+
+if __name__ == '__main__':
+    sys.exit(main())
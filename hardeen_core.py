@@ -0,0 +1,1794 @@
+#!/usr/bin/python3
+"""Render plumbing shared by the Hardeen GUI and the headless CLI.
+
+Nothing in here may import Qt or the imaging libraries, so it stays cheap
+to load over ssh or from cron.
+"""
+
+import collections
+import datetime
+import hashlib
+import json
+import os
+import re
+import selectors
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+from pathlib import Path
+
+from hardeen_eta import BestEstimator, HistoryEstimator
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+
+def create_temp_python_file():
+    """Create a render script for Houdini and return its path
+
+    Every render gets its own file, the GUI, queued jobs and the command
+    line may be writing one at the same time. Remove it with
+    remove_temp_python_file() once its hython processes have exited.
+    """
+    fd, temp_file = tempfile.mkstemp(prefix='hardeen_temp_', suffix='.py', dir=dir_path)
+    with os.fdopen(fd, 'w') as f:
+        f.write('''#!/usr/bin/env python3
+
+import json
+import os
+import re
+import stat
+import time
+from optparse import OptionParser
+
+# Structured events go to the file descriptor given with --eventfd
+EVENTS = None
+OUTPUT_PARMS = ("RS_outputFileNamePrefix", "picture", "sopoutput", "vm_picture")
+
+def emitEvent(event, **fields):
+    """Write one timestamped JSON event, tagged on stdout if there is no event fd"""
+    fields["event"] = event
+    fields["time"] = time.time()
+    line = json.dumps(fields)
+    if EVENTS is not None:
+        EVENTS.write(line + "\\n")
+        EVENTS.flush()
+    else:
+        print("hardeen_event: " + line, flush=True)
+
+def outputFile(node, frame):
+    for name in OUTPUT_PARMS:
+        parm = node.parm(name)
+        if parm is not None:
+            return parm.evalAtFrame(frame)
+    return None
+
+def parseFrameList(text):
+    """Read a frame list like '1-10,12,20-40x5' into (start, end, step) runs"""
+    runs = []
+    for item in text.split(","):
+        match = re.match(r"^\\s*(-?\\d+)(?:-(-?\\d+))?(?:x(\\d+))?\\s*$", item)
+        if match:
+            start, end, step = match.groups()
+            runs.append((int(start), int(end or start), int(step or 1)))
+    return runs
+
+def initRender(out, sframe, eframe, userange, useskip, step=1, runs=None):
+    import hou
+    rnode = hou.node(out)
+    is_merge = "merge" in str(rnode.type()).lower()
+
+    # A merge renders its inputs, each of them reports its own frames
+    rops = list(rnode.inputs()) if is_merge else [rnode]
+
+    frames = 0
+    for node in rops:
+        if runs and not is_merge:
+            frames += sum(len(range(start, end + 1, inc)) for start, end, inc in runs)
+            continue
+        if userange == "True" and not is_merge:
+            start, end, inc = sframe, eframe, step
+        elif node.parm("f1") is not None and node.parm("f2") is not None:
+            f3 = node.parm("f3")
+            start, end = node.parm("f1").eval(), node.parm("f2").eval()
+            inc = f3.eval() if f3 is not None else 1
+        else:
+            continue
+        frames += len(range(int(start), int(end) + 1, max(1, int(inc))))
+    emitEvent("job", rop=out, frames=frames)
+
+    def dataHelper(rop_node, render_event_type, render_time):
+        frame = hou.timeToFrame(render_time)
+        if float(frame).is_integer():
+            frame = int(frame)
+        rop = rop_node.path()
+        if render_event_type == hou.ropRenderEventType.PreRender:
+            emitEvent("render_start", rop=rop)
+        elif render_event_type == hou.ropRenderEventType.PreFrame:
+            emitEvent("frame_start", rop=rop, frame=frame)
+            if useskip == "True":
+                output_file = outputFile(rop_node, frame)
+                if output_file and os.path.exists(output_file):
+                    emitEvent("frame_skipped", rop=rop, frame=frame, output=output_file)
+        elif render_event_type == hou.ropRenderEventType.PostFrame:
+            output_file = outputFile(rop_node, frame)
+            emitEvent("frame_end", rop=rop, frame=frame, output=output_file)
+            print(f"hardeen_outputfile: {output_file}")
+        elif render_event_type == hou.ropRenderEventType.PostRender:
+            emitEvent("render_end", rop=rop)
+
+    for node in rops:
+        node.addRenderEventCallback(dataHelper)
+    try:
+        _render(rnode, sframe, eframe, userange, useskip, step, runs)
+    finally:
+        # Warm workers render many jobs in one session, don't stack callbacks
+        for node in rops:
+            node.removeRenderEventCallback(dataHelper)
+
+def _render(rnode, sframe, eframe, userange, useskip, step, runs=None):
+    parm_skip = rnode.parm("RS_outputSkipRendered")
+    if parm_skip is not None:
+        if useskip == "True":
+            parm_skip.set(1)
+        else:
+            parm_skip.set(0)
+
+    if "merge" in str(rnode.type()).lower():
+        rnode.render()
+        if userange == "True":
+            print("hardeen_note: Out Path leads to a merge node, but you have selected to override the frame range. "
+                  "Defaulting to the frame range that was set from within Houdini for each ROP.")
+    elif runs:
+        # A frame list renders run by run in the one session, the scene is loaded once
+        for start, end, inc in runs:
+            rnode.render(frame_range=(start, end, inc))
+    else:
+        if userange == "True":
+            rnode.render(frame_range=(sframe, eframe, step))
+        else:
+            # The ROP's own range keeps its own step
+            f3 = rnode.parm("f3")
+            inc = max(1, int(f3.eval())) if f3 is not None else 1
+            rnode.render(frame_range=(rnode.parm("f1").eval(), rnode.parm("f2").eval(), inc))
+
+def runWorker():
+    """Keep hython alive and render jobs read as JSON lines from stdin"""
+    import json
+    import sys
+    import hou
+
+    loaded = None
+    print("hardeen_worker: ready", flush=True)
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+            hip_file = os.path.abspath(job["hip"].strip())
+            # Only pay for a scene load when the hip changed on disk
+            scene_key = (hip_file, os.path.getmtime(hip_file))
+            if scene_key != loaded:
+                loaded = None
+                os.chdir(os.path.dirname(hip_file))
+                hou.hipFile.load(hip_file, suppress_save_prompt=True)
+                loaded = scene_key
+                print(f"hardeen_scene: loaded {hip_file}", flush=True)
+            else:
+                print(f"hardeen_scene: reused {hip_file}", flush=True)
+
+            initRender(job["out"].strip(),
+                       int(job["sframe"]),
+                       int(job["eframe"]),
+                       job["userange"],
+                       job["useskip"],
+                       int(job.get("step", 1)),
+                       parseFrameList(job["frames"]) if job.get("frames") else None)
+        except Exception as e:
+            print(f"hardeen_error: {e}", flush=True)
+        emitEvent("job_done")
+        print("hardeen_job_done", flush=True)
+
+if __name__ == "__main__":
+    parser = OptionParser()
+    parser.add_option("-i", "--hip", dest="hipfile", help="path to .hip file")
+    parser.add_option("-o", "--out", dest="outnode", help="path to out node")
+    parser.add_option("-s", "--sframe", dest="startframe", help="start frame to render")
+    parser.add_option("-e", "--eframe", dest="endframe", help="end frame to render")
+    parser.add_option("-u", "--userange", dest="userange", help="toggle to enable frame range")
+    parser.add_option("-r", "--useskip", dest="useskip", help="toggle to skip rendering of already rendered frames")
+    parser.add_option("-n", "--step", dest="step", default="1", help="render every nth frame of the range")
+    parser.add_option("-f", "--frames", dest="frames", help="render these frames instead, e.g. 1-10,12,20-40x5")
+    parser.add_option("-w", "--worker", dest="worker", action="store_true", default=False,
+                      help="stay alive and read render jobs from stdin")
+    parser.add_option("--eventfd", dest="eventfd", help="file descriptor for structured JSON events")
+
+    (options, args) = parser.parse_args()
+
+    if options.eventfd:
+        EVENTS = os.fdopen(int(options.eventfd), "w", buffering=1)
+
+    if options.worker:
+        runWorker()
+        raise SystemExit(0)
+
+    # Convert hip file path to absolute and verify it exists
+    hip_file = os.path.abspath(options.hipfile.strip())  # Strip whitespace and newlines
+    hip_dir = os.path.dirname(hip_file)
+    
+    print(f"Current working directory: {os.getcwd()}")
+    print(f"Hip file path: {hip_file}")
+    print(f"Hip directory: {hip_dir}")
+    
+    # Detailed file checks
+    exists = os.path.exists(hip_file)
+    print(f"File exists: {exists}")
+    
+    if exists:
+        st = os.stat(hip_file)
+        print(f"File mode: {stat.filemode(st.st_mode)}")
+        print(f"File owner: {st.st_uid}")
+        print(f"File group: {st.st_gid}")
+        print(f"File size: {st.st_size}")
+    else:
+        print("Checking parent directory...")
+        parent_dir = os.path.dirname(hip_file)
+        if os.path.exists(parent_dir):
+            print(f"Parent directory exists")
+            try:
+                files = os.listdir(parent_dir)
+                print(f"Directory contents: {files}")
+            except Exception as e:
+                print(f"Error listing directory: {e}")
+        else:
+            print(f"Parent directory does not exist")
+    
+    print(f"File is readable: {os.access(hip_file, os.R_OK)}")
+    print(f"Current user ID: {os.getuid()}")
+    print(f"Current group ID: {os.getgid()}")
+    
+    try:
+        with open(hip_file, 'rb') as f:
+            print("Successfully opened file for reading")
+            print(f"First few bytes: {f.read(10)}")
+    except Exception as e:
+        print(f"Error opening file: {e}")
+    
+    # Change to the hip file directory before loading
+    os.chdir(hip_dir)
+    
+    import hou
+    hou.hipFile.load(hip_file)
+    
+    initRender(options.outnode.strip(),  # Strip other arguments too
+              int(options.startframe), 
+              int(options.endframe), 
+              options.userange, 
+              options.useskip,
+              int(options.step),
+              parseFrameList(options.frames) if options.frames else None)
+''')
+    return temp_file
+
+def remove_temp_python_file(temp_file):
+    """Delete a render script made by create_temp_python_file()"""
+    if temp_file:
+        try:
+            os.remove(temp_file)
+        except OSError:
+            pass
+
+class RenderWorker:
+    """Long-lived hython process that keeps the last hip file loaded"""
+    JOB_DONE = 'hardeen_job_done'
+
+    def __init__(self):
+        self.process = None
+        self.script = None
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        """Launch the worker if it isn't already running"""
+        if self.is_alive():
+            return self.process
+        if self.process is not None:
+            close_render(self.process)
+        remove_temp_python_file(self.script)
+        self.script = create_temp_python_file()
+        self.process = launch_render(['hython', self.script, '-w'], stdin=subprocess.PIPE)
+        return self.process
+
+    def submit(self, hip, out, sframe, eframe, userange, useskip, frames=None):
+        """Send a render job to the worker, starting it if needed"""
+        process = self.start()
+        job = {
+            'hip': hip,
+            'out': out,
+            'sframe': sframe,
+            'eframe': eframe,
+            'userange': str(userange),
+            'useskip': str(useskip)
+        }
+        if frames:
+            job['frames'] = format_frame_list(frames)
+        process.stdin.write((json.dumps(job) + '\n').encode())
+        process.stdin.flush()
+        return process
+
+    def stop(self):
+        """Shut the worker down, closing stdin lets it exit cleanly"""
+        if not self.is_alive():
+            if self.process is not None:
+                close_render(self.process)
+            self.process = None
+            remove_temp_python_file(self.script)
+            self.script = None
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            os.killpg(os.getpgid(self.process.pid), signal.SIGKILL)
+            self.process.wait()
+        close_render(self.process)
+        self.process = None
+        remove_temp_python_file(self.script)
+        self.script = None
+
+def build_render_command(script, hip, out, sframe, eframe, userange, useskip, step=1, frames=None):
+    """Build the hython command line that runs script, from create_temp_python_file()
+
+    frames, a list of frame numbers, is rendered instead of the range when given.
+    """
+    cmd = [
+        'hython',
+        script,
+        '-i', hip,
+        '-o', out,
+        '-s', str(sframe),
+        '-e', str(eframe),
+        '-n', str(step),
+        '-u', str(userange),
+        '-r', str(useskip)
+    ]
+    if frames:
+        cmd += ['-f', format_frame_list(frames)]
+    return cmd
+
+def split_frame_range(start, end, chunks, interleaved=False):
+    """Split an inclusive frame range into (start, end, step) chunks, one per process"""
+    count = end - start + 1
+    if count <= 0:
+        return [(start, end, 1)]
+    chunks = max(1, min(chunks, count))
+    if interleaved:
+        return [(start + i, end, chunks) for i in range(chunks)]
+
+    size, extra = divmod(count, chunks)
+    ranges = []
+    first = start
+    for i in range(chunks):
+        last = first + size - 1 + (1 if i < extra else 0)
+        ranges.append((first, last, 1))
+        first = last + 1
+    return ranges
+
+# Parms that hold a ROP's output path, the first one a ROP has is used (OUTPUT_PARMS in the render script)
+ROP_OUTPUT_PARMS = ("RS_outputFileNamePrefix", "picture", "sopoutput", "vm_picture")
+
+def split_frames(frames, chunks, interleaved=False):
+    """Split a frame list into at most chunks lists, one per process"""
+    chunks = max(1, min(chunks, len(frames)))
+    if interleaved:
+        return [frames[i::chunks] for i in range(chunks)]
+    size, extra = divmod(len(frames), chunks)
+    lists = []
+    first = 0
+    for i in range(chunks):
+        last = first + size + (1 if i < extra else 0)
+        lists.append(frames[first:last])
+        first = last
+    return lists
+
+def format_frame_list(frames):
+    """Write frames compactly in the order given, e.g. [1, 2, 3, 5, 10, 15, 20] -> '1-3,5-20x5'"""
+    items = []
+    i = 0
+    while i < len(frames):
+        first = frames[i]
+        step = frames[i + 1] - first if i + 1 < len(frames) else 0
+        last = i
+        if step > 0:
+            while last + 1 < len(frames) and frames[last + 1] - frames[last] == step:
+                last += 1
+        # Two frames a step apart read better as two frames
+        if last == i or (last == i + 1 and step != 1):
+            items.append(str(first))
+            i += 1
+        else:
+            items.append(f"{first}-{frames[last]}" + (f"x{step}" if step != 1 else ''))
+            i = last + 1
+    return ','.join(items)
+
+FRAME_ITEM_RE = re.compile(r'^(-?\d+)(?:-(-?\d+))?(?:x(\d+))?$')
+
+def parse_frame_list(text):
+    """Read a frame list like '1-100x5,120,200-210' into frame numbers
+
+    Frames keep the order they are written in, repeats are dropped. Raises
+    ValueError for anything that isn't a frame, a range or a stepped range.
+    """
+    frames = []
+    seen = set()
+    for item in text.replace(' ', '').split(','):
+        if not item:
+            continue
+        match = FRAME_ITEM_RE.match(item)
+        if not match:
+            raise ValueError(f"invalid frame list item: {item}")
+        start, end, step = match.groups()
+        start = int(start)
+        end = int(end) if end is not None else start
+        step = int(step) if step is not None else 1
+        if end < start or step < 1:
+            raise ValueError(f"invalid frame list item: {item}")
+        for frame in range(start, end + 1, step):
+            if frame not in seen:
+                seen.add(frame)
+                frames.append(frame)
+    if not frames:
+        raise ValueError("empty frame list")
+    return frames
+
+# Render orders, 'coarse' renders spread out frames first and fills in between
+RENDER_ORDERS = ('sequential', 'reverse', 'coarse')
+
+def order_frames(frames, order='sequential'):
+    """Return frames in render order
+
+    sequential keeps them as given. coarse sorts them and goes first, last,
+    then every 2**k-th frame with k falling, e.g. 1, 100, 65, 33, 97, 17, 49
+    and 81 for 1-100. A broken shot shows up within a few frames anywhere in
+    the sequence, and each pass is an evenly stepped run the render script
+    renders in one go.
+    """
+    if order == 'reverse':
+        return list(reversed(frames))
+    if order != 'coarse' or len(frames) < 3:
+        return list(frames)
+    frames = sorted(frames)
+    count = len(frames)
+    ordered = [frames[0], frames[-1]]
+    taken = {0, count - 1}
+    stride = 1 << (count - 1).bit_length()
+    while stride >= 1:
+        for index in range(0, count, stride):
+            if index not in taken:
+                taken.add(index)
+                ordered.append(frames[index])
+        stride >>= 1
+    return ordered
+
+def output_pattern(first_output, second_output):
+    """Turn the output paths of frames 1 and 2 into a pattern with # for the frame number
+
+    '/r/img.0001.exr' and '/r/img.0002.exr' give '/r/img.####.exr'. Returns
+    None when the two don't differ only by the frame number.
+    """
+    if not first_output or not second_output or first_output == second_output:
+        return None
+    first_parts = re.split(r'(\d+)', first_output)
+    second_parts = re.split(r'(\d+)', second_output)
+    if len(first_parts) != len(second_parts):
+        return None
+    pattern = []
+    for a, b in zip(first_parts, second_parts):
+        if a == b:
+            pattern.append(a)
+        elif a.isdigit() and b.isdigit() and int(a) == 1 and int(b) == 2 and len(a) == len(b):
+            pattern.append('#' * len(a))
+        else:
+            return None
+    return ''.join(pattern)
+
+def frame_output(pattern, frame):
+    """Output path of frame from a pattern made by output_pattern"""
+    return re.sub(r'#+', lambda match: str(frame).zfill(len(match.group(0))), pattern)
+
+def missing_frames(pattern, frames):
+    """Frames whose output doesn't exist or is empty, one directory listing per folder"""
+    folders = {}
+    for frame in frames:
+        path = frame_output(pattern, frame)
+        folders.setdefault(os.path.dirname(path), []).append((frame, os.path.basename(path)))
+
+    missing = set()
+    for folder, outputs in folders.items():
+        rendered = set()
+        try:
+            with os.scandir(folder or '.') as entries:
+                for entry in entries:
+                    try:
+                        # A crashed render can leave an empty file behind
+                        if entry.stat().st_size > 0:
+                            rendered.add(entry.name)
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+        missing.update(frame for frame, name in outputs if name not in rendered)
+    return [frame for frame in frames if frame in missing]
+
+def frames_to_render(hip, rop, frames, cache=None):
+    """The frames whose output is missing, None when the ROP's output pattern isn't known
+
+    The pattern comes from the ROP scan and is only trusted while the hip
+    file is unchanged since.
+    """
+    cached = (cache or RopScanCache()).lookup(hip)
+    if not cached or not cached[2]:
+        return None
+    pattern = cached[1].get(rop, {}).get('output')
+    if not pattern:
+        return None
+    return missing_frames(pattern, frames)
+
+def format_time(seconds):
+
+    timedelta = datetime.timedelta(seconds=seconds)
+    days = timedelta.days
+    hours, remainder = divmod(timedelta.seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    parts = []
+    if days:
+        parts.append(f"{days}d")
+    if hours:
+        parts.append(f"{hours}h")
+    if minutes:
+        parts.append(f"{minutes}m")
+    if seconds or not any((days, hours, minutes)):
+        parts.append(f"{seconds}s")
+    return "".join(parts)
+
+EVENT_PREFIX = 'hardeen_event: '
+
+def launch_render(cmd, **popen_kwargs):
+    """Start a render script process with a separate pipe for its JSON events"""
+    read_fd, write_fd = os.pipe()
+    try:
+        process = subprocess.Popen(
+            cmd + ['--eventfd', str(write_fd)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+            pass_fds=(write_fd,),
+            **popen_kwargs
+        )
+    except Exception:
+        os.close(read_fd)
+        raise
+    finally:
+        os.close(write_fd)
+    process.events = read_fd
+    return process
+
+def close_render(process):
+    """Close the event pipe of a render process that has exited"""
+    if getattr(process, 'events', None) is not None:
+        os.close(process.events)
+        process.events = None
+
+class RenderOutputReader:
+    """Event-driven reader for the log and event pipes of render processes.
+
+    Pipes are read in large non-blocking chunks and split into lines in bulk.
+    The selector also watches a pidfd per process where the platform has
+    them, so an exit is noticed immediately instead of by polling.
+    Iterating yields (process index, source, value) where source is 'log'
+    with a line of renderer output, or 'event' with a decoded JSON event.
+    Everything read is also written to recorder when one is set. The reader
+    closes it when done unless close_recorder is off, so a recording can
+    carry on through the readers of a relaunch.
+    """
+    CHUNK_SIZE = 1 << 20
+    POLL_INTERVAL = 0.5  # Only used without pidfd support
+
+    def __init__(self, processes, recorder=None, close_recorder=True):
+        self.processes = processes
+        self.recorder = recorder
+        self.close_recorder = close_recorder
+        self.selector = selectors.DefaultSelector()
+        self.pending = {}  # Partial trailing line per fd
+        self.open_streams = {}  # Process index -> number of open pipes
+        self.stopped = False
+
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self.selector.register(self._wake_r, selectors.EVENT_READ, ('wake', None))
+
+        self.use_pidfd = hasattr(os, 'pidfd_open')
+        for index, process in enumerate(processes):
+            fds = [(process.stdout.fileno(), 'log')]
+            if getattr(process, 'events', None) is not None:
+                fds.append((process.events, 'event'))
+            for fd, source in fds:
+                os.set_blocking(fd, False)
+                self.selector.register(fd, selectors.EVENT_READ, (source, index))
+            self.open_streams[index] = len(fds)
+            if self.use_pidfd:
+                try:
+                    pidfd = os.pidfd_open(process.pid)
+                except OSError:
+                    self.use_pidfd = False
+                else:
+                    self.selector.register(pidfd, selectors.EVENT_READ, ('exit', index))
+
+    def stop(self):
+        """Wake the reader up and end the iteration, safe from signal handlers and other threads"""
+        self.stopped = True
+        if self._wake_w is None:
+            return
+        try:
+            os.write(self._wake_w, b'x')
+        except OSError:
+            pass
+
+    def __iter__(self):
+        for batch in self.batches():
+            yield from batch
+
+    def batches(self):
+        """Yield a list of items for every wakeup, so callers can update in bulk"""
+        try:
+            while self.open_streams and not self.stopped:
+                timeout = None if self.use_pidfd else self.POLL_INTERVAL
+                batch = []
+                for key, _ in self.selector.select(timeout):
+                    kind, index = key.data
+                    if kind == 'wake':
+                        # stop() was called, the loop ends after this batch
+                        continue
+                    if kind == 'exit':
+                        # Drain what the process left behind, then stop watching it
+                        self.selector.unregister(key.fd)
+                        os.close(key.fd)
+                        self._close_process(index, batch)
+                    elif index in self.open_streams:
+                        self._read(key.fd, kind, index, batch)
+
+                if not self.use_pidfd:
+                    for index in list(self.open_streams):
+                        if self.processes[index].poll() is not None:
+                            self._close_process(index, batch)
+                if batch:
+                    if self.recorder is not None:
+                        self.recorder.record_batch(batch)
+                    yield batch
+        finally:
+            self.close()
+
+    def _read(self, fd, source, index, batch, drain=False):
+        """Read everything available on fd and append complete lines to batch"""
+        while True:
+            try:
+                data = os.read(fd, self.CHUNK_SIZE)
+            except BlockingIOError:
+                return
+            except OSError:
+                data = b''
+            if not data:
+                self._close_stream(fd, source, index, batch)
+                return
+            self._split(fd, source, index, data, batch)
+            if not drain and len(data) < self.CHUNK_SIZE:
+                return
+
+    def _split(self, fd, source, index, data, batch, final=False):
+        data = self.pending.pop(fd, b'') + data
+        if final:
+            complete, rest = data, b''
+        else:
+            cut = data.rfind(b'\n') + 1
+            complete, rest = data[:cut], data[cut:]
+        if rest:
+            self.pending[fd] = rest
+        if not complete:
+            return
+
+        if source == 'event':
+            for raw in complete.split(b'\n'):
+                if not raw.strip():
+                    continue
+                try:
+                    event = json.loads(raw)
+                except ValueError:
+                    continue
+                batch.append((index, 'event', event))
+                if event.get('event') == 'job_done':
+                    self._close_stream(fd, source, index, batch)
+                    return
+            return
+
+        text = complete.decode(errors='backslashreplace')
+        text = text.replace('[Redshift] ', '').replace('[Redshift]', '')
+        lines = text.split('\n')
+        if text.endswith('\n'):
+            lines.pop()
+        for line in lines:
+            line = line.rstrip()
+            # A warm worker stays alive, it marks the end of each job instead
+            if line == RenderWorker.JOB_DONE:
+                self._close_stream(fd, source, index, batch)
+                return
+            # Scripts started without an event fd tag their events on stdout
+            if line.startswith(EVENT_PREFIX):
+                try:
+                    batch.append((index, 'event', json.loads(line[len(EVENT_PREFIX):])))
+                except ValueError:
+                    pass
+                continue
+            batch.append((index, 'log', line))
+
+    def _close_stream(self, fd, source, index, batch):
+        try:
+            self.selector.unregister(fd)
+        except (KeyError, ValueError):
+            return
+        if fd in self.pending:
+            self._split(fd, source, index, b'', batch, final=True)
+        self.open_streams[index] -= 1
+        if self.open_streams[index] <= 0:
+            del self.open_streams[index]
+
+    def _close_process(self, index, batch):
+        for key in list(self.selector.get_map().values()):
+            kind, key_index = key.data
+            if key_index == index and kind in ('log', 'event'):
+                self._read(key.fd, kind, index, batch, drain=True)
+                self._close_stream(key.fd, kind, index, batch)
+        self.open_streams.pop(index, None)
+
+    def close(self):
+        """Release the selector, the wake pipe and any pidfds"""
+        if self.selector is None:
+            return
+        for key in list(self.selector.get_map().values()):
+            if key.data[0] in ('wake', 'exit'):
+                os.close(key.fd)
+        self.selector.close()
+        self.selector = None
+        wake_w, self._wake_w = self._wake_w, None
+        os.close(wake_w)
+        if self.recorder is not None and self.close_recorder:
+            self.recorder.close()
+
+class RenderRecorder:
+    """Saves render output with timestamps so it can be replayed without Houdini
+
+    The file is JSON lines: a header with the render's frame count, process
+    count and range start, then one {"t", "w", "s", "v"} line per item with
+    the seconds since recording started, process index, source and value.
+    """
+
+    def __init__(self, path, total_frames, workers=1, range_start=None, **info):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.file = open(path, 'w')
+        self.start = time.monotonic()
+        header = {'hardeen_recording': 1, 'total_frames': total_frames, 'workers': workers,
+                  'range_start': range_start, 'started': time.time(), **info}
+        self.file.write(json.dumps(header) + '\n')
+
+    def record_batch(self, batch):
+        t = round(time.monotonic() - self.start, 4)
+        self.file.write(''.join(
+            json.dumps({'t': t, 'w': index, 's': source, 'v': value}) + '\n'
+            for index, source, value in batch
+        ))
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+class ReplayReader:
+    """Plays a RenderRecorder file back with the RenderOutputReader interface
+
+    speed scales the recorded timing, 0 replays as fast as possible.
+    header holds the recording's header line.
+    """
+
+    def __init__(self, path, speed=1.0):
+        self.path = path
+        self.speed = speed
+        self.stopped = threading.Event()
+        with open(path, 'r') as f:
+            self.header = json.loads(f.readline())
+        if self.header.get('hardeen_recording') != 1:
+            raise ValueError(f"{path} is not a Hardeen render recording")
+
+    def stop(self):
+        self.stopped.set()
+
+    def __iter__(self):
+        for batch in self.batches():
+            yield from batch
+
+    def batches(self):
+        """Yield the items recorded at the same moment together, at the recorded pace"""
+        start = time.monotonic()
+        batch = []
+        batch_time = None
+        with open(self.path, 'r') as f:
+            f.readline()
+            for line in f:
+                item = json.loads(line)
+                if batch and item['t'] != batch_time:
+                    yield batch
+                    batch = []
+                if not batch:
+                    batch_time = item['t']
+                    if self.speed:
+                        delay = start + batch_time / self.speed - time.monotonic()
+                        if delay > 0:
+                            self.stopped.wait(delay)
+                    if self.stopped.is_set():
+                        return
+                batch.append((item['w'], item['s'], item['v']))
+        if batch and not self.stopped.is_set():
+            yield batch
+
+    def close(self):
+        self.stop()
+
+class RenderProgress:
+    """Turns render output into progress and timing events.
+
+    feed() returns a list of (kind, value) tuples:
+        ('output', text)           summary text worth showing
+        ('image', path)            a frame was written
+        ('progress', (n, total))   completed frame count
+        ('total', total)           total frame count changed
+        ('frame', number)          a frame started rendering
+        ('times', (elapsed, average, est_total, remaining, eta, show_eta))
+        ('frame_done', number)     a frame finished, after its timing update
+
+    feed_event() returns the same for structured events from the render
+    script. When structured is set the log lines are only used for display.
+    Remaining time comes from estimator, by default the best of the
+    hardeen_eta strategies for this render. With history, frame times of
+    earlier renders, there is an ETA from the start and it gives way to the
+    live frames as they finish.
+    """
+
+    def __init__(self, total_frames, workers=1, range_start=None, structured=False, estimator=None,
+                 start_time=None, history=None):
+        self.structured = structured
+        self.estimator = estimator or BestEstimator()
+        self.seeded = bool(history)
+        if self.seeded:
+            self.estimator = HistoryEstimator(history, self.estimator)
+        self.total_frames = total_frames
+        self.frame_total = total_frames
+        self.workers = max(1, workers)
+        self.range_start = range_start
+        self.start_time = start_time or datetime.datetime.now()
+
+        self.frame_times = []
+        self.frame_count = 0
+        self.average = 0
+        self.recent_average = 0
+        self.remaining_time = 0
+        self.est_total = 0
+        self.elapsed_time = 0
+        self.eta = self.start_time
+        self.frame_starts = {}  # Frame start time per render process
+        self.first_frame_start = None  # Scene load ends here, it isn't part of the frame rate
+        self.completed_frames = set()
+        self.current_frame = 0
+        self.rendered_image = None
+
+    def feed(self, line, worker=0, now=None):
+        """Parse one line of render output from the given process"""
+        events = []
+        now = now or datetime.datetime.now()
+        workers = self.workers
+        current_frame_start = self.frame_starts.get(worker)
+
+        if self.structured:
+            # Progress comes from feed_event, keep the render summary line only
+            if 'render started for' in line:
+                events.append(('output', '\n' + line.split(' Time from')[0] + '\n'))
+            return events
+
+        # Check for new rendered image
+        if 'hardeen_outputfile:' in line:
+            self.rendered_image = line.split(': ')[1]
+            events.append(('image', self.rendered_image))
+
+            # Extract frame number from filename
+            frame_match = re.search(r'\.(\d+)\.', self.rendered_image)
+            if frame_match:
+                self.current_frame = int(frame_match.group(1))
+                # Chunks finish out of order, count distinct frames instead
+                if workers > 1:
+                    self.completed_frames.add(self.current_frame)
+                    self.frame_count = len(self.completed_frames)
+                # Calculate frame count based on position in range
+                elif self.range_start is not None:
+                    self.frame_count = self.current_frame - self.range_start + 1
+                else:
+                    self.frame_count += 1
+
+                # Ensure frame count doesn't exceed total
+                self.frame_count = min(self.frame_count, self.total_frames)
+                events.append(('progress', (self.frame_count, self.total_frames)))
+            else:
+                self.frame_count += 1
+
+            if current_frame_start:
+                self._record_frame_time((now - current_frame_start).total_seconds())
+            events.append(self._update_times(now))
+            events.append(('frame_done', self.current_frame))
+
+        elif 'render started for' in line and workers == 1:
+            self.frame_count = 0
+            clean_line = line.split(' Time from')[0]
+            events.append(('output', '\n' + clean_line + '\n'))
+
+            # Update total frames
+            self.frame_total = int(re.findall(r'\d+', clean_line)[-1])
+            events.append(('total', self.frame_total))
+            events.append(('progress', (self.frame_count, self.frame_total)))
+
+        elif 'Rendering frame' in line:
+            # Extract current frame number
+            frame_match = re.search(r'frame (\d+)', line)
+            if frame_match:
+                self.current_frame = frame_match.group(1)
+                events.append(('frame', self.current_frame))
+
+            events.append(('output', line.replace('Rendering f', 'F') + '\n'))
+            current_frame_start = now
+            self.frame_starts[worker] = current_frame_start
+            self.first_frame_start = self.first_frame_start or now
+            if self.seeded and not self.frame_times:
+                events.append(self._update_times(now))
+
+            if self.recent_average:
+                estimate = current_frame_start + datetime.timedelta(seconds=self.recent_average)
+                events.append(('output',
+                    f"   Started  {current_frame_start.strftime('%I:%M:%S %p')}\n"
+                    f"  Estimate  {estimate.strftime('%I:%M:%S %p')} - {format_time(self.recent_average)}"
+                    f" ({self.estimator.name})\n"
+                ))
+
+        elif 'Skip rendering enabled. File already rendered' in line:
+            # Handle skipped frames
+            self.frame_count += 1
+            events.append(('progress', (self.frame_count, self.frame_total)))
+            events.append(('output', "   Skipped - File already exists\n"))
+
+        return events
+
+    def feed_event(self, event, worker=0):
+        """Handle one structured event from the render script"""
+        events = []
+        kind = event.get('event')
+        now = datetime.datetime.fromtimestamp(event['time']) if 'time' in event else datetime.datetime.now()
+        frame = event.get('frame')
+        key = (event.get('rop'), frame)
+
+        if kind == 'job':
+            # Chunked renders already know their total from the split range,
+            # a relaunch after a crash only gets the frames that were left
+            if self.workers == 1 and event.get('frames'):
+                self.total_frames = self.frame_total = self.frame_count + event['frames']
+                events.append(('total', self.total_frames))
+                events.append(('progress', (self.frame_count, self.total_frames)))
+            if self.seeded:
+                events.append(self._update_times(now))
+
+        elif kind == 'frame_start':
+            self.current_frame = frame
+            self.frame_starts[worker] = now
+            self.first_frame_start = self.first_frame_start or now
+            events.append(('frame', frame))
+            events.append(('output', f"Frame {frame}\n"))
+            if self.seeded and not self.frame_times:
+                events.append(self._update_times(now))
+            if self.recent_average:
+                estimate = now + datetime.timedelta(seconds=self.recent_average)
+                events.append(('output',
+                    f"   Started  {now.strftime('%I:%M:%S %p')}\n"
+                    f"  Estimate  {estimate.strftime('%I:%M:%S %p')} - {format_time(self.recent_average)}"
+                    f" ({self.estimator.name})\n"
+                ))
+
+        elif kind == 'frame_skipped':
+            self.frame_starts.pop(worker, None)
+            self.completed_frames.add(key)
+            self.frame_count = len(self.completed_frames)
+            events.append(('progress', (self.frame_count, self.total_frames)))
+            events.append(('output', "   Skipped - File already exists\n"))
+
+        elif kind == 'frame_end' and key not in self.completed_frames:
+            self.completed_frames.add(key)
+            self.frame_count = len(self.completed_frames)
+            started = self.frame_starts.pop(worker, None)
+            if started is not None:
+                self._record_frame_time((now - started).total_seconds())
+
+            if event.get('output'):
+                self.rendered_image = event['output']
+                events.append(('image', self.rendered_image))
+            events.append(('progress', (self.frame_count, self.total_frames)))
+            events.append(self._update_times(now))
+            events.append(('frame_done', frame))
+
+        return events
+
+    def _record_frame_time(self, seconds):
+        self.frame_times.append(seconds)
+        self.estimator.add(seconds)
+
+    def _update_times(self, now):
+        """Recompute the averages and ETA from the measured frame times"""
+        self.elapsed_time = (now - self.start_time).total_seconds()
+        remaining_frames = max(0, self.total_frames - self.frame_count)
+        if self.frame_times:
+            self.average = sum(self.frame_times) / len(self.frame_times)
+            self.recent_average = self.estimator.frame_time()
+            remaining_work = self.estimator.remaining(remaining_frames)
+        elif self.seeded:
+            # Nothing measured yet, earlier renders of this shot are all we have
+            self.average = self.recent_average = self.estimator.frame_time()
+            remaining_work = self.estimator.remaining(remaining_frames)
+        elif self.frame_count:
+            # No frame was timed from its start, fall back on the time since
+            # the first frame started so the scene load isn't spread over the frames
+            rendering = (now - (self.first_frame_start or self.start_time)).total_seconds()
+            self.average = self.recent_average = rendering / self.frame_count
+            remaining_work = remaining_frames * self.average
+        else:
+            remaining_work = 0
+
+        # Parallel processes each work through their share of the frames
+        self.remaining_time = remaining_work / self.workers
+        self.est_total = self.elapsed_time + self.remaining_time
+        self.eta = now + datetime.timedelta(seconds=self.remaining_time)
+        return ('times', (self.elapsed_time, self.average, self.est_total,
+                          self.remaining_time, self.eta, bool(self.frame_times) or self.seeded))
+
+PUSHOVER_URL = 'https://api.pushover.net/1/messages.json'
+
+class NotificationDispatcher:
+    """Posts push notifications from a background thread
+
+    A progress message still waiting to be sent is replaced by a newer one,
+    other messages are always sent. Failed posts are retried with backoff,
+    so a slow or dead endpoint never holds up the caller. The endpoint can
+    be pointed elsewhere with HARDEEN_NOTIFY_URL, e.g. a local test server.
+    """
+    TIMEOUT = (5, 30)  # Connect and read timeouts in seconds
+    RETRIES = 3
+    BACKOFF = 2.0
+
+    def __init__(self, url=None):
+        self.url = url or os.environ.get('HARDEEN_NOTIFY_URL') or PUSHOVER_URL
+        self.pending = collections.deque()
+        self.condition = threading.Condition()
+        self.running = True
+        self.thread = None
+        self.session = None
+
+    def send(self, data, attachment=None, coalesce=False):
+        """Queue a message, attachment is a (filename, bytes, mime type) tuple
+
+        attachment may also be a function returning that tuple, it is called
+        on the dispatcher thread and never for a message that was replaced.
+        """
+        with self.condition:
+            if coalesce:
+                self.pending = collections.deque(item for item in self.pending if not item[2])
+            self.pending.append((data, attachment, coalesce))
+            self.condition.notify()
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+
+    def stop(self, timeout=2.0):
+        """Give queued messages up to timeout seconds to go out"""
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                data, attachment, _ = self.pending.popleft()
+            if callable(attachment):
+                try:
+                    attachment = attachment()
+                except Exception as e:
+                    print(f"Error preparing notification image: {e}")
+                    attachment = None
+            self._post(data, attachment)
+
+    def _post(self, data, attachment):
+        import requests
+        if self.session is None:
+            # One session, so the connection is reused between messages
+            self.session = requests.Session()
+
+        files = {'attachment': attachment} if attachment else None
+        error = None
+        for attempt in range(self.RETRIES + 1):
+            if attempt:
+                time.sleep(self.BACKOFF ** (attempt - 1))
+            try:
+                response = self.session.post(self.url, data=data, files=files, timeout=self.TIMEOUT)
+            except requests.RequestException as e:
+                error = e
+                continue
+            if response.status_code >= 500 or response.status_code == 429:
+                error = f"HTTP {response.status_code}"
+                continue
+            if response.ok:
+                print("Push notification sent successfully")
+            else:
+                # The request itself is wrong, sending it again won't help
+                print(f"Error sending push notification: HTTP {response.status_code} {response.text}")
+            return
+        print(f"Error sending push notification after {self.RETRIES + 1} attempts: {error}")
+
+def get_config_dir():
+    """Get (and create) the per-user Hardeen config directory"""
+    base = os.environ.get('XDG_CONFIG_HOME') or os.path.join(str(Path.home()), '.config')
+    config_dir = os.path.join(base, 'hardeen')
+    os.makedirs(config_dir, exist_ok=True)
+    return config_dir
+
+def get_cache_dir():
+    """Get (and create) the per-user Hardeen cache directory"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(str(Path.home()), '.cache')
+    cache_dir = os.path.join(base, 'hardeen')
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+class RopScanCache:
+    """On-disk cache of ROP scan results keyed by hip path, size and mtime"""
+    MAX_ENTRIES = 200
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_config_dir(), 'rop_cache.json')
+        self.entries = {}
+        try:
+            with open(self.path, 'r') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    @staticmethod
+    def _file_key(hip_file):
+        st = os.stat(hip_file)
+        return st.st_size, st.st_mtime
+
+    def lookup(self, hip_file):
+        """Return (out_nodes, node_settings, fresh) or None if never scanned"""
+        hip_file = os.path.abspath(hip_file)
+        entry = self.entries.get(hip_file)
+        if not entry:
+            return None
+        try:
+            size, mtime = self._file_key(hip_file)
+        except OSError:
+            return None
+        fresh = entry['size'] == size and entry['mtime'] == mtime
+        # Scans from before output patterns and steps were recorded need redoing
+        fresh = fresh and all('output' in settings and 'f3' in settings
+                              for settings in entry['node_settings'].values())
+        return list(entry['out_nodes']), dict(entry['node_settings']), fresh
+
+    def store(self, hip_file, size, mtime, out_nodes, node_settings):
+        """Record a scan, size and mtime must be taken before the scan started"""
+        self.entries[os.path.abspath(hip_file)] = {
+            'size': size,
+            'mtime': mtime,
+            'scanned': time.time(),
+            'out_nodes': out_nodes,
+            'node_settings': node_settings
+        }
+        if len(self.entries) > self.MAX_ENTRIES:
+            oldest = sorted(self.entries, key=lambda k: self.entries[k]['scanned'])
+            for key in oldest[:len(self.entries) - self.MAX_ENTRIES]:
+                del self.entries[key]
+        self.save()
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error saving ROP cache: {e}")
+
+class ThumbnailCache:
+    """LRU cache of decoded thumbnails keyed by (path, subimage, mtime, size, width)
+
+    Values are (label, rgb_bytes, width, height). Memory use is bounded by
+    max_bytes, and with a disk_dir the thumbnails also outlive the process.
+    The part count of each file is kept too, so a fully cached frame is
+    shown without opening it.
+    """
+    MAX_BYTES = 256 * 1024 * 1024
+    MAX_DISK_BYTES = 1024 * 1024 * 1024
+    MAX_PART_COUNTS = 100000
+
+    def __init__(self, max_bytes=None, disk_dir=None):
+        self.max_bytes = max_bytes or self.MAX_BYTES
+        self.disk_dir = disk_dir
+        self.entries = collections.OrderedDict()
+        self.nbytes = 0
+        self.part_counts = collections.OrderedDict()  # (path, mtime, size) -> (parts, complete)
+        self.lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._prune_disk()
+
+    def get(self, key):
+        """Return the cached thumbnail or None"""
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+                return value
+        if not self.disk_dir:
+            return None
+
+        value = self._read_disk(key)
+        if value is not None:
+            self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        """Store a thumbnail, evicting the least recently used ones past max_bytes"""
+        self._remember(key, value)
+        if self.disk_dir:
+            self._write_disk(key, value)
+
+    def get_parts(self, file_key):
+        """Return (parts, complete) for a file, complete is False if reading stopped early"""
+        with self.lock:
+            return self.part_counts.get(file_key)
+
+    def put_parts(self, file_key, parts, complete):
+        """Remember how many parts a file has, or at least has when not complete"""
+        with self.lock:
+            known = self.part_counts.get(file_key)
+            if known is None or complete or (not known[1] and parts > known[0]):
+                self.part_counts[file_key] = (parts, complete)
+            self.part_counts.move_to_end(file_key)
+            while len(self.part_counts) > self.MAX_PART_COUNTS:
+                self.part_counts.popitem(last=False)
+
+    def _remember(self, key, value):
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= len(old[1])
+            self.entries[key] = value
+            self.nbytes += len(value[1])
+            while self.nbytes > self.max_bytes and len(self.entries) > 1:
+                _, evicted = self.entries.popitem(last=False)
+                self.nbytes -= len(evicted[1])
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.disk_dir, digest + '.thumb')
+
+    def _read_disk(self, key):
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                header = json.loads(f.readline())
+                data = f.read()
+            os.utime(path)  # Disk pruning goes by last use
+        except (OSError, ValueError):
+            return None
+        if header.get('key') != list(key) or len(data) != header['width'] * header['height'] * 3:
+            return None
+        return header['label'], data, header['width'], header['height']
+
+    def _write_disk(self, key, value):
+        label, data, width, height = value
+        path = self._disk_path(key)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        header = {'key': list(key), 'label': label, 'width': width, 'height': height}
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(json.dumps(header).encode() + b'\n')
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error saving thumbnail: {e}")
+
+    def _prune_disk(self):
+        """Drop the least recently used thumbnails past MAX_DISK_BYTES"""
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith('.thumb'):
+                st = entry.stat()
+                files.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.MAX_DISK_BYTES:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+class RenderJournal:
+    """Append-only list of the frames a job has finished, so a crashed render can resume
+
+    One JSON lines file per hip, ROP and frame list: a header line, then a
+    line per finished frame. It is removed once every frame is done.
+    """
+
+    def __init__(self, hip, rop, frames, directory=None):
+        self.frames = list(frames)
+        self.done = set()
+        key = json.dumps([os.path.abspath(hip), rop, format_frame_list(sorted(self.frames))])
+        directory = directory or os.path.join(get_config_dir(), 'journals')
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, hashlib.sha1(key.encode()).hexdigest()[:16] + '.jsonl')
+        self.file = None
+        self.header = {'hardeen_journal': 1, 'hip': hip, 'rop': rop,
+                       'frames': format_frame_list(self.frames)}
+
+    def open(self, resume=False):
+        """Start the journal, with resume the frames of an earlier unfinished run count as done"""
+        if resume:
+            try:
+                with open(self.path, 'r') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue  # Cut short by the crash
+                        if 'frame' in entry:
+                            self.done.add(entry['frame'])
+            except OSError:
+                pass
+        self.file = open(self.path, 'a' if self.done else 'w')
+        if not self.done:
+            self.file.write(json.dumps({**self.header, 'started': time.time()}) + '\n')
+            self.file.flush()
+        return self
+
+    def record(self, frame):
+        """Mark a frame finished"""
+        if frame in self.done or self.file is None:
+            return
+        self.done.add(frame)
+        self.file.write(json.dumps({'frame': frame, 'time': time.time()}) + '\n')
+        self.file.flush()
+
+    def feed(self, worker, source, value):
+        """Record the frames of frame_end and frame_skipped events, like FrameMetricsCollector.feed"""
+        if source == 'event' and value.get('event') in ('frame_end', 'frame_skipped'):
+            if value.get('frame') is not None:
+                self.record(value['frame'])
+
+    def remaining(self):
+        """Frames not finished yet, in the job's order"""
+        return [frame for frame in self.frames if frame not in self.done]
+
+    def close(self, finished=False):
+        """Close the journal, removing it when nothing is left to render
+
+        finished says the render ended cleanly, so there is nothing to resume
+        even if some frames never reported back.
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        if finished or not self.remaining():
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+class RenderSupervisor:
+    """Decides whether a render that died gets relaunched on its remaining frames
+
+    A render crashed when a process was killed by a signal (a segfault, the
+    OOM killer) or exited non-zero after finishing frames since it was
+    launched, with frames left in the journal. A process that fails before
+    finishing anything (a bad ROP path, an error in the render script)
+    would fail the same way again, so it isn't retried. Up to retries
+    relaunches are allowed, waiting backoff seconds before the first and
+    doubling after each.
+    """
+    RETRIES = 3
+    BACKOFF = 30.0
+
+    def __init__(self, journal, retries=None, backoff=None):
+        self.journal = journal
+        self.retries = self.RETRIES if retries is None else retries
+        self.backoff = self.BACKOFF if backoff is None else backoff
+        self.attempts = 0
+        self.crashes = []  # (time, exit codes, frames left) of every crash
+        self.done_at_launch = len(journal.done)
+        self.wake = threading.Event()
+
+    def crashed(self, returncodes, canceled=False):
+        """Record the exit of a launch, True if it was a crash worth relaunching"""
+        codes = [code for code in returncodes if code]
+        if canceled or not codes:
+            return False
+        remaining = self.journal.remaining()
+        if not remaining:
+            return False
+        killed = any(code < 0 for code in codes)
+        if not killed and len(self.journal.done) <= self.done_at_launch:
+            return False
+        self.crashes.append((time.time(), list(returncodes), len(remaining)))
+        return True
+
+    def next_delay(self):
+        """Seconds to wait before relaunching, None once the retries are used up"""
+        if self.attempts >= self.retries:
+            return None
+        self.done_at_launch = len(self.journal.done)
+        delay = self.backoff * 2 ** self.attempts
+        self.attempts += 1
+        return delay
+
+    def wait(self, seconds):
+        """Sleep before a relaunch, False if stop() was called meanwhile"""
+        return not self.wake.wait(seconds)
+
+    def stop(self):
+        self.wake.set()
+
+class RenderQueue:
+    """Render jobs saved to disk so an overnight batch survives restarts"""
+    STATUSES = ('queued', 'running', 'done', 'failed', 'cancelled')
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_config_dir(), 'queue.json')
+        self.jobs = []
+        try:
+            with open(self.path, 'r') as f:
+                self.jobs = json.load(f)
+        except (OSError, ValueError):
+            self.jobs = []
+
+        # Jobs that were running when Hardeen quit start over
+        for job in self.jobs:
+            if job['status'] == 'running':
+                job['status'] = 'queued'
+                job['done'] = 0
+
+    def add(self, hip, out, sframe, eframe, userange, useskip, total, priority=0, frames=None, step=1):
+        """Add a job to the end of the queue, frames is a frame list to render instead of the range
+
+        step is the ROP's own frame step, skip only looks for the frames it renders.
+        """
+        job = {
+            'id': uuid.uuid4().hex[:12],
+            'hip': hip,
+            'out': out,
+            'sframe': sframe,
+            'eframe': eframe,
+            'step': step,
+            'userange': userange,
+            'useskip': useskip,
+            'priority': priority,
+            'total': total,
+            'done': 0,
+            'status': 'queued',
+            'added': time.time()
+        }
+        if frames:
+            job['frames'] = format_frame_list(frames)
+        self.jobs.append(job)
+        self.save()
+        return job
+
+    def get(self, job_id):
+        for job in self.jobs:
+            if job['id'] == job_id:
+                return job
+        return None
+
+    def remove(self, job_id):
+        self.jobs = [job for job in self.jobs if job['id'] != job_id]
+        self.save()
+
+    def update(self, job_id, **fields):
+        job = self.get(job_id)
+        if job is not None:
+            job.update(fields)
+            self.save()
+        return job
+
+    def clear_finished(self):
+        self.jobs = [job for job in self.jobs if job['status'] in ('queued', 'running')]
+        self.save()
+
+    def ordered(self):
+        """All jobs, highest priority first, then in the order they were added"""
+        return sorted(self.jobs, key=lambda job: (-job['priority'], job['added']))
+
+    def pending(self):
+        return [job for job in self.ordered() if job['status'] == 'queued']
+
+    def running(self):
+        return [job for job in self.jobs if job['status'] == 'running']
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.jobs, f, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error saving render queue: {e}")
+
+def get_houdini_history_file():
+    """Get the path to the Houdini file.history"""
+    home = str(Path.home())
+    print(f"Looking for Houdini directories in: {home}")
+    
+    # Look for any houdini version directory (e.g. houdini19.5, houdini20.0, etc)
+    houdini_dirs = [d for d in os.listdir(home) 
+                   if d.startswith('houdini') and 
+                   os.path.isdir(os.path.join(home, d)) and
+                   not d.endswith('.py')]
+    
+    print(f"Found Houdini directories: {houdini_dirs}")
+    
+    if not houdini_dirs:
+        print("No Houdini directories found")
+        return None
+        
+    # Use the latest version if multiple exist
+    latest_dir = sorted(houdini_dirs)[-1]
+    history_file = os.path.join(home, latest_dir, 'file.history')
+    print(f"Checking history file: {history_file}")
+    
+    if os.path.exists(history_file):
+        print("History file exists")
+        return history_file
+    else:
+        print("History file does not exist")
+        return None
+
+def parse_hip_files(history_file):
+    """Parse the file.history and extract HIP files"""
+    if not history_file:
+        print("No history file provided")
+        return []
+    
+    try:
+        print(f"Reading history file: {history_file}")
+        with open(history_file, 'r') as f:
+            content = ''.join(f.read().splitlines())
+        
+        if not content.startswith('HIP{'):
+            print("File doesn't start with HIP{")
+            return []
+            
+        end = content.find('}', 4)
+        if end == -1:
+            print("No closing } found")
+            return []
+            
+        hip_section = content[4:end]
+        print(f"Found HIP section length: {len(hip_section)}")
+            
+        paths = []
+        current_path = ""
+        
+        for part in hip_section.split('/'):
+            if not part:
+                continue
+                
+            if not current_path:
+                current_path = '/' + part
+            else:
+                current_path += '/' + part
+                
+            if current_path.endswith('.hip'):
+                paths.append(current_path)
+                current_path = ""
+        
+        # Remove duplicates while preserving order
+        seen = set()
+        hip_files = []
+        for path in paths:
+            if path not in seen:
+                seen.add(path)
+                hip_files.append(path)
+            
+        # Reverse the list so newest files appear first
+        hip_files.reverse()
+        
+        print(f"\nFinal list of {len(hip_files)} unique HIP files (newest first):")
+        for hip_file in hip_files[:5]:
+            print(f"  {hip_file}")
+            
+        return hip_files
+        
+    except Exception as e:
+        print(f"Error reading history file: {e}")
+        traceback.print_exc()
+        return []
+
+def refresh_hip_files():
+    """Refresh the list of recent HIP files"""
+    history_file = get_houdini_history_file()
+    return parse_hip_files(history_file)
+
+def _add_output_patterns(node_settings):
+    """Replace the scanned outputs of frames 1 and 2 with an output pattern"""
+    for settings in node_settings.values():
+        outputs = settings.pop('outputs', None)
+        settings['output'] = output_pattern(*outputs) if outputs else None
+    return node_settings
+
+def parse_out_nodes(hip_file):
+    """Parse the hip file and extract available ROP nodes and their settings"""
+    try:
+        import hou
+        # Load the hip file
+        hou.hipFile.load(hip_file)
+        
+        # Find all ROP nodes
+        out_nodes = []
+        node_settings = {}  # Store settings for each node
+        out_context = hou.node("/out")
+        if out_context:
+            for node in out_context.children():
+                # Check if it's a ROP node (render node)
+                if node.type().name() in ["rop_geometry", "Redshift_ROP", "opengl"]:
+                    node_path = node.path()
+                    out_nodes.append(node_path)
+                    
+                    # Get frame range and skip settings - convert frames to integers
+                    settings = {
+                        'f1': int(node.parm('f1').eval()) if node.parm('f1') else 1,
+                        'f2': int(node.parm('f2').eval()) if node.parm('f2') else 1,
+                        'f3': max(1, int(node.parm('f3').eval())) if node.parm('f3') else 1,
+                        'skip_rendered': node.parm('RS_outputSkipRendered').eval() if node.parm('RS_outputSkipRendered') else 0
+                    }
+                    # Output of frames 1 and 2, turned into a pattern below
+                    for name in ROP_OUTPUT_PARMS:
+                        if node.parm(name) is not None:
+                            settings['outputs'] = [node.parm(name).evalAtFrame(1), node.parm(name).evalAtFrame(2)]
+                            break
+                    node_settings[node_path] = settings
+        
+        return out_nodes, _add_output_patterns(node_settings)
+        
+    except ImportError:
+        print("Could not import hou module - using hython")
+        # Try using hython as fallback
+        try:
+            import subprocess
+            script = """
+import hou
+import sys
+import os
+import json
+
+# Completely suppress stdout/stderr
+class NullIO:
+    def write(self, *args): pass
+    def flush(self): pass
+
+# Save original stdout/stderr
+old_stdout = sys.stdout
+old_stderr = sys.stderr
+
+try:
+    # Redirect all output to null
+    sys.stdout = NullIO()
+    sys.stderr = NullIO()
+    
+    # Set environment variables to suppress Redshift output
+    os.environ['RS_VERBOSITY_LEVEL'] = '0'
+    
+    # Load the hip file silently
+    hou.hipFile.load(r"{0}", suppress_save_prompt=True)
+    
+    # Restore stdout just to print node paths and settings
+    sys.stdout = old_stdout
+    
+    # Get out nodes and their settings
+    out_context = hou.node("/out")
+    node_settings = {{}}
+    
+    if out_context:
+        for node in out_context.children():
+            if node.type().name() in ["rop_geometry", "Redshift_ROP", "opengl"]:
+                node_path = node.path()
+                print("NODE:{{}}".format(node_path))
+                
+                # Get frame range and skip settings - convert frames to integers
+                settings = {{
+                    'f1': int(node.parm('f1').eval()) if node.parm('f1') else 1,
+                    'f2': int(node.parm('f2').eval()) if node.parm('f2') else 1,
+                    'f3': max(1, int(node.parm('f3').eval())) if node.parm('f3') else 1,
+                    'skip_rendered': node.parm('RS_outputSkipRendered').eval() if node.parm('RS_outputSkipRendered') else 0
+                }}
+                for name in {1!r}:
+                    if node.parm(name) is not None:
+                        settings['outputs'] = [node.parm(name).evalAtFrame(1), node.parm(name).evalAtFrame(2)]
+                        break
+                print("SETTINGS:{{}}".format(json.dumps(settings)))
+
+finally:
+    # Restore original stdout/stderr
+    sys.stdout = old_stdout
+    sys.stderr = old_stderr
+""".format(hip_file, ROP_OUTPUT_PARMS)
+
+            # Run hython with environment variables to suppress output
+            env = os.environ.copy()
+            env['HOU_VERBOSITY'] = '0'
+            env['RS_VERBOSITY_LEVEL'] = '0'
+            
+            result = subprocess.run(
+                ['hython', '-c', script], 
+                capture_output=True, 
+                text=True,
+                env=env,
+                encoding='utf-8'
+            )
+            
+            # Parse the output to get nodes and settings
+            nodes = []
+            node_settings = {}
+            
+            current_node = None
+            for line in result.stdout.splitlines():
+                if line.startswith('NODE:'):
+                    current_node = line[5:].strip()
+                    nodes.append(current_node)
+                elif line.startswith('SETTINGS:'):
+                    if current_node:
+                        settings = json.loads(line[9:])
+                        node_settings[current_node] = settings
+            
+            node_settings = _add_output_patterns(node_settings)
+            if nodes:
+                print(f"\nFound {len(nodes)} out nodes with settings:")
+                for node in nodes:
+                    print(f"  {node}: {node_settings[node]}")
+            else:
+                print("\nNo out nodes found")
+                if result.stderr:
+                    print("Error:", result.stderr.split('\n')[0])
+                
+            return nodes, node_settings
+            
+        except Exception as e:
+            print(f"Error running hython: {e}")
+            return [], {}
@@ -0,0 +1,259 @@
+#!/usr/bin/python3
+"""Frame time estimators for the render ETA, and a backtest to compare them.
+
+    python3 hardeen_eta.py frame_times.json [more.json ...]
+
+Estimators are fed measured frame times one at a time and predict how long
+the frames still to come will take. BestEstimator runs several of them side
+by side and answers with whichever has predicted the current render best.
+"""
+
+import json
+import statistics
+import sys
+from collections import deque
+
+class Estimator:
+    """Base class, subclasses implement add() and frame_time()"""
+    name = 'estimator'
+
+    def add(self, seconds):
+        """Record the time of a finished frame"""
+        raise NotImplementedError
+
+    def frame_time(self):
+        """Expected time of the next frame, 0 before any frame finished"""
+        raise NotImplementedError
+
+    def remaining(self, frames):
+        """Expected time of the next frames frames together"""
+        return frames * self.frame_time()
+
+class MeanEstimator(Estimator):
+    """Mean of every frame so far"""
+    name = 'mean'
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+
+    def frame_time(self):
+        return self.total / self.count if self.count else 0.0
+
+class EWMAEstimator(Estimator):
+    """Exponentially weighted mean, recent frames count the most"""
+    name = 'ewma'
+
+    def __init__(self, alpha=0.3):
+        self.alpha = alpha
+        self.value = None
+
+    def add(self, seconds):
+        if self.value is None:
+            self.value = seconds
+        else:
+            self.value = self.alpha * seconds + (1 - self.alpha) * self.value
+
+    def frame_time(self):
+        return self.value or 0.0
+
+class RollingMedianEstimator(Estimator):
+    """Median of the last few frames, ignores the odd slow frame"""
+    name = 'median'
+
+    def __init__(self, window=9):
+        self.times = deque(maxlen=window)
+
+    def add(self, seconds):
+        self.times.append(seconds)
+
+    def frame_time(self):
+        return statistics.median(self.times) if self.times else 0.0
+
+class LinearTrendEstimator(Estimator):
+    """Least squares line through frame time over frame index
+
+    For shots that get steadily heavier or lighter. Predictions never drop
+    below the fastest frame seen, so a falling trend can't go negative.
+    """
+    name = 'trend'
+
+    def __init__(self):
+        self.count = 0
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+        self.sum_xx = 0.0
+        self.sum_xy = 0.0
+        self.fastest = None
+
+    def add(self, seconds):
+        x = self.count
+        self.count += 1
+        self.sum_x += x
+        self.sum_y += seconds
+        self.sum_xx += x * x
+        self.sum_xy += x * seconds
+        self.fastest = seconds if self.fastest is None else min(self.fastest, seconds)
+
+    def _fit(self):
+        """Return (intercept, slope), flat until there are two frames"""
+        mean_y = self.sum_y / self.count
+        denominator = self.count * self.sum_xx - self.sum_x ** 2
+        if self.count < 2 or denominator == 0:
+            return mean_y, 0.0
+        slope = (self.count * self.sum_xy - self.sum_x * self.sum_y) / denominator
+        return mean_y - slope * self.sum_x / self.count, slope
+
+    def frame_time(self):
+        if not self.count:
+            return 0.0
+        intercept, slope = self._fit()
+        return max(self.fastest, intercept + slope * self.count)
+
+    def remaining(self, frames):
+        if not self.count:
+            return 0.0
+        intercept, slope = self._fit()
+        return sum(max(self.fastest, intercept + slope * x)
+                   for x in range(self.count, self.count + frames))
+
+def default_estimators():
+    return [MeanEstimator(), EWMAEstimator(), RollingMedianEstimator(), LinearTrendEstimator()]
+
+class BestEstimator(Estimator):
+    """Runs several estimators and answers with the one that has predicted best so far
+
+    Each estimator is scored on its prediction of every frame before that
+    frame is added, the lowest mean absolute error wins. The first estimator
+    is used until MIN_SCORED frames have been scored.
+    """
+    MIN_SCORED = 3
+
+    def __init__(self, estimators=None):
+        self.estimators = estimators or default_estimators()
+        self.errors = [0.0] * len(self.estimators)
+        self.scored = 0
+        self.count = 0
+        self.best = self.estimators[0]
+
+    @property
+    def name(self):
+        return self.best.name
+
+    def add(self, seconds):
+        if self.count:
+            for i, estimator in enumerate(self.estimators):
+                self.errors[i] += abs(estimator.frame_time() - seconds)
+            self.scored += 1
+        self.count += 1
+        for estimator in self.estimators:
+            estimator.add(seconds)
+
+        if self.scored >= self.MIN_SCORED:
+            best = min(range(len(self.estimators)), key=lambda i: self.errors[i])
+            self.best = self.estimators[best]
+
+    def frame_time(self):
+        return self.best.frame_time()
+
+    def remaining(self, frames):
+        return self.best.remaining(frames)
+
+class HistoryEstimator(Estimator):
+    """Starts from the frame times of earlier renders, live frames take over as they come
+
+    Before the first frame finishes the median of history is the estimate.
+    After that it is blended with estimator, history counting as weight
+    frames, so it fades out as the render goes on.
+    """
+
+    def __init__(self, history, estimator=None, weight=3):
+        self.prior = statistics.median(history) if history else 0.0
+        self.weight = weight if history else 0
+        self.estimator = estimator or BestEstimator()
+        self.count = 0
+
+    @property
+    def name(self):
+        if not self.weight:
+            return self.estimator.name
+        return f"{self.estimator.name}+history" if self.count else 'history'
+
+    def _history_share(self):
+        return self.weight / (self.weight + self.count) if self.weight else 0.0
+
+    def add(self, seconds):
+        self.count += 1
+        self.estimator.add(seconds)
+
+    def frame_time(self):
+        share = self._history_share()
+        live = self.estimator.frame_time() if self.count else 0.0
+        return share * self.prior + (1 - share) * live
+
+    def remaining(self, frames):
+        share = self._history_share()
+        live = self.estimator.remaining(frames) if self.count else 0.0
+        return share * frames * self.prior + (1 - share) * live
+
+def backtest(series, factories=None):
+    """Score estimators against recorded frame time series
+
+    At every frame of every series the estimator predicts the time of all
+    frames still to come. The error is the distance to what they really
+    took, as a fraction of the whole series. Returns {name: mean error}.
+    """
+    factories = factories or {
+        'mean': MeanEstimator,
+        'ewma': EWMAEstimator,
+        'median': RollingMedianEstimator,
+        'trend': LinearTrendEstimator,
+        'best': BestEstimator,
+    }
+    scores = {}
+    for name, factory in factories.items():
+        errors = []
+        for times in series:
+            total = sum(times)
+            if len(times) < 2 or total <= 0:
+                continue
+            estimator = factory()
+            actual_remaining = total
+            for done, seconds in enumerate(times[:-1], 1):
+                estimator.add(seconds)
+                actual_remaining -= seconds
+                predicted = estimator.remaining(len(times) - done)
+                errors.append(abs(predicted - actual_remaining) / total)
+        scores[name] = sum(errors) / len(errors) if errors else None
+    return scores
+
+def load_series(path):
+    """Read frame times from a JSON list, a JSON object with 'frame_times', or one number per line"""
+    with open(path, 'r') as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return [float(line) for line in text.split() if line.strip()]
+    if isinstance(data, dict):
+        data = data['frame_times']
+    return [float(value) for value in data]
+
+def main(argv=None):
+    paths = sys.argv[1:] if argv is None else argv
+    if not paths:
+        print(__doc__.strip())
+        return 2
+    series = [load_series(path) for path in paths]
+    scores = backtest(series)
+    print(f"{'estimator':<10} mean ETA error ({sum(len(times) for times in series)} frames)")
+    for name, score in sorted(scores.items(), key=lambda item: float('inf') if item[1] is None else item[1]):
+        print(f"{name:<10} {'-' if score is None else f'{score:.1%}'}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
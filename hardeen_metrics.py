@@ -0,0 +1,214 @@
+#!/usr/bin/python3
+"""Per-frame render metrics, kept in a local SQLite database.
+
+Every rendered frame becomes one row: hip, ROP, frame, wall time, Redshift's
+scene extraction and total time, output size and host. The history is used
+to size shots, compare machines and seed the ETA of the next render.
+
+    python3 hardeen.py metrics --csv frames.csv [--hip shot.hip] [--rop /out/rs]
+"""
+
+import csv
+import os
+import re
+import socket
+import sqlite3
+import threading
+import time
+
+from hardeen_core import get_config_dir
+
+COLUMNS = ('finished', 'host', 'hip', 'rop', 'frame', 'wall_time', 'extraction_time',
+           'redshift_time', 'output', 'output_size')
+VERSION_RE = re.compile(r'[._-]?v\d+$', re.IGNORECASE)
+
+def hip_key(hip):
+    """The form hips are stored and looked up in, whichever front end recorded them"""
+    return os.path.realpath(hip) if hip else hip
+
+def shot_name(hip):
+    """The hip's file name without extension and version, shot010_v003.hip gives shot010"""
+    return VERSION_RE.sub('', os.path.splitext(os.path.basename(hip))[0])
+
+def related_hips(hip, other):
+    """True for another version of the same shot, a shared scenes folder isn't enough"""
+    return shot_name(hip) == shot_name(other)
+
+class MetricsStore:
+    """SQLite table of rendered frames, safe to share between threads"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_config_dir(), 'metrics.db')
+        self.lock = threading.Lock()
+        # The GUI, the queue and the command line may all write at once
+        self.db = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        with self.lock, self.db:
+            self.db.execute('PRAGMA journal_mode=WAL')
+            self.db.execute('''
+                CREATE TABLE IF NOT EXISTS frames (
+                    id INTEGER PRIMARY KEY,
+                    finished REAL NOT NULL,
+                    host TEXT,
+                    hip TEXT,
+                    rop TEXT,
+                    frame INTEGER,
+                    wall_time REAL,
+                    extraction_time REAL,
+                    redshift_time REAL,
+                    output TEXT,
+                    output_size INTEGER
+                )''')
+            self.db.execute('CREATE INDEX IF NOT EXISTS frames_job ON frames (hip, rop, finished)')
+
+    def record_frame(self, hip, rop, frame, wall_time, extraction_time=None, redshift_time=None,
+                     output=None, output_size=None, host=None, finished=None):
+        """Add a rendered frame, returns its row id"""
+        with self.lock, self.db:
+            cursor = self.db.execute(
+                f"INSERT INTO frames ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                (finished or time.time(), host or socket.gethostname(), hip_key(hip), rop, frame, wall_time,
+                 extraction_time, redshift_time, output, output_size)
+            )
+            return cursor.lastrowid
+
+    def update_frame(self, row_id, **fields):
+        """Fill in fields that arrived after the frame was recorded"""
+        fields = {key: value for key, value in fields.items() if key in COLUMNS}
+        if not fields:
+            return
+        with self.lock, self.db:
+            self.db.execute(
+                f"UPDATE frames SET {', '.join(f'{key} = ?' for key in fields)} WHERE id = ?",
+                (*fields.values(), row_id)
+            )
+
+    def frames(self, hip=None, rop=None, host=None, since=None, first=None, last=None, limit=None):
+        """Return matching rows as dicts, oldest first, first and last bound the frame number"""
+        where, params = [], []
+        for column, value in (('hip', hip_key(hip)), ('rop', rop), ('host', host)):
+            if value is not None:
+                where.append(f'{column} = ?')
+                params.append(value)
+        for condition, value in (('finished >= ?', since), ('frame >= ?', first), ('frame <= ?', last)):
+            if value is not None:
+                where.append(condition)
+                params.append(value)
+        query = f"SELECT {', '.join(COLUMNS)} FROM frames"
+        if where:
+            query += ' WHERE ' + ' AND '.join(where)
+        if limit:
+            # Newest rows, still returned oldest first
+            query = f"SELECT * FROM ({query} ORDER BY finished DESC LIMIT ?) ORDER BY finished"
+            params.append(limit)
+        else:
+            query += ' ORDER BY finished'
+        with self.lock:
+            rows = self.db.execute(query, params).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def history(self, hip, rop, first=None, last=None, limit=100):
+        """Frame times of earlier renders most like this one, for seeding the ETA
+
+        Tries the same hip and ROP over the same frames, then any of its
+        frames, then the same ROP over the same frames in other versions of
+        the shot (hips named the same but for the version, in any folder),
+        then anything else rendered from the hip.
+        """
+        hip = hip_key(hip)
+        for filters in ({'hip': hip, 'rop': rop, 'first': first, 'last': last}, {'hip': hip, 'rop': rop}):
+            times = [row['wall_time'] for row in self.frames(limit=limit, **filters) if row['wall_time']]
+            if times:
+                return times
+
+        # A default ROP name like /out/Redshift_ROP1 is shared with every other show
+        rows = [row for row in self.frames(rop=rop, first=first, last=last, limit=limit * 10)
+                if row['wall_time'] and row['hip'] and related_hips(hip, row['hip'])]
+        if rows:
+            return [row['wall_time'] for row in rows[-limit:]]
+
+        return [row['wall_time'] for row in self.frames(hip=hip, limit=limit) if row['wall_time']]
+
+    def export_csv(self, file, **filters):
+        """Write matching rows to a path or an open text file as CSV, returns the row count"""
+        rows = self.frames(**filters)
+        if isinstance(file, str):
+            with open(file, 'w', newline='') as f:
+                return self.export_csv(f, **filters)
+        writer = csv.DictWriter(file, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+        return len(rows)
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+class FrameMetricsCollector:
+    """Builds metrics rows from the same (worker, source, value) items RenderProgress gets
+
+    Frames are timed from the structured frame_start/frame_end events, the
+    Redshift timings come from its log and are attached to the frame the
+    process is on, or to the one it just finished if the line comes late.
+    """
+    EXTRACTION_RE = re.compile(r'scene extraction time (\d+(?:\.\d+)?)')
+    TOTAL_RE = re.compile(r'total time (\d+(?:\.\d+)?) sec')
+
+    def __init__(self, store, hip, host=None):
+        self.store = store
+        self.hip = hip
+        self.host = host or socket.gethostname()
+        self.starts = {}  # Worker -> frame start time
+        self.timings = {}  # Worker -> Redshift timings for the frame in progress
+        self.last_rows = {}  # Worker -> row id of its last frame still missing Redshift timings
+
+    def feed(self, worker, source, value):
+        try:
+            if source == 'event':
+                self._feed_event(worker, value)
+            elif 'time' in value:
+                self._feed_log(worker, value)
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error recording frame metrics: {e}")
+
+    def _feed_log(self, worker, line):
+        timings = {}
+        match = self.EXTRACTION_RE.search(line)
+        if match:
+            timings['extraction_time'] = float(match.group(1))
+        match = self.TOTAL_RE.search(line)
+        if match:
+            timings['redshift_time'] = float(match.group(1))
+        if not timings:
+            return
+
+        if worker in self.starts:
+            self.timings.setdefault(worker, {}).update(timings)
+        elif worker in self.last_rows:
+            self.store.update_frame(self.last_rows.pop(worker), **timings)
+
+    def _feed_event(self, worker, event):
+        kind = event.get('event')
+        if kind == 'frame_start':
+            self.starts[worker] = event.get('time', time.time())
+            self.timings[worker] = {}
+            self.last_rows.pop(worker, None)
+        elif kind == 'frame_skipped':
+            self.starts.pop(worker, None)
+        elif kind == 'frame_end' and worker in self.starts:
+            finished = event.get('time', time.time())
+            timings = self.timings.pop(worker, {})
+            output = event.get('output')
+            output_size = None
+            if output:
+                try:
+                    output_size = os.path.getsize(output)
+                except OSError:
+                    pass
+            row_id = self.store.record_frame(
+                self.hip, event.get('rop'), event.get('frame'),
+                finished - self.starts.pop(worker),
+                output=output, output_size=output_size, host=self.host, finished=finished,
+                **timings
+            )
+            if 'redshift_time' not in timings:
+                self.last_rows[worker] = row_id